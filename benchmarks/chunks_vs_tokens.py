@@ -0,0 +1,74 @@
+"""Compare the bytes scanning of PO files against their tokenization.
+
+Generates catalogs of a few MB and measures, for the checks that support
+both ways of reading files, the time spent by :py:func:`check_file` when the
+file is scanned in binary chunks and when it is tokenized.
+
+Usage, with the package installed:
+
+    python benchmarks/chunks_vs_tokens.py [N_ENTRIES ...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from generate import generate_catalog
+
+from pre_commit_po_hooks.check_entries import MaxLinesCheck, MaxMessagesCheck
+from pre_commit_po_hooks.checks import Check, check_file
+from pre_commit_po_hooks.fuzzy_messages import FuzzyMessagesCheck
+from pre_commit_po_hooks.obsolete_messages import ObsoleteMessagesCheck
+
+
+CHECKS = (
+    ("fuzzy", [(FuzzyMessagesCheck, {})]),
+    ("obsolete", [(ObsoleteMessagesCheck, {})]),
+    ("max-messages", [(MaxMessagesCheck, {})]),
+    ("max-lines", [(MaxLinesCheck, {})]),
+    (
+        "all",
+        [
+            (FuzzyMessagesCheck, {}),
+            (ObsoleteMessagesCheck, {}),
+            (MaxMessagesCheck, {}),
+            (MaxLinesCheck, {}),
+        ],
+    ),
+)
+
+
+def best_time(filename, checks, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        check_file(filename, checks)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [50000, 200000]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for n_entries in sizes:
+            filename = os.path.join(tmpdir, f"{n_entries}.po")
+            with open(filename, "w", encoding="utf-8") as f:
+                generate_catalog(f, n_entries)
+            size_mb = os.path.getsize(filename) / 1024 / 1024
+            print(f"{n_entries} entries ({size_mb:.1f} MB)")
+            for name, checks in CHECKS:
+                chunks_time = best_time(filename, checks)
+                # the base check doesn't support chunks, forcing tokenization
+                tokens_time = best_time(filename, checks + [(Check, {})])
+                print(
+                    f"  {name:<14} tokens: {tokens_time * 1000:8.1f} ms"
+                    f"  chunks: {chunks_time * 1000:7.1f} ms"
+                    f"  ({tokens_time / chunks_time:.0f}x)"
+                )
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
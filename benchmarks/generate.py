@@ -0,0 +1,182 @@
+"""Deterministic generator of synthetic PO files for benchmarks.
+
+Usage, with the package installed:
+
+    python benchmarks/generate.py N_ENTRIES OUTPUT [--seed N] [--plural-ratio R] ...
+"""
+
+import argparse
+import random
+
+
+WORDS = (
+    "file message translation catalog language error warning value user"
+    " account settings download upload folder project version update delete"
+    " create open close save cancel accept search result page window option"
+).split()
+
+TRANSLATED_WORDS = (
+    "archivo mensaje traducción catálogo idioma error aviso valor usuario"
+    " cuenta ajustes descarga subida carpeta proyecto versión actualizar borrar"
+    " crear abrir cerrar guardar cancelar aceptar buscar resultado página"
+    " ventana opción"
+).split()
+
+STANDARD_HEADERS = (
+    ("Project-Id-Version", "1.0.0"),
+    ("Report-Msgid-Bugs-To", "Bugs <bugs@example.com>"),
+    ("Last-Translator", "Translator <translator@example.com>"),
+    ("Language-Team", "Spanish <es@example.com>"),
+    ("Language", "es"),
+    ("Content-Type", "text/plain; charset=UTF-8"),
+    ("Content-Transfer-Encoding", "8bit"),
+    ("Plural-Forms", "nplurals=2; plural=(n != 1);"),
+)
+
+
+def _quote(keyword, text, line_width):
+    if len(keyword) + len(text) + 3 <= line_width:
+        return f'{keyword} "{text}"\n'
+    lines = [f'{keyword} ""\n']
+    width = line_width - 2
+    for i in range(0, len(text), width):
+        lines.append(f'"{text[i : i + width]}"\n')
+    return "".join(lines)
+
+
+def _sentence(rng, words, n_words):
+    return " ".join(rng.choice(words) for _ in range(n_words)).capitalize()
+
+
+def generate_catalog(
+    f,
+    n_entries,
+    seed=0,
+    plural_ratio=0.1,
+    fuzzy_ratio=0.05,
+    obsolete_ratio=0.02,
+    untranslated_ratio=0.05,
+    comment_ratio=0.5,
+    max_words=20,
+    line_width=79,
+    header_size=len(STANDARD_HEADERS),
+):
+    """Write a synthetic PO file.
+
+    The same arguments always generate the same content.
+
+    Parameters
+    ----------
+
+    f : file
+      Opened text file in which the catalog will be written.
+
+    n_entries : int
+      Number of entries, excluding the header.
+
+    seed : int, optional
+      Seed for the random generator.
+
+    plural_ratio : float, optional
+      Ratio of entries with plural forms.
+
+    fuzzy_ratio : float, optional
+      Ratio of fuzzy entries.
+
+    obsolete_ratio : float, optional
+      Ratio of obsolete entries, written at the end of the file.
+
+    untranslated_ratio : float, optional
+      Ratio of entries without translation.
+
+    comment_ratio : float, optional
+      Ratio of entries with extracted and translator comments. All the
+      entries have references.
+
+    max_words : int, optional
+      Maximum number of words of each message.
+
+    line_width : int, optional
+      Messages longer than this width are wrapped in multiple lines.
+
+    header_size : int, optional
+      Number of metadata headers. The first ones are standard headers, the
+      rest are filled with custom ``X-`` headers.
+    """
+    rng = random.Random(seed)
+
+    f.write('# Synthetic catalog.\n#\nmsgid ""\nmsgstr ""\n')
+    for i in range(header_size):
+        if i < len(STANDARD_HEADERS):
+            header, value = STANDARD_HEADERS[i]
+        else:
+            header, value = f"X-Generated-{i}", _sentence(rng, WORDS, 3)
+        f.write(f'"{header}: {value}\\n"\n')
+
+    obsolete_entries = []
+    for i in range(n_entries):
+        n_words = rng.randint(1, max_words)
+        msgid = _sentence(rng, WORDS, n_words)
+        msgstr = _sentence(rng, TRANSLATED_WORDS, n_words)
+
+        if rng.random() < obsolete_ratio:
+            obsolete_entries.append((msgid, msgstr))
+            continue
+
+        lines = ["\n"]
+        if rng.random() < comment_ratio:
+            lines.append(f"# Translator comment {i}\n")
+            lines.append(f"#. Translators: {_sentence(rng, WORDS, 4)}\n")
+        lines.append(f"#: src/module_{i % 97}.py:{i}\n")
+        if rng.random() < fuzzy_ratio:
+            lines.append("#, fuzzy, python-format\n")
+        if rng.random() < untranslated_ratio:
+            msgstr = ""
+
+        lines.append(_quote("msgid", msgid, line_width))
+        if rng.random() < plural_ratio:
+            lines.append(_quote("msgid_plural", f"{msgid}s", line_width))
+            lines.append(_quote("msgstr[0]", msgstr, line_width))
+            lines.append(_quote("msgstr[1]", msgstr and f"{msgstr}s", line_width))
+        else:
+            lines.append(_quote("msgstr", msgstr, line_width))
+        f.write("".join(lines))
+
+    for msgid, msgstr in obsolete_entries:
+        f.write(f'\n#~ msgid "{msgid}"\n#~ msgstr "{msgstr}"\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("n_entries", type=int, help="Number of entries")
+    parser.add_argument("output", help="Path of the file to write")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--plural-ratio", type=float, default=0.1)
+    parser.add_argument("--fuzzy-ratio", type=float, default=0.05)
+    parser.add_argument("--obsolete-ratio", type=float, default=0.02)
+    parser.add_argument("--untranslated-ratio", type=float, default=0.05)
+    parser.add_argument("--comment-ratio", type=float, default=0.5)
+    parser.add_argument("--max-words", type=int, default=20)
+    parser.add_argument("--line-width", type=int, default=79)
+    parser.add_argument("--header-size", type=int, default=len(STANDARD_HEADERS))
+    args = parser.parse_args()
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        generate_catalog(
+            f,
+            args.n_entries,
+            seed=args.seed,
+            plural_ratio=args.plural_ratio,
+            fuzzy_ratio=args.fuzzy_ratio,
+            obsolete_ratio=args.obsolete_ratio,
+            untranslated_ratio=args.untranslated_ratio,
+            comment_ratio=args.comment_ratio,
+            max_words=args.max_words,
+            line_width=args.line_width,
+            header_size=args.header_size,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,314 @@
+"""Benchmark suite for the hooks over synthetic PO files.
+
+Each hook function is executed in a fresh process over catalogs generated
+by ``generate.py``, measuring its wall time, throughput in entries per
+second and the peak resident memory of the process.
+
+The ``po-hooks`` command line is compared too against the separate hooks
+that it replaces, each one executed in its own process as pre-commit does,
+so the startup of the interpreter is included in both measures.
+
+Usage, with the package installed:
+
+    python benchmarks/run.py [--sizes 1000,100000,1000000] [--hooks NAME,...]
+                             [--save results.json] [--compare baseline.json]
+
+With ``--compare``, exits with code 1 if some hook is slower than in the
+baseline by more than ``--max-regression`` (25% by default). Exits with code
+1 too if ``po-hooks`` is slower than the separate hooks.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from generate import generate_catalog
+
+
+def _hooks():
+    from pre_commit_po_hooks.check_entries import (
+        MaxMessagesCheck,
+        maximum_number_of_lines,
+        maximum_number_of_messages,
+    )
+    from pre_commit_po_hooks.check_metadata import STANDARD_HEADERS_SPEC, check_metadata
+    from pre_commit_po_hooks.checks import run_checks
+    from pre_commit_po_hooks.fuzzy_messages import (
+        FuzzyMessagesCheck,
+        check_fuzzy_messages,
+    )
+    from pre_commit_po_hooks.lreplace_extracted_comments import (
+        lreplace_extracted_comments,
+    )
+    from pre_commit_po_hooks.obsolete_messages import (
+        ObsoleteMessagesCheck,
+        check_obsolete_messages,
+    )
+    from pre_commit_po_hooks.po_stats import catalogs_stats
+    from pre_commit_po_hooks.untranslated_messages import (
+        UntranslatedMessagesCheck,
+        check_untranslated_messages,
+    )
+
+    return {
+        "obsolete-messages": check_obsolete_messages,
+        "fuzzy-messages": check_fuzzy_messages,
+        "untranslated-messages": check_untranslated_messages,
+        "min-translated": lambda filenames: check_untranslated_messages(
+            filenames, min_="90%"
+        ),
+        "max-messages": maximum_number_of_messages,
+        "max-lines": maximum_number_of_lines,
+        "standard-metadata": lambda filenames: check_metadata(
+            filenames, STANDARD_HEADERS_SPEC
+        ),
+        "lreplace-extracted-comments": lambda filenames: (
+            lreplace_extracted_comments(
+                filenames, django_translators=True, dry_run=True
+            )
+        ),
+        "po-stats": catalogs_stats,
+        "po-hooks": lambda filenames: run_checks(
+            filenames,
+            [
+                (FuzzyMessagesCheck, {}),
+                (ObsoleteMessagesCheck, {}),
+                (UntranslatedMessagesCheck, {}),
+                (MaxMessagesCheck, {}),
+            ],
+        ),
+    }
+
+
+HOOKS = (
+    "obsolete-messages",
+    "fuzzy-messages",
+    "untranslated-messages",
+    "min-translated",
+    "max-messages",
+    "max-lines",
+    "standard-metadata",
+    "lreplace-extracted-comments",
+    "po-stats",
+    "po-hooks",
+)
+
+# command line of 'po-hooks' and those of the separate hooks replaced by it
+COMBINED_COMMAND = (
+    "po_hooks",
+    "--fuzzy",
+    "--obsolete",
+    "--untranslated",
+    "--max-messages",
+    "10000",
+)
+SEPARATE_COMMANDS = (
+    ("fuzzy_messages",),
+    ("obsolete_messages",),
+    ("untranslated_messages",),
+    ("check_entries", "--max-messages", "10000"),
+)
+
+
+def _peak_rss_kb():
+    import resource
+
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes in Linux, bytes in MacOS
+    return maxrss if sys.platform != "darwin" else maxrss // 1024
+
+
+def run_child(hook, filename):
+    """Execute a hook over a file in the current process and write its
+    measures to stdout as JSON.
+    """
+    func = _hooks()[hook]
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stderr(devnull):
+        start = time.perf_counter()
+        func([filename])
+        seconds = time.perf_counter() - start
+    try:
+        peak_rss_kb = _peak_rss_kb()
+    except ImportError:  # Windows
+        peak_rss_kb = None
+    sys.stdout.write(json.dumps({"seconds": seconds, "peak_rss_kb": peak_rss_kb}))
+
+
+def measure(hook, filename, repeat):
+    """Execute a hook over a file in new processes, returning the measures
+    of the fastest run.
+    """
+    best = None
+    for _ in range(repeat):
+        output = subprocess.check_output(
+            [sys.executable, __file__, "--child", hook, filename]
+        )
+        result = json.loads(output)
+        if best is None or result["seconds"] < best["seconds"]:
+            best = result
+    return best
+
+
+def measure_command(command, filename, repeat):
+    """Execute the command line of a hook over a file, returning the wall
+    time of the fastest run, including the startup of the interpreter.
+    """
+    module, *args = command
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", f"pre_commit_po_hooks.{module}", *args]
+            + ["--no-cache", filename],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            env={**os.environ, "PRE_COMMIT_PO_HOOKS_NO_DAEMON": "1"},
+        )
+        seconds = time.perf_counter() - start
+        if best is None or seconds < best:
+            best = seconds
+    return best
+
+
+def run(sizes, hooks, repeat=3):
+    results = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for n_entries in sizes:
+            filename = os.path.join(tmpdir, f"{n_entries}.po")
+            with open(filename, "w", encoding="utf-8") as f:
+                generate_catalog(f, n_entries)
+            size_mb = os.path.getsize(filename) / 1024 / 1024
+            print(f"{n_entries} entries ({size_mb:.1f} MB)", file=sys.stderr)
+
+            for hook in hooks:
+                result = measure(hook, filename, repeat)
+                result.update(
+                    hook=hook,
+                    entries=n_entries,
+                    entries_per_second=n_entries / max(result["seconds"], 1e-9),
+                )
+                results.append(result)
+                peak_rss = (
+                    "-"
+                    if result["peak_rss_kb"] is None
+                    else f"{result['peak_rss_kb'] / 1024:.1f} MB"
+                )
+                print(
+                    f"  {hook:<28} {result['seconds'] * 1000:10.1f} ms"
+                    f" {result['entries_per_second']:12.0f} entries/s"
+                    f"  peak RSS {peak_rss}",
+                    file=sys.stderr,
+                )
+
+            if "po-hooks" in hooks:
+                result = {
+                    "hook": "po-hooks-cli",
+                    "entries": n_entries,
+                    "seconds": measure_command(COMBINED_COMMAND, filename, repeat),
+                    "separate_seconds": sum(
+                        measure_command(command, filename, repeat)
+                        for command in SEPARATE_COMMANDS
+                    ),
+                }
+                results.append(result)
+                print(
+                    f"  {'po-hooks-cli':<28} {result['seconds'] * 1000:10.1f} ms"
+                    f" (separate hooks {result['separate_seconds'] * 1000:.1f} ms)",
+                    file=sys.stderr,
+                )
+    return results
+
+
+def compare_separate(results):
+    """Get the results of the ``po-hooks`` command line slower than the
+    separate hooks replaced by it.
+    """
+    return [
+        result
+        for result in results
+        if "separate_seconds" in result
+        and result["seconds"] > result["separate_seconds"]
+    ]
+
+
+def compare(results, baseline, max_regression):
+    """Compare results against a baseline, returning the regressions."""
+    baseline_seconds = {
+        (result["hook"], result["entries"]): result["seconds"] for result in baseline
+    }
+    regressions = []
+    for result in results:
+        expected = baseline_seconds.get((result["hook"], result["entries"]))
+        if expected is not None and result["seconds"] > expected * (1 + max_regression):
+            regressions.append((result, expected))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--child", nargs=2, metavar=("HOOK", "FILE"))
+    parser.add_argument(
+        "--sizes",
+        default="1000,100000,1000000",
+        help="Comma separated numbers of entries of the generated catalogs.",
+    )
+    parser.add_argument(
+        "--hooks",
+        default=",".join(HOOKS),
+        help="Comma separated hooks to measure. By default, all of them.",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", metavar="PATH", help="Save the results as JSON.")
+    parser.add_argument(
+        "--compare",
+        metavar="PATH",
+        help="Compare the times against results saved with '--save'.",
+    )
+    parser.add_argument("--max-regression", type=float, default=0.25)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(*args.child)
+        return 0
+
+    results = run(
+        [int(size) for size in args.sizes.split(",")],
+        args.hooks.split(","),
+        repeat=args.repeat,
+    )
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+
+    exitcode = 0
+    for result in compare_separate(results):
+        print(
+            f"po-hooks with {result['entries']} entries is slower than the"
+            f" separate hooks: {result['seconds'] * 1000:.1f} ms"
+            f" (separate {result['separate_seconds'] * 1000:.1f} ms)",
+            file=sys.stderr,
+        )
+        exitcode = 1
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.max_regression)
+        for result, expected in regressions:
+            print(
+                f"Regression in {result['hook']} with {result['entries']} entries:"
+                f" {result['seconds'] * 1000:.1f} ms"
+                f" (baseline {expected * 1000:.1f} ms)",
+                file=sys.stderr,
+            )
+        if regressions:
+            exitcode = 1
+    return exitcode
+
+
+if __name__ == "__main__":
+    exit(main())
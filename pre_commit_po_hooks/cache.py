@@ -0,0 +1,208 @@
+"""On-disk cache for the results of checks executed over PO files.
+
+Results are stored by a key computed from the content of the file, the
+checks executed with their options and the version of the package, so
+unchanged files are not checked again in subsequent runs.
+"""
+
+import collections
+import hashlib
+import json
+import os
+
+from pre_commit_po_hooks import __version__
+
+
+DEFAULT_CACHE_MAX_SIZE = 32 * 1024 * 1024
+DEFAULT_MEMORY_CACHE_MAX_ENTRIES = 10000
+_CHUNK_SIZE = 1024 * 1024
+
+
+def default_cache_dir():
+    """Return the default directory for the cache, following the XDG base
+    directory specification.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"),
+        ".cache",
+    )
+    return os.path.join(cache_home, "pre-commit-po-hooks")
+
+
+def _checks_signature(checks):
+    return json.dumps(
+        [
+            [check_class.name, check_class.__qualname__, kwargs]
+            for check_class, kwargs in checks
+        ],
+        sort_keys=True,
+        default=str,
+    )
+
+
+class ResultsCache:
+    """Cache for the results of checks.
+
+    Each result is stored in its own file inside ``directory``, so multiple
+    processes can use the same cache at the same time.
+
+    Parameters
+    ----------
+
+    directory : str
+      Directory in which the results are stored.
+
+    max_size : int, optional
+      Maximum size in bytes of the cache. When :py:meth:`evict` is called
+      and the cache is bigger, the least recently used results are removed.
+    """
+
+    def __init__(self, directory, max_size=DEFAULT_CACHE_MAX_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+
+    def key(self, filename, checks):
+        """Compute the key for the result of some checks over a file.
+
+        Parameters
+        ----------
+
+        filename : str
+          File to check.
+
+        checks : list
+          Pairs of check classes and keyword arguments to initialize them.
+
+        Returns
+        -------
+
+        str: Hexadecimal digest identifying the result.
+        """
+        hasher = hashlib.sha256()
+        hasher.update(__version__.encode())
+        hasher.update(b"\0")
+        hasher.update(_checks_signature(checks).encode())
+        hasher.update(b"\0")
+        hasher.update(os.fsencode(filename))
+        hasher.update(b"\0")
+        with open(filename, "rb") as f:
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        """Get a cached result.
+
+        Returns
+        -------
+
+        tuple: Exitcode and output of the checks or ``None`` if the result
+          is not cached.
+        """
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return data["exitcode"], data["output"]
+
+    def set(self, key, result):
+        """Store a result, as returned by :py:meth:`get`."""
+        exitcode, output = result
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump({"exitcode": exitcode, "output": output}, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+    def evict(self):
+        """Remove the least recently used results until the size of the
+        cache is not greater than ``max_size``.
+        """
+        try:
+            entries = list(os.scandir(self.directory))
+        except OSError:
+            return
+
+        stats = []
+        for entry in entries:
+            try:
+                stats.append((entry.stat().st_mtime, entry.stat().st_size, entry))
+            except OSError:
+                continue
+
+        total_size = sum(size for _, size, _ in stats)
+        for _, size, entry in sorted(stats, key=lambda stat: stat[0]):
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(entry.path)
+            except OSError:
+                continue
+            total_size -= size
+
+
+class MemoryResultsCache:
+    """In-memory cache for the results of checks, for long running processes.
+
+    Results are stored by the path, modification time and size of the files
+    instead of their content, so files don't need to be read to compute
+    their keys.
+
+    Parameters
+    ----------
+
+    max_entries : int, optional
+      Maximum number of results stored. When exceeded, the least recently
+      used ones are removed.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MEMORY_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._results = collections.OrderedDict()
+
+    def key(self, filename, checks):
+        """Compute the key for the result of some checks over a file.
+
+        Returns
+        -------
+
+        tuple: Key identifying the result or ``None`` if the file can't be
+          accessed.
+        """
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return None
+        # the outputs include the file name as it was passed, so the same
+        # file passed with other path has its own result
+        return (
+            os.path.abspath(filename),
+            os.fspath(filename),
+            stat.st_mtime_ns,
+            stat.st_size,
+            _checks_signature(checks),
+        )
+
+    def get(self, key):
+        """Get a cached result, ``None`` if the result is not cached."""
+        result = self._results.get(key)
+        if result is not None:
+            self._results.move_to_end(key)
+        return result
+
+    def set(self, key, result):
+        """Store a result."""
+        self._results[key] = result
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
@@ -1,10 +1,150 @@
 """Script that checks entries of PO files."""
 
 import argparse
-import sys
 
+from pre_commit_po_hooks.checks import (
+    Check,
+    add_cache_arguments,
+    add_fail_fast_argument,
+    add_jobs_argument,
+    add_max_reports_argument,
+    cache_dir_from_args,
+    run_checks,
+)
+from pre_commit_po_hooks.daemon import forward_to_daemon
+from pre_commit_po_hooks.instrumentation import (
+    add_instrumentation_arguments,
+    instrument,
+)
+from pre_commit_po_hooks.po import entry_digest, is_header_msgid, iter_line_offsets
 
-def maximum_number_of_messages(filenames, max_messages=10000, quiet=False):
+
+class MaxMessagesCheck(Check):
+    """Reports if a PO file contains more messages than allowed.
+
+    If ``fail_fast`` is enabled, stops counting when the maximum is exceeded.
+    """
+
+    name = "max-messages"
+
+    def __init__(
+        self,
+        filename,
+        max_messages=10000,
+        quiet=False,
+        fail_fast=False,
+        max_reports=None,
+    ):
+        super().__init__(
+            filename, quiet=quiet, fail_fast=fail_fast, max_reports=max_reports
+        )
+        self.max_messages = max_messages
+        self.number_of_messages = 0
+
+    def feed_entry(self, entry):
+        if not entry.obsolete and not entry.is_header:
+            self.number_of_messages += 1
+            if self.fail_fast and self.number_of_messages > self.max_messages:
+                self.report(
+                    f"More messages than allowed ({self.max_messages})"
+                    f" at file {self.filename}"
+                )
+
+    def feed_chunk(self, chunk, lineno):
+        self.number_of_messages += chunk.count(b"\nmsgid ") + chunk.startswith(
+            b"msgid "
+        )
+        for offset in iter_line_offsets(chunk, b'msgid ""'):
+            if is_header_msgid(chunk, offset):
+                self.number_of_messages -= 1
+        if self.fail_fast and self.number_of_messages > self.max_messages:
+            self.report(
+                f"More messages than allowed ({self.max_messages})"
+                f" at file {self.filename}"
+            )
+
+    def finish(self):
+        if not self.done and self.number_of_messages > self.max_messages:
+            self.report(
+                f"More messages ({self.number_of_messages}) than allowed"
+                f" ({self.max_messages}) at file {self.filename}"
+            )
+
+
+class MaxLinesCheck(Check):
+    """Reports if a PO file contains more lines than allowed.
+
+    If ``fail_fast`` is enabled, stops counting when the maximum is exceeded.
+    """
+
+    name = "max-lines"
+
+    def __init__(
+        self, filename, max_lines=10000, quiet=False, fail_fast=False, max_reports=None
+    ):
+        super().__init__(
+            filename, quiet=quiet, fail_fast=fail_fast, max_reports=max_reports
+        )
+        self.max_lines = max_lines
+        self.number_of_lines = 0
+        self._unterminated_line = False
+
+    def _count_lines(self, number_of_lines):
+        self.number_of_lines += number_of_lines
+        if self.fail_fast and self.number_of_lines > self.max_lines:
+            self.report(
+                f"More lines than allowed ({self.max_lines}) at file {self.filename}"
+            )
+
+    def feed_token(self, token):
+        self._count_lines(1)
+
+    def feed_chunk(self, chunk, lineno):
+        self._count_lines(chunk.count(b"\n"))
+        self._unterminated_line = not chunk.endswith(b"\n")
+
+    def finish(self):
+        if self._unterminated_line:
+            self._count_lines(1)
+        if not self.done and self.number_of_lines > self.max_lines:
+            self.report(
+                f"More lines ({self.number_of_lines}) than allowed"
+                f" ({self.max_lines}) at file {self.filename}"
+            )
+
+
+class DuplicateMessagesCheck(Check):
+    """Reports messages defined more than once in a PO file with the same
+    context, which make ``msgfmt`` fail.
+
+    Messages are indexed by a digest of their context and their complete
+    message, so the memory used doesn't depend on the length of the
+    messages. Obsolete messages are ignored.
+    """
+
+    name = "duplicate-messages"
+
+    def __init__(self, filename, quiet=False, fail_fast=False, max_reports=None):
+        super().__init__(
+            filename, quiet=quiet, fail_fast=fail_fast, max_reports=max_reports
+        )
+        self._linenos = {}
+
+    def feed_entry(self, entry):
+        if entry.obsolete:
+            return
+        lineno = self._linenos.setdefault(entry_digest(entry), entry.msgid_lineno)
+        if lineno != entry.msgid_lineno:
+            self.report(
+                f"Duplicate message at {self.filename}:{entry.msgid_lineno},"
+                f" first defined at {self.filename}:{lineno}",
+                lineno=entry.msgid_lineno,
+            )
+
+
+def maximum_number_of_messages(
+    filenames, max_messages=10000, quiet=False, jobs=1, cache_dir=None, fail_fast=False
+):
     """Check that the maximum number of messages in each PO file is not
     greater than the number passed in the parameter ``max_messages``.
 
@@ -21,36 +161,46 @@ def maximum_number_of_messages(filenames, max_messages=10000, quiet=False):
       Enabled, don't print output to stderr when more messages than allowed
       are found.
 
+    jobs : int, optional
+      Number of processes used to check the files in parallel. If ``None``,
+      the number of CPUs available.
+
+    cache_dir : str, optional
+      Directory in which the results are cached, so unchanged files are not
+      checked again. If ``None``, the cache is not used.
+
+    fail_fast : bool, optional
+      Enabled, stop counting at the first file that exceeds the maximum,
+      without checking the rest of the files. Implied by ``quiet``.
+
     Returns
     -------
 
     int: 0 if no more than ``max_messages`` messages found for each file,
       1 otherwise.
     """
-    exitcode = 0
-
-    for filename in filenames:
-        with open(filename) as f:
-            content_lines = f.readlines()
-
-        number_of_messages = -1
-        for line in content_lines:
-            if line.startswith('msgid "'):
-                number_of_messages += 1
-        number_of_messages = max(number_of_messages, 0)
-
-        if number_of_messages > max_messages:
-            exitcode = 1
-            if not quiet:
-                sys.stderr.write(
-                    f"More messages ({number_of_messages}) than allowed"
-                    f" ({max_messages}) at file {filename}\n"
-                )
-
-    return exitcode
+    fail_fast = fail_fast or quiet
+    return run_checks(
+        filenames,
+        [
+            (
+                MaxMessagesCheck,
+                {
+                    "max_messages": max_messages,
+                    "quiet": quiet,
+                    "fail_fast": fail_fast,
+                },
+            )
+        ],
+        jobs=jobs,
+        cache_dir=cache_dir,
+        fail_fast=fail_fast,
+    )
 
 
-def maximum_number_of_lines(filenames, max_lines=10000, quiet=False):
+def maximum_number_of_lines(
+    filenames, max_lines=10000, quiet=False, jobs=1, cache_dir=None, fail_fast=False
+):
     """Check if a set of PO files has more lines than allowed.
 
     Parameters
@@ -66,29 +216,95 @@ def maximum_number_of_lines(filenames, max_lines=10000, quiet=False):
       Enabled, don't print output to stderr when more lines than allowed
       are found.
 
+    jobs : int, optional
+      Number of processes used to check the files in parallel. If ``None``,
+      the number of CPUs available.
+
+    cache_dir : str, optional
+      Directory in which the results are cached, so unchanged files are not
+      checked again. If ``None``, the cache is not used.
+
+    fail_fast : bool, optional
+      Enabled, stop counting at the first file that exceeds the maximum,
+      without checking the rest of the files. Implied by ``quiet``.
+
     Returns
     -------
 
     int: 0 if no more than ``max_lines`` lines found for each file,
       1 otherwise.
     """
-    exitcode = 0
+    fail_fast = fail_fast or quiet
+    return run_checks(
+        filenames,
+        [
+            (
+                MaxLinesCheck,
+                {"max_lines": max_lines, "quiet": quiet, "fail_fast": fail_fast},
+            )
+        ],
+        jobs=jobs,
+        cache_dir=cache_dir,
+        fail_fast=fail_fast,
+    )
+
+
+def check_duplicate_messages(
+    filenames, quiet=False, jobs=1, cache_dir=None, fail_fast=False, max_reports=None
+):
+    """Check that no message is defined more than once with the same context
+    in each PO file, like ``msguniq --repeated``.
+
+    Parameters
+    ----------
+
+    filenames : list
+      Set of file names to check.
 
-    for filename in filenames:
-        with open(filename) as f:
-            number_of_lines = len(f.readlines())
-            if number_of_lines > max_lines:
-                exitcode = 1
-                if not quiet:
-                    sys.stderr.write(
-                        f"More lines ({number_of_lines}) than allowed ({max_lines})"
-                        f" at file {filename}\n"
-                    )
+    quiet : bool, optional
+      Enabled, don't print output to stderr when a duplicate message is found.
+
+    jobs : int, optional
+      Number of processes used to check the files in parallel. If ``None``,
+      the number of CPUs available.
+
+    cache_dir : str, optional
+      Directory in which the results are cached, so unchanged files are not
+      checked again. If ``None``, the cache is not used.
+
+    fail_fast : bool, optional
+      Enabled, stop at the first duplicate message found, without checking
+      the rest of the files. Implied by ``quiet``.
 
-    return exitcode
+    max_reports : int, optional
+      Maximum number of duplicate messages reported for each file. The rest
+      are summarized in a single line.
+
+    Returns
+    -------
+
+    int: 0 if no duplicate messages found, 1 otherwise.
+    """
+    fail_fast = fail_fast or quiet
+    return run_checks(
+        filenames,
+        [
+            (
+                DuplicateMessagesCheck,
+                {"quiet": quiet, "fail_fast": fail_fast, "max_reports": max_reports},
+            )
+        ],
+        jobs=jobs,
+        cache_dir=cache_dir,
+        fail_fast=fail_fast,
+    )
 
 
 def main():
+    exitcode = forward_to_daemon("check_entries")
+    if exitcode is not None:
+        return exitcode
+
     parser = argparse.ArgumentParser()
     parser.add_argument(
         "filenames", nargs="*", help="Filenames to check for obsolete messages"
@@ -119,22 +335,49 @@ def main():
             "greater than the number passed in this parameter."
         ),
     )
+    parser.add_argument(
+        "--no-duplicates",
+        action="store_true",
+        dest="no_duplicates",
+        help=(
+            "Check that no message is defined more than once with the same"
+            " context in each PO file."
+        ),
+    )
+    add_jobs_argument(parser)
+    add_cache_arguments(parser)
+    add_fail_fast_argument(parser)
+    add_max_reports_argument(parser)
+    add_instrumentation_arguments(parser)
     args = parser.parse_args()
 
-    if not any([args.max_messages, args.max_lines]):
+    if not any([args.max_messages, args.max_lines, args.no_duplicates]):
         parser.print_help()
         return 1
 
-    returncodes = [
-        maximum_number_of_messages(args.filenames, args.max_messages, quiet=args.quiet)
-        if args.max_messages is not None
-        else 0,
-        maximum_number_of_lines(args.filenames, args.max_lines, quiet=args.quiet)
-        if args.max_lines is not None
-        else 0,
-    ]
+    options = {
+        "quiet": args.quiet,
+        "fail_fast": args.fail_fast or args.quiet,
+        "max_reports": args.max_reports,
+    }
+    checks = []
+    if args.max_messages is not None:
+        checks.append(
+            (MaxMessagesCheck, {"max_messages": args.max_messages, **options})
+        )
+    if args.max_lines is not None:
+        checks.append((MaxLinesCheck, {"max_lines": args.max_lines, **options}))
+    if args.no_duplicates:
+        checks.append((DuplicateMessagesCheck, options))
 
-    return 1 if any(returncodes) else 0
+    with instrument(args, parser.prog):
+        return run_checks(
+            args.filenames,
+            checks,
+            jobs=args.jobs,
+            cache_dir=cache_dir_from_args(args),
+            fail_fast=options["fail_fast"],
+        )
 
 
 if __name__ == "__main__":
@@ -5,12 +5,221 @@ a regex.
 """
 
 import argparse
+import itertools
 import re
 import sys
 
+from pre_commit_po_hooks.checks import (
+    Check,
+    add_cache_arguments,
+    add_fail_fast_argument,
+    add_jobs_argument,
+    cache_dir_from_args,
+    run_checks,
+)
+from pre_commit_po_hooks.daemon import forward_to_daemon
+from pre_commit_po_hooks.files import atomic_write
+from pre_commit_po_hooks.instrumentation import (
+    add_instrumentation_arguments,
+    instrument,
+)
+from pre_commit_po_hooks.po import TOKEN_KEYWORD, TOKEN_STRING, iter_metadata
+
+
+STANDARD_HEADERS_SPEC = {
+    "Project-Id-Version": r"\d+\.\d+\.\d",
+    "Report-Msgid-Bugs-To": r".+\s<.+@.+\..+>",
+    "Last-Translator": r".+\s<.+@.+\..+>",
+    "Language-Team": r".+\s<.+@.+\..+>",
+    "Language": r"\w\w_?\w?\w?(@\w+)?",
+    "Content-Type": r"text/plain; charset=[0-9a-zA-Z\-]+",
+    "Content-Transfer-Encoding": r"\d+bits?",
+}
+
+
+class HeaderSpec:
+    """Compiled specification of the metadata headers of PO files.
+
+    Build it once and use it to validate the metadata of any number of
+    files.
+
+    Parameters
+    ----------
+
+    headers_spec : dict
+      Name of headers as keys and regular expressions as values. The values
+      of the headers must match the regular expressions from their start.
+    """
+
+    def __init__(self, headers_spec):
+        self.regexes = {
+            header: re.compile(value) for header, value in headers_spec.items()
+        }
+
+    def __bool__(self):
+        return bool(self.regexes)
+
+    def __repr__(self):
+        patterns = {header: regex.pattern for header, regex in self.regexes.items()}
+        return f"HeaderSpec({patterns!r})"
+
+    def validate(self, headers):
+        """Validate the metadata headers of a file.
+
+        Parameters
+        ----------
+
+        headers : iterable
+          Line number, name and value of each header, as yielded by
+          :py:func:`pre_commit_po_hooks.po.iter_metadata`. A dictionary
+          of names and values is accepted too.
+
+        Returns
+        -------
+
+        tuple: List of ``(lineno, header, value, regex)`` tuples for each
+          header whose value doesn't match its regular expression, and list
+          of headers of the specification not found in the metadata.
+        """
+        if isinstance(headers, dict):
+            headers = ((None, header, value) for header, value in headers.items())
+
+        wrong_headers, found_headers = [], set()
+        for lineno, header, value in headers:
+            regex = self.regexes.get(header)
+            if regex is None:
+                continue
+            found_headers.add(header)
+            if regex.match(value) is None:
+                wrong_headers.append((lineno, header, value, regex))
+
+        missing_headers = [
+            header for header in self.regexes if header not in found_headers
+        ]
+        return wrong_headers, missing_headers
+
+
+class MetadataCheck(Check):
+    """Checks the metadata of a PO file against a specification.
+
+    Reads the metadata from the token stream, and is done after the header
+    entry, which must be the first entry of the file, so the rest of the file
+    is not read. After the check, the attribute ``msgstr_lineno`` holds
+    the line number of the ``msgstr ""`` line of the header entry and
+    ``metadata`` a list of ``(lineno, content)`` pairs for each metadata
+    string, both ``None`` if the file has no header entry.
+    """
+
+    name = "check-metadata"
+    stops_early = True
+
+    def __init__(
+        self,
+        filename,
+        headers_spec=None,
+        no_metadata=False,
+        remove_metadata=False,
+        quiet=False,
+        fail_fast=False,
+        max_reports=None,
+    ):
+        super().__init__(
+            filename, quiet=quiet, fail_fast=fail_fast, max_reports=max_reports
+        )
+        if not isinstance(headers_spec, HeaderSpec):
+            headers_spec = HeaderSpec(headers_spec or {})
+        self.headers_spec = headers_spec
+        self.no_metadata = no_metadata
+        self.remove_metadata = remove_metadata
+        self.needs_file = remove_metadata
+
+        self.msgstr_lineno = None
+        self.metadata = None
+        self._header_msgid_found = False
+
+    def feed_token(self, token):
+        if self.done:
+            return
+        if self.metadata is not None:
+            if token.kind == TOKEN_STRING:
+                self.metadata.append((token.lineno, token.value))
+            else:
+                self.done = True
+        elif self._header_msgid_found:
+            if token.keyword == "msgstr" and token.value == "":
+                self.msgstr_lineno = token.lineno
+                self.metadata = []
+            else:
+                self.done = True
+        elif (
+            token.kind == TOKEN_KEYWORD
+            and token.keyword == "msgid"
+            and not token.obsolete
+        ):
+            if token.value == "":
+                self._header_msgid_found = True
+            else:
+                self.done = True
+
+    def finish(self):
+        if self.msgstr_lineno is None:
+            return
+        if not self.metadata:
+            if not self.no_metadata:
+                self.report(f"No metadata found in the file {self.filename}")
+        elif self.remove_metadata:
+            self._remove_metadata()
+            self.exitcode = 1
+            self.cacheable = False
+        elif self.no_metadata:
+            lineno = self.metadata[0][0]
+            self.report(
+                f"Found unexpected metadata at {self.filename}:{lineno}",
+                lineno=lineno,
+            )
+        else:
+            self._validate_metadata()
+
+    def _remove_metadata(self):
+        import shutil
+
+        first_lineno, last_lineno = self.metadata[0][0], self.metadata[-1][0]
+        with atomic_write(self.filename, "wb") as tmp_f:
+            with open(self.filename, "rb") as f:
+                tmp_f.writelines(itertools.islice(f, first_lineno - 1))
+                for _ in itertools.islice(f, last_lineno - first_lineno + 1):
+                    pass
+                shutil.copyfileobj(f, tmp_f)
+
+    def _validate_metadata(self):
+        wrong_headers, missing_headers = self.headers_spec.validate(
+            iter_metadata(self.metadata)
+        )
+        for lineno, header, value, regex in wrong_headers:
+            self.report(
+                f"Wrong metadata value at {self.filename}"
+                f":{lineno} (regex"
+                f" '{regex.pattern}' not matching for value"
+                f" '{value}' in header '{header}')",
+                lineno=lineno,
+            )
+        for header in missing_headers:
+            self.report(
+                f"Metadata header '{header}' expected at file"
+                f" {self.filename}:{self.msgstr_lineno}, but not found",
+                lineno=self.msgstr_lineno,
+            )
+
 
 def check_metadata(
-    filenames, headers_spec, no_metadata=False, remove_metadata=False, quiet=False
+    filenames,
+    headers_spec,
+    no_metadata=False,
+    remove_metadata=False,
+    quiet=False,
+    jobs=1,
+    cache_dir=None,
+    fail_fast=False,
 ):
     """Check that metadata headers and values match a set of requirements.
 
@@ -22,7 +231,7 @@ def check_metadata(
 
     headers_spec : dict
       Name of headers as keys and regular expressions as values to match
-      in the metadata of each file.
+      in the metadata of each file. Can be a :py:class:`HeaderSpec` too.
 
     no_metadata : bool, optional
       When this option is set to ``True``, the hook instead checks that there
@@ -35,101 +244,66 @@ def check_metadata(
     quiet : bool, optional
       Enabled, don't print output to stderr when a wrong metadata is found.
 
+    jobs : int, optional
+      Number of processes used to check the files in parallel. If ``None``,
+      the number of CPUs available.
+
+    cache_dir : str, optional
+      Directory in which the results are cached, so unchanged files are not
+      checked again. If ``None``, the cache is not used.
+
+    fail_fast : bool, optional
+      Enabled, stop at the first wrong metadata found, without checking the
+      rest of the files. Implied by ``quiet`` if ``remove_metadata`` is not
+      enabled.
+
     Returns
     -------
 
     int: 0 if no wrong metadata fields found, 1 otherwise.
     """
-    headers_spec_regex = {
-        header: re.compile(rf"{value}") for header, value in headers_spec.items()
-    }
-
-    exitcode = 0
-    for filename in filenames:
-        headers_matched = []
-
-        with open(filename) as f:
-            content_lines = f.readlines()
-
-        _first_metadata_line = None
-        for i, line in enumerate(content_lines):
-            if line.startswith('msgid ""') and content_lines[i + 1].startswith(
-                'msgstr ""'
-            ):
-                if (len(content_lines) > i + 2) and content_lines[i + 2].startswith(
-                    '"'
-                ):
-                    _first_metadata_line = i + 2
-
-                    if no_metadata and not remove_metadata:
-                        exitcode = 1
-                        if not quiet:
-                            sys.stderr.write(
-                                f"Found unexpected metadata at {filename}:{i + 3}\n"
-                            )
-                else:
-                    if not no_metadata:
-                        exitcode = 1
-                        if not quiet:
-                            sys.stderr.write(
-                                f"No metadata found in the file {filename}\n"
-                            )
-
-                break
-
-        if (no_metadata and exitcode) or _first_metadata_line is None:
-            continue
-
-        if remove_metadata:
-            with open(filename, "w") as f:
-                f.write("".join(content_lines[:_first_metadata_line]))
-
-                index = 0
-                for i, line in enumerate(content_lines[_first_metadata_line:]):
-                    if not line.strip():
-                        index = i
-                        break
-
-                f.write("".join(content_lines[_first_metadata_line + index :]))
-                exitcode = 1
-        else:
-            for i, line in enumerate(content_lines[_first_metadata_line:]):
-                if not line.strip():
-                    break
-
-                header, value = line.split(": ", maxsplit=1)
-                header = header.lstrip('"')
-
-                if header in headers_spec_regex:
-                    headers_matched.append(header)
-                    value = re.sub(r"(\n|\\n|\"$)+", "", value)
-                    regex = headers_spec_regex[header]
-                    if re.match(regex, value) is None:
-                        exitcode = 1
-                        if not quiet:
-                            sys.stderr.write(
-                                f"Wrong metadata value at {filename}"
-                                f":{_first_metadata_line + i + 1} (regex"
-                                f" '{regex.pattern}' not matching for value"
-                                f" '{value}' in header '{header}')\n"
-                            )
-
-            for header in headers_spec.keys():
-                if header not in headers_matched:
-                    sys.stderr.write(
-                        f"Metadata header '{header}' expected at file"
-                        f" {filename}:{_first_metadata_line}, but not found\n"
-                    )
-                    exitcode = 1
-
-    return exitcode
+    if not isinstance(headers_spec, HeaderSpec):
+        # compiled once for all the files
+        headers_spec = HeaderSpec(headers_spec or {})
+    fail_fast = not remove_metadata and (fail_fast or quiet)
+    return run_checks(
+        filenames,
+        [
+            (
+                MetadataCheck,
+                {
+                    "headers_spec": headers_spec,
+                    "no_metadata": no_metadata,
+                    "remove_metadata": remove_metadata,
+                    "quiet": quiet,
+                    "fail_fast": fail_fast,
+                },
+            )
+        ],
+        jobs=jobs,
+        cache_dir=cache_dir,
+        fail_fast=fail_fast,
+    )
 
 
-def main():
-    parser = argparse.ArgumentParser()
+def extract_headers_spec(argv):
+    """Extract the ``-h/--header`` and ``-v/--value`` arguments from an
+    argument vector. They are handled outside :py:mod:`argparse` because
+    ``-h`` would conflict with the help option.
+
+    Parameters
+    ----------
+
+    argv : list
+      Command line arguments, modified in place removing the extracted ones.
 
+    Returns
+    -------
+
+    dict: Headers specification passed in the arguments.
+    """
     to_remove = ["-h", "--header", "-v", "--value"]
-    argv, headers_spec, _current_header = (sys.argv, dict(), None)
+    headers_spec, _current_header = (dict(), None)
     argv_length = len(argv)
     for i, arg in enumerate(argv):
         if i < (argv_length - 1):
@@ -143,6 +317,59 @@ def main():
     for value in to_remove:
         if value in argv:
             argv.remove(value)
+    return headers_spec
+
+
+def resolve_headers_spec(headers_spec, no_metadata=False, standard_headers=False):
+    """Validate the metadata options passed in the command line and build
+    the final headers specification.
+
+    Parameters
+    ----------
+
+    headers_spec : dict
+      Headers specification passed with ``-h`` and ``-v`` arguments.
+
+    no_metadata : bool, optional
+      If ``--no-metadata`` option has been passed.
+
+    standard_headers : bool, optional
+      If ``--standard-headers`` option has been passed.
+
+    Returns
+    -------
+
+    dict: Headers specification to check.
+    """
+    if no_metadata and len(headers_spec.keys()):
+        raise ValueError(
+            "You must pass either '--no-metadata' or headers regexes specification,"
+            " but both can't be non false."
+        )
+
+    if no_metadata and standard_headers:
+        raise ValueError(
+            "You must pass either '--no-metadata' or standard headers regexes"
+            " specification."
+        )
+
+    if standard_headers:
+        new_headers_spec = dict(STANDARD_HEADERS_SPEC)
+        if headers_spec:
+            new_headers_spec.update(headers_spec)
+
+        headers_spec = new_headers_spec
+    return headers_spec
+
+
+def main():
+    exitcode = forward_to_daemon("check_metadata")
+    if exitcode is not None:
+        return exitcode
+
+    parser = argparse.ArgumentParser()
+
+    headers_spec = extract_headers_spec(sys.argv)
 
     parser.add_argument(
         "filenames", nargs="*", help="Filenames to check for obsolete messages"
@@ -186,46 +413,33 @@ def main():
         ),
     )
     parser.add_argument("-q", "--quiet", action="store_true", help="Supress output")
+    add_jobs_argument(parser)
+    add_cache_arguments(parser)
+    add_fail_fast_argument(parser)
+    add_instrumentation_arguments(parser)
     args = parser.parse_args()
 
     if args.remove_metadata:
         args.no_metadata = True
 
-    if args.no_metadata and len(headers_spec.keys()):
-        raise ValueError(
-            "You must pass either '--no-metadata' or headers regexes specification,"
-            " but both can't be non false."
-        )
-
-    if args.no_metadata and args.standard_headers:
-        raise ValueError(
-            "You must pass either '--no-metadata' or standard headers regexes"
-            " specification."
-        )
-
-    if args.standard_headers:
-        new_headers_spec = {
-            "Project-Id-Version": r"\d+\.\d+\.\d",
-            "Report-Msgid-Bugs-To": r".+\s<.+@.+\..+>",
-            "Last-Translator": r".+\s<.+@.+\..+>",
-            "Language-Team": r".+\s<.+@.+\..+>",
-            "Language": r"\w\w_?\w?\w?(@\w+)?",
-            "Content-Type": r"text/plain; charset=[0-9a-zA-Z\-]+",
-            "Content-Transfer-Encoding": r"\d+bits?",
-        }
-        if headers_spec:
-            new_headers_spec.update(headers_spec)
-
-        headers_spec = new_headers_spec
-
-    return check_metadata(
-        args.filenames,
+    headers_spec = resolve_headers_spec(
         headers_spec,
         no_metadata=args.no_metadata,
-        remove_metadata=args.remove_metadata,
-        quiet=args.quiet,
+        standard_headers=args.standard_headers,
     )
 
+    with instrument(args, parser.prog):
+        return check_metadata(
+            args.filenames,
+            headers_spec,
+            no_metadata=args.no_metadata,
+            remove_metadata=args.remove_metadata,
+            quiet=args.quiet,
+            jobs=args.jobs,
+            cache_dir=cache_dir_from_args(args),
+            fail_fast=args.fail_fast,
+        )
+
 
 if __name__ == "__main__":
     exit(main())
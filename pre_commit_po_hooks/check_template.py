@@ -0,0 +1,229 @@
+"""Checks that PO files contain the same messages as a POT template.
+
+Returns an error code if a PO file has messages not defined in the template
+or lacks messages of the template.
+"""
+
+import argparse
+import os
+
+from pre_commit_po_hooks.checks import (
+    Check,
+    add_cache_arguments,
+    add_fail_fast_argument,
+    add_jobs_argument,
+    add_max_reports_argument,
+    cache_dir_from_args,
+    run_checks,
+)
+from pre_commit_po_hooks.daemon import forward_to_daemon
+from pre_commit_po_hooks.instrumentation import (
+    add_instrumentation_arguments,
+    instrument,
+)
+from pre_commit_po_hooks.po import entry_digest, iter_entries
+
+
+class TemplateIndex:
+    """Messages of a POT template, parsed once to check any number of PO
+    files against it.
+
+    Messages are indexed by their digest (see
+    :py:func:`pre_commit_po_hooks.po.entry_digest`) along with their line
+    number in the template, so the index is small enough to be sent to
+    each process checking files in parallel.
+
+    Parameters
+    ----------
+
+    filename : str
+      POT file. The header and the obsolete messages are not indexed.
+    """
+
+    def __init__(self, filename):
+        import hashlib
+
+        self.filename = filename
+        self.linenos = {}
+        with open(filename) as f:
+            for entry in iter_entries(f):
+                if not entry.obsolete and not entry.is_header:
+                    self.linenos.setdefault(entry_digest(entry), entry.msgid_lineno)
+
+        # identifies the messages and their locations in the signature of
+        # the results cache
+        hasher = hashlib.blake2b(digest_size=16)
+        for digest, lineno in self.linenos.items():
+            hasher.update(digest)
+            hasher.update(lineno.to_bytes(4, "little"))
+        self.digest = hasher.hexdigest()
+
+    def __repr__(self):
+        return f"TemplateIndex({self.filename!r}, {self.digest!r})"
+
+
+class TemplateCheck(Check):
+    """Reports the messages of a PO file not defined in a template and the
+    messages of the template missing in the file.
+
+    The header and the obsolete messages are ignored.
+    """
+
+    name = "check-template"
+
+    def __init__(
+        self, filename, template=None, quiet=False, fail_fast=False, max_reports=None
+    ):
+        super().__init__(
+            filename, quiet=quiet, fail_fast=fail_fast, max_reports=max_reports
+        )
+        if not isinstance(template, TemplateIndex):
+            template = TemplateIndex(template)
+        self.template = template
+        self._found = set()
+
+    def feed_entry(self, entry):
+        if entry.obsolete or entry.is_header:
+            return
+        digest = entry_digest(entry)
+        if digest in self.template.linenos:
+            self._found.add(digest)
+        else:
+            self.report(
+                f"Message at {self.filename}:{entry.msgid_lineno} not found in"
+                f" template {self.template.filename}",
+                lineno=entry.msgid_lineno,
+            )
+
+    def finish(self):
+        if self.done:
+            return
+        for digest, lineno in self.template.linenos.items():
+            if digest not in self._found:
+                self.report(
+                    f"Message of template {self.template.filename}:{lineno}"
+                    f" not found at file {self.filename}"
+                )
+                if self.done:
+                    break
+
+
+def check_template(
+    filenames,
+    template,
+    quiet=False,
+    jobs=1,
+    cache_dir=None,
+    fail_fast=False,
+    max_reports=None,
+):
+    """Check that a set of PO files contain exactly the messages of a POT
+    template, like ``msgcmp`` but parsing the template once for all the
+    files.
+
+    Parameters
+    ----------
+
+    filenames : list
+      Set of file names to check. The template is skipped if included.
+
+    template : str
+      POT file with the expected messages. Can be a :py:class:`TemplateIndex`
+      too.
+
+    quiet : bool, optional
+      Enabled, don't print output to stderr when a message is missing or
+      not defined in the template.
+
+    jobs : int, optional
+      Number of processes used to check the files in parallel. If ``None``,
+      the number of CPUs available.
+
+    cache_dir : str, optional
+      Directory in which the results are cached, so unchanged files are not
+      checked again. If ``None``, the cache is not used.
+
+    fail_fast : bool, optional
+      Enabled, stop at the first difference found, without checking the
+      rest of the files. Implied by ``quiet``.
+
+    max_reports : int, optional
+      Maximum number of differences reported for each file. The rest are
+      summarized in a single line.
+
+    Returns
+    -------
+
+    int: 0 if all the files contain the messages of the template, 1
+      otherwise.
+    """
+    if not isinstance(template, TemplateIndex):
+        # parsed once for all the files
+        template = TemplateIndex(template)
+    template_path = os.path.abspath(template.filename)
+    filenames = [
+        filename for filename in filenames if os.path.abspath(filename) != template_path
+    ]
+
+    fail_fast = fail_fast or quiet
+    return run_checks(
+        filenames,
+        [
+            (
+                TemplateCheck,
+                {
+                    "template": template,
+                    "quiet": quiet,
+                    "fail_fast": fail_fast,
+                    "max_reports": max_reports,
+                },
+            )
+        ],
+        jobs=jobs,
+        cache_dir=cache_dir,
+        fail_fast=fail_fast,
+    )
+
+
+def main():
+    exitcode = forward_to_daemon("check_template")
+    if exitcode is not None:
+        return exitcode
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "filenames", nargs="*", help="Filenames to check against the template"
+    )
+    parser.add_argument(
+        "--pot",
+        metavar="PATH",
+        required=True,
+        dest="pot",
+        help="POT file with the messages that each PO file must contain.",
+    )
+    parser.add_argument("-q", "--quiet", action="store_true", help="Supress output")
+    add_jobs_argument(parser)
+    add_cache_arguments(parser)
+    add_fail_fast_argument(parser)
+    add_max_reports_argument(parser)
+    add_instrumentation_arguments(parser)
+    args = parser.parse_args()
+
+    with instrument(args, parser.prog):
+        try:
+            template = TemplateIndex(args.pot)
+        except OSError as exc:
+            parser.error(f"can't read the template '{args.pot}': {exc.strerror}")
+        return check_template(
+            args.filenames,
+            template,
+            quiet=args.quiet,
+            jobs=args.jobs,
+            cache_dir=cache_dir_from_args(args),
+            fail_fast=args.fail_fast,
+            max_reports=args.max_reports,
+        )
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,740 @@
+"""Execution of checks over PO files.
+
+Each check is a class that consumes the tokens and/or entries of a file,
+so several checks can be run over the same file reading it only once.
+"""
+
+import collections
+import contextlib
+import io
+import os
+import sys
+import time
+
+from pre_commit_po_hooks.instrumentation import active_timings, phase, timed_call
+from pre_commit_po_hooks.po import EntryParser, iter_chunks, iter_tokens
+
+
+PARALLEL_MIN_BYTES = 1024 * 1024
+
+_memory_cache = None
+
+Diagnostic = collections.namedtuple(
+    "Diagnostic",
+    ("filename", "lineno", "check", "message"),
+)
+Diagnostic.__doc__ = """Error found by a check.
+
+filename : str
+  File in which the error has been found.
+
+lineno : int
+  Line of the error, ``None`` for errors that affect the whole file.
+
+check : str
+  Name of the check that found the error.
+
+message : str
+  Description of the error, as written to stderr by the hooks.
+"""
+
+
+class Check:
+    """Base class for checks executed over a single PO file.
+
+    Subclasses override :py:meth:`feed_token` and/or :py:meth:`feed_entry`
+    to inspect the file and call :py:meth:`report` for each error found.
+
+    Parameters
+    ----------
+
+    filename : str
+      File being checked.
+
+    quiet : bool, optional
+      Enabled, errors are not collected as messages, only the exitcode is
+      updated.
+
+    fail_fast : bool, optional
+      Enabled, the check stops at the first error found.
+
+    max_reports : int, optional
+      Maximum number of errors collected as diagnostics. The rest of the
+      errors are only counted in the attribute ``omitted`` and summarized
+      at the end of the messages.
+
+    Checks set the attribute ``done`` to ``True`` when they don't need to
+    consume more tokens or entries. When all the checks executed over a file
+    are done, the rest of the file is not read.
+
+    Checks that only need to look for some line prefixes can also override
+    :py:meth:`feed_chunk`. When all the checks executed over a file override
+    it, the file is read in binary mode and neither decoded nor tokenized.
+
+    Checks that modify the file must set the attribute ``cacheable`` to
+    ``False`` when they do it, so their result is not stored in the cache.
+
+    Checks that are done after reading a small part of any file, like the
+    header, set the class attribute ``stops_early`` to ``True``. Computing
+    the key of a cached result requires reading the whole file, so the
+    results cache is not used when all the checks executed stop early.
+
+    Checks whose errors only depend on each entry set the attribute
+    ``diffable`` to ``True``, so they can be executed only over the entries
+    changed since a git revision. They must consume the entries with
+    :py:meth:`feed_entry`.
+
+    Checks that access the file on disk, like getting its size or rewriting
+    it, set the attribute ``needs_file`` to ``True``, so they are not
+    executed over sources other than files by :py:func:`check_source`.
+    """
+
+    name = None
+    stops_early = False
+    diffable = False
+    needs_file = False
+
+    def __init__(self, filename, quiet=False, fail_fast=False, max_reports=None):
+        self.filename = filename
+        self.quiet = quiet
+        self.fail_fast = fail_fast
+        self.max_reports = max_reports
+        self.exitcode = 0
+        self.diagnostics = []
+        self.omitted = 0
+        self.done = False
+        self.cacheable = True
+
+    @property
+    def messages(self):
+        """Messages of the errors found, as written to stderr."""
+        messages = [f"{diagnostic.message}\n" for diagnostic in self.diagnostics]
+        if self.omitted:
+            messages.append(
+                f"... and {self.omitted:,} more {self.name} errors"
+                f" at {self.filename}\n"
+            )
+        return messages
+
+    def report(self, message, lineno=None):
+        """Mark the check as failed and store a :py:class:`Diagnostic` for
+        the error.
+
+        Parameters
+        ----------
+
+        message : str
+          Description of the error.
+
+        lineno : int, optional
+          Line of the error, if it's not an error of the whole file.
+        """
+        if self.fail_fast and self.exitcode:
+            return
+        self.exitcode = 1
+        if not self.quiet:
+            if self.max_reports is None or len(self.diagnostics) < self.max_reports:
+                self.diagnostics.append(
+                    Diagnostic(self.filename, lineno, self.name, message)
+                )
+            else:
+                self.omitted += 1
+        if self.fail_fast:
+            self.done = True
+
+    def feed_token(self, token):
+        """Consume the next token of the file."""
+
+    def feed_entry(self, entry):
+        """Consume the next entry of the file."""
+
+    def feed_chunk(self, chunk, lineno):
+        """Consume the next chunk of complete lines of the file, as bytes.
+
+        Parameters
+        ----------
+
+        chunk : bytes
+          Content of the chunk, as yielded by :py:func:`iter_chunks`.
+
+        lineno : int
+          Line number of the first line of the chunk.
+        """
+
+    def finish(self):
+        """Called after all the file has been consumed."""
+
+
+def _overrides(check, method_name):
+    return getattr(type(check), method_name) is not getattr(Check, method_name)
+
+
+def _all_done(checks):
+    for check in checks:
+        if not check.done:
+            return False
+    return True
+
+
+def _check_chunks(chunks, instances):
+    for lineno, chunk in chunks:
+        for check in instances:
+            if not check.done:
+                check.feed_chunk(chunk, lineno)
+        if _all_done(instances):
+            break
+
+
+def _check_lines(lines, instances, entry_feeders):
+    # tokens are not built if no check consumes them
+    parser = EntryParser()
+    feed_line = parser.feed_line
+    for lineno, line in enumerate(lines, 1):
+        entry = feed_line(lineno, line)
+        if entry is not None:
+            for feed in entry_feeders:
+                feed(entry)
+            if _all_done(instances):
+                return
+    entry = parser.close()
+    if entry is not None:
+        for feed in entry_feeders:
+            feed(entry)
+
+
+def _check_tokens(lines, instances):
+    token_feeders = [c.feed_token for c in instances if _overrides(c, "feed_token")]
+    entry_feeders = [c.feed_entry for c in instances if _overrides(c, "feed_entry")]
+    if not token_feeders:
+        _check_lines(lines, instances, entry_feeders)
+        return
+    parser = EntryParser() if entry_feeders else None
+
+    for token in iter_tokens(lines):
+        for feed in token_feeders:
+            feed(token)
+        if parser is not None:
+            entry = parser.feed(token)
+            if entry is not None:
+                for feed in entry_feeders:
+                    feed(entry)
+        if _all_done(instances):
+            break
+    else:
+        if parser is not None:
+            entry = parser.close()
+            if entry is not None:
+                for feed in entry_feeders:
+                    feed(entry)
+
+
+def _chunks_supported(instances):
+    return instances and all(_overrides(c, "feed_chunk") for c in instances)
+
+
+def _check_entries(entries, instances):
+    for entry in entries:
+        for check in instances:
+            if not check.done:
+                check.feed_entry(entry)
+        if _all_done(instances):
+            break
+
+
+def check_file(filename, checks, diff_base=None):
+    """Run a set of checks over a file reading it once.
+
+    If all the checks support it, the file is scanned as bytes by
+    :py:meth:`Check.feed_chunk`, otherwise it is tokenized.
+
+    Parameters
+    ----------
+
+    filename : str
+      File to check.
+
+    checks : list
+      Pairs of check classes and keyword arguments to initialize them.
+
+    diff_base : str, optional
+      Git revision. If all the checks are ``diffable``, they are executed
+      only over the entries changed since it. The entire file is checked
+      if the changes can't be computed.
+
+    Returns
+    -------
+
+    list: Finished instances of the checks, in the same order.
+    """
+    instances = [check_class(filename, **kwargs) for check_class, kwargs in checks]
+    entries = None
+    if diff_base is not None and all(c.diffable for c in instances):
+        from pre_commit_po_hooks.diff import changed_entries
+
+        entries = changed_entries(filename, diff_base)
+
+    if entries is not None:
+        _check_entries(entries, instances)
+    elif _chunks_supported(instances):
+        with open(filename, "rb") as f:
+            _check_chunks(iter_chunks(f), instances)
+    else:
+        with open(filename) as f:
+            _check_tokens(f, instances)
+    for check in instances:
+        check.finish()
+    return instances
+
+
+def _decode_lines(lines, encoding):
+    for line in lines:
+        yield line.decode(encoding) if isinstance(line, bytes) else line
+
+
+def check_source(source, checks, filename="<source>", encoding="utf-8"):
+    """Run a set of checks over the content of a PO file without reading
+    it from disk, like a catalog uploaded to a service.
+
+    Checks that need a file on disk, like removing the metadata, can't be
+    executed over sources other than files, raising a ``ValueError``. Use
+    :py:func:`check_file` for them.
+
+    Parameters
+    ----------
+
+    source : bytes or str or file or iterable
+      Content of the PO file, as bytes or string, a file object opened in
+      binary or text mode, or an iterable of lines. Strings are always
+      handled as content, not as file names.
+
+    checks : list
+      Pairs of check classes and keyword arguments to initialize them.
+
+    filename : str, optional
+      Name of the file included in the diagnostics.
+
+    encoding : str, optional
+      Encoding used to decode the content, if it's passed as bytes.
+
+    Returns
+    -------
+
+    list: :py:class:`Diagnostic` for each error found by the checks, in the
+      same order of the checks.
+    """
+    instances = [check_class(filename, **kwargs) for check_class, kwargs in checks]
+    for check in instances:
+        if check.needs_file:
+            raise ValueError(
+                f"The check '{check.name}' needs a file, use 'check_file' instead"
+            )
+    if isinstance(source, str):
+        source = source.encode(encoding)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        if _chunks_supported(instances):
+            _check_chunks(((1, bytes(source)),), instances)
+        else:
+            _check_tokens(io.TextIOWrapper(io.BytesIO(source), encoding), instances)
+    elif isinstance(source, io.BufferedIOBase) and _chunks_supported(instances):
+        _check_chunks(iter_chunks(source), instances)
+    else:
+        _check_tokens(_decode_lines(source, encoding), instances)
+
+    diagnostics = []
+    for check in instances:
+        check.finish()
+        diagnostics.extend(check.diagnostics)
+    return diagnostics
+
+
+def _check_file_result(filename, checks, cache=None, diff_base=None):
+    if cache is not None:
+        with phase("cache"):
+            key = cache.key(filename, checks)
+            result = cache.get(key)
+        if result is not None:
+            return result
+
+    with phase("check"):
+        instances = check_file(filename, checks, diff_base=diff_base)
+    exitcode, messages, cacheable = 0, [], True
+    for check in instances:
+        if check.exitcode:
+            exitcode = 1
+        if not check.cacheable:
+            cacheable = False
+        messages.extend(check.messages)
+    result = (exitcode, "".join(messages))
+
+    if cache is not None and cacheable:
+        with phase("cache"):
+            cache.set(key, result)
+    return result
+
+
+def _file_size(filename):
+    try:
+        return os.path.getsize(filename)
+    except OSError:
+        return 0
+
+
+def map_files(func, filenames, *args, jobs=1, stop=None):
+    """Call ``func(filename, *args)`` for each file, optionally distributing
+    the files in a pool of processes.
+
+    Files are submitted to the pool from the largest to the smallest to
+    balance the work between processes, but results are returned in the
+    same order of ``filenames``, so the output is deterministic.
+
+    Parameters
+    ----------
+
+    func : function
+      Function to call for each file. If ``jobs`` is greater than 1, it
+      must be picklable, as well as ``args``, which are sent once to each
+      process of the pool.
+
+    filenames : list
+      Set of file names to process.
+
+    jobs : int, optional
+      Number of processes to use. If ``None``, the number of CPUs available,
+      but no more than one process for each ``PARALLEL_MIN_BYTES`` to
+      process, as starting processes takes longer than processing small
+      files.
+
+    stop : function, optional
+      Function called with each result. If returns ``True``, the files not
+      processed yet are skipped.
+
+    Returns
+    -------
+
+    list: Results of the calls, in the order of ``filenames``. Results of
+      skipped files are ``None``.
+    """
+    if jobs is None:
+        total_size = sum(_file_size(filename) for filename in filenames)
+        jobs = min(os.cpu_count() or 1, total_size // PARALLEL_MIN_BYTES + 1)
+    jobs = min(jobs, len(filenames))
+
+    timings = active_timings()
+    if timings is None:
+        return _map_files(func, filenames, args, jobs, stop)
+
+    timings.jobs = jobs
+    timed_results = _map_files(
+        timed_call,
+        filenames,
+        (func, *args),
+        jobs,
+        None if stop is None else lambda timed_result: stop(timed_result[0]),
+    )
+    results = []
+    for timed_result in timed_results:
+        if timed_result is None:
+            results.append(None)
+        else:
+            result, file_timings = timed_result
+            results.append(result)
+            timings.files.append(file_timings)
+    return results
+
+
+# function and arguments of the files processed by a worker of the pool,
+# defined when the worker starts so they are sent once to each process
+# instead of once for each file
+_worker_call = None
+
+
+def _init_worker(func, args):
+    global _worker_call
+    _worker_call = (func, args)
+
+
+def _call_worker(filename):
+    func, args = _worker_call
+    return func(filename, *args)
+
+
+def _map_files(func, filenames, args, jobs, stop):
+    results = [None] * len(filenames)
+    if jobs <= 1:
+        for i, filename in enumerate(filenames):
+            results[i] = func(filename, *args)
+            if stop is not None and stop(results[i]):
+                break
+        return results
+
+    indexes = sorted(
+        range(len(filenames)),
+        key=lambda i: _file_size(filenames[i]),
+        reverse=True,
+    )
+    # imported here, as it takes longer than the rest of the package and
+    # many executions process a few small files in a single process
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_worker, initargs=(func, args)
+    ) as executor:
+        futures = {executor.submit(_call_worker, filenames[i]): i for i in indexes}
+        for future in as_completed(futures):
+            result = results[futures[future]] = future.result()
+            if stop is not None and stop(result):
+                for pending_future in futures:
+                    pending_future.cancel()
+                break
+    return results
+
+
+def write_results(results):
+    """Write to stderr the output of the results returned by
+    :py:func:`map_files` for functions that return an exitcode and an
+    output string.
+
+    Returns
+    -------
+
+    int: 0 if all the exitcodes are 0, 1 otherwise.
+    """
+    start = time.perf_counter()
+    exitcode, outputs = 0, []
+    for result in results:
+        if result is None:
+            continue
+        file_exitcode, output = result
+        if file_exitcode:
+            exitcode = 1
+        if output:
+            outputs.append(output)
+    # written at once, as many small writes to a pipe are slow
+    if outputs:
+        sys.stderr.write("".join(outputs))
+        sys.stderr.flush()
+
+    timings = active_timings()
+    if timings is not None:
+        timings.write_seconds += time.perf_counter() - start
+    return exitcode
+
+
+def add_jobs_argument(parser):
+    """Add the ``-j/--jobs`` option to a command line parser."""
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        metavar="N",
+        default=None,
+        dest="jobs",
+        help=(
+            "Number of processes used to check files in parallel."
+            " By default, the number of CPUs available, using fewer processes"
+            " for small sets of files."
+        ),
+    )
+
+
+def add_cache_arguments(parser):
+    """Add the ``--cache-dir`` and ``--no-cache`` options to a command line
+    parser.
+    """
+    parser.add_argument(
+        "--cache-dir",
+        metavar="PATH",
+        default=None,
+        dest="cache_dir",
+        help=(
+            "Directory in which the results of the checks are cached."
+            " By default, 'pre-commit-po-hooks' inside the user cache directory."
+        ),
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        dest="no_cache",
+        help="Don't use the cache of results, checking all the files.",
+    )
+
+
+def cache_dir_from_args(args):
+    """Get the cache directory defined by the options added by
+    :py:func:`add_cache_arguments`, ``None`` if the cache is disabled.
+    """
+    if args.no_cache:
+        return None
+    from pre_commit_po_hooks.cache import default_cache_dir
+
+    return args.cache_dir or default_cache_dir()
+
+
+def add_max_reports_argument(parser):
+    """Add the ``--max-reports`` option to a command line parser."""
+    parser.add_argument(
+        "--max-reports",
+        type=int,
+        metavar="N",
+        default=None,
+        dest="max_reports",
+        help=(
+            "Maximum number of errors reported by each check for each file."
+            " The rest are summarized in a single line."
+        ),
+    )
+
+
+def add_diff_base_argument(parser):
+    """Add the ``--diff-base`` option to a command line parser."""
+    parser.add_argument(
+        "--diff-base",
+        metavar="REF",
+        default=None,
+        dest="diff_base",
+        help=(
+            "Only check the messages changed since a git revision, like 'HEAD'."
+            " Files not tracked in the revision are checked entirely."
+        ),
+    )
+
+
+def diff_base_from_args(args):
+    """Get the git revision defined by the option added by
+    :py:func:`add_diff_base_argument`, ``None`` if not defined or if the
+    environment variable ``PRE_COMMIT_PO_HOOKS_NO_DIFF_BASE`` is set, so
+    all the messages can be checked in CI using the same configuration.
+    """
+    if os.environ.get("PRE_COMMIT_PO_HOOKS_NO_DIFF_BASE"):
+        return None
+    return args.diff_base
+
+
+def add_fail_fast_argument(parser):
+    """Add the ``--fail-fast`` option to a command line parser."""
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        dest="fail_fast",
+        help=(
+            "Stop at the first error found, without checking the rest of the"
+            " file nor the next files. Implied by '--quiet'."
+        ),
+    )
+
+
+def _failed(result):
+    return result[0] != 0
+
+
+@contextlib.contextmanager
+def use_memory_cache(cache):
+    """Use an in-memory results cache, like
+    :py:class:`pre_commit_po_hooks.cache.MemoryResultsCache`, in front of the
+    results cache in the executions of :py:func:`run_checks` inside the
+    block.
+    """
+    global _memory_cache
+
+    prev_memory_cache, _memory_cache = _memory_cache, cache
+    try:
+        yield
+    finally:
+        _memory_cache = prev_memory_cache
+
+
+def _map_files_memory_cache(memory_cache, filenames, checks, cache, jobs, stop):
+    keys = [memory_cache.key(filename, checks) for filename in filenames]
+    results = [None if key is None else memory_cache.get(key) for key in keys]
+    if stop is not None and any(
+        result is not None and stop(result) for result in results
+    ):
+        return results
+
+    pending = [i for i, result in enumerate(results) if result is None]
+    if not pending:
+        return results
+    pending_results = map_files(
+        _check_file_result,
+        [filenames[i] for i in pending],
+        checks,
+        cache,
+        jobs=jobs,
+        stop=stop,
+    )
+    for i, result in zip(pending, pending_results):
+        results[i] = result
+        # files rewritten by the checks have changed their keys
+        if (
+            result is not None
+            and keys[i] is not None
+            and memory_cache.key(filenames[i], checks) == keys[i]
+        ):
+            memory_cache.set(keys[i], result)
+    return results
+
+
+def run_checks(
+    filenames, checks, jobs=1, cache_dir=None, fail_fast=False, diff_base=None
+):
+    """Run a set of checks over multiple files, writing errors to stderr.
+
+    Parameters
+    ----------
+
+    filenames : list
+      Set of file names to check.
+
+    checks : list
+      Pairs of check classes and keyword arguments to initialize them.
+
+    jobs : int, optional
+      Number of processes to use. If ``None``, the number of CPUs available.
+
+    cache_dir : str, optional
+      Directory of the results cache. If ``None``, the cache is not used,
+      neither the in-memory cache defined by :py:func:`use_memory_cache`.
+      It's not used either if all the checks stop early, as reading
+      each file to compute the key would take longer than checking it.
+
+    fail_fast : bool, optional
+      Enabled, the files are not checked after the first one that fails.
+
+    diff_base : str, optional
+      Git revision. If defined, only the entries changed since it are
+      checked by ``diffable`` checks, see :py:func:`check_file`. As the
+      results depend on the revision, they are not cached.
+
+    Returns
+    -------
+
+    int: 0 if all checks passed for all files, 1 otherwise.
+    """
+    cache = None
+    if (
+        cache_dir
+        and diff_base is None
+        and not all(check_class.stops_early for check_class, _ in checks)
+    ):
+        from pre_commit_po_hooks.cache import ResultsCache
+
+        cache = ResultsCache(cache_dir)
+    stop = _failed if fail_fast else None
+    if cache is not None and _memory_cache is not None:
+        results = _map_files_memory_cache(
+            _memory_cache, filenames, checks, cache, jobs, stop
+        )
+    else:
+        results = map_files(
+            _check_file_result,
+            filenames,
+            checks,
+            cache,
+            diff_base,
+            jobs=jobs,
+            stop=stop,
+        )
+    exitcode = write_results(results)
+    if cache is not None:
+        cache.evict()
+    return exitcode
@@ -0,0 +1,325 @@
+"""Local server that keeps the package loaded between executions of hooks.
+
+Starting the interpreter and importing the package takes longer than
+checking the files of most commits. While ``po-hooks-daemon`` is running,
+the console scripts forward their arguments through a unix socket to it,
+which executes them in its warm process and sends back the exit code and
+the output. Commands are executed in the working directory of the client
+and with its ``PRE_COMMIT_PO_HOOKS_*`` and ``XDG_CACHE_HOME`` environment
+variables. If no daemon is listening, the console scripts are executed in
+their own process as usual.
+
+The daemon also keeps in memory the results of the checks by path,
+modification time and size of the files, so unchanged files are not even
+read to compute their key in the results cache.
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+
+from pre_commit_po_hooks import __version__
+
+
+SOCKET_ENV = "PRE_COMMIT_PO_HOOKS_SOCKET"
+NO_DAEMON_ENV = "PRE_COMMIT_PO_HOOKS_NO_DAEMON"
+
+# environment variables of the client applied to the commands executed
+FORWARDED_ENV_PREFIX = "PRE_COMMIT_PO_HOOKS_"
+FORWARDED_ENV = ("XDG_CACHE_HOME",)
+
+COMMANDS = (
+    "obsolete_messages",
+    "untranslated_messages",
+    "fuzzy_messages",
+    "lreplace_extracted_comments",
+    "check_metadata",
+    "check_entries",
+    "check_template",
+    "po_hooks",
+    "po_stats",
+)
+
+
+def default_socket_path():
+    """Return the path of the socket in which the daemon listens.
+
+    Defined by the environment variable ``PRE_COMMIT_PO_HOOKS_SOCKET`` or,
+    by default, ``pre-commit-po-hooks.sock`` inside the user runtime
+    directory (``$XDG_RUNTIME_DIR``) or the user cache directory.
+    """
+    path = os.environ.get(SOCKET_ENV)
+    if path:
+        return path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "pre-commit-po-hooks.sock")
+
+    from pre_commit_po_hooks.cache import default_cache_dir
+
+    return os.path.join(default_cache_dir(), "daemon.sock")
+
+
+def _forwarded_env(environ):
+    # the daemon must not forward commands to itself
+    return {
+        name: value
+        for name, value in environ.items()
+        if (name.startswith(FORWARDED_ENV_PREFIX) or name in FORWARDED_ENV)
+        and name != NO_DAEMON_ENV
+    }
+
+
+def _set_forwarded_env(env):
+    for name in _forwarded_env(os.environ):
+        if name not in env:
+            del os.environ[name]
+    os.environ.update(env)
+
+
+def _send(f, message):
+    import json
+
+    f.write(json.dumps(message).encode())
+    f.write(b"\n")
+    f.flush()
+
+
+def _receive(f):
+    import json
+
+    line = f.readline()
+    if not line:
+        raise ValueError("Connection closed")
+    return json.loads(line)
+
+
+def _connect(path):
+    import socket
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def forward_to_daemon(command, argv=None):
+    """Execute a command in the daemon, writing its output to stdout and
+    stderr.
+
+    Parameters
+    ----------
+
+    command : str
+      Name of the module of the package whose ``main`` function implements
+      the command, one of ``COMMANDS``.
+
+    argv : list, optional
+      Command line arguments, including the program name. By default,
+      ``sys.argv``.
+
+    Returns
+    -------
+
+    int: Exit code of the command or ``None`` if it has not been executed
+      because no daemon is listening, in which case the caller must execute
+      the command in the current process.
+    """
+    if os.environ.get(NO_DAEMON_ENV) or os.name != "posix":
+        return None
+    path = default_socket_path()
+    if not os.path.exists(path):
+        return None
+    try:
+        sock = _connect(path)
+    except OSError:
+        return None
+
+    request = {
+        "command": command,
+        "argv": sys.argv if argv is None else argv,
+        "cwd": os.getcwd(),
+        "env": _forwarded_env(os.environ),
+        "version": __version__,
+    }
+    try:
+        with sock, sock.makefile("rwb") as f:
+            _send(f, request)
+            response = _receive(f)
+    except (OSError, ValueError) as exc:
+        sys.stderr.write(f"Lost connection with po-hooks-daemon at {path}: {exc}\n")
+        return 1
+
+    # a daemon of another version doesn't execute the command
+    if response["exitcode"] is None:
+        return None
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    return response["exitcode"]
+
+
+def _execute(request):
+    import importlib
+    import io
+    import traceback
+
+    if request.get("version") != __version__ or request["command"] not in COMMANDS:
+        return {"exitcode": None}
+    main = importlib.import_module(f"pre_commit_po_hooks.{request['command']}").main
+
+    stdout, stderr = io.StringIO(), io.StringIO()
+    prev_argv, prev_cwd = sys.argv, os.getcwd()
+    prev_env = _forwarded_env(os.environ)
+    try:
+        sys.argv = request["argv"]
+        os.chdir(request["cwd"])
+        _set_forwarded_env(request["env"])
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                exitcode = main()
+            except SystemExit as exc:
+                if exc.code is None or isinstance(exc.code, int):
+                    exitcode = exc.code or 0
+                else:
+                    stderr.write(f"{exc.code}\n")
+                    exitcode = 1
+            except Exception:
+                traceback.print_exc(file=stderr)
+                exitcode = 1
+    finally:
+        sys.argv = prev_argv
+        os.chdir(prev_cwd)
+        _set_forwarded_env(prev_env)
+    return {
+        "exitcode": exitcode,
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue(),
+    }
+
+
+def serve(path=None):
+    """Listen for commands until a stop request is received.
+
+    Parameters
+    ----------
+
+    path : str, optional
+      Path of the unix socket. By default, the one returned by
+      :py:func:`default_socket_path`.
+
+    Returns
+    -------
+
+    int: 0 if the daemon has been stopped, 1 if another daemon is already
+      listening in the socket.
+    """
+    import importlib
+    import socket
+
+    from pre_commit_po_hooks.cache import MemoryResultsCache
+    from pre_commit_po_hooks.checks import use_memory_cache
+
+    path = path or default_socket_path()
+    try:
+        _connect(path).close()
+    except OSError:
+        pass
+    else:
+        sys.stderr.write(f"po-hooks-daemon is already listening at {path}\n")
+        return 1
+
+    # load everything that the commands could need
+    for command in COMMANDS:
+        importlib.import_module(f"pre_commit_po_hooks.{command}")
+    importlib.import_module("concurrent.futures")
+
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(path)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    umask = os.umask(0o177)
+    try:
+        server.bind(path)
+    finally:
+        os.umask(umask)
+    server.listen()
+
+    # commands executed by the daemon must not forward to it
+    prev_no_daemon = os.environ.get(NO_DAEMON_ENV)
+    os.environ[NO_DAEMON_ENV] = "1"
+    try:
+        with server, use_memory_cache(MemoryResultsCache()):
+            while True:
+                conn, _ = server.accept()
+                try:
+                    with conn, conn.makefile("rwb") as f:
+                        request = _receive(f)
+                        if request.get("command") == "stop":
+                            _send(f, {"exitcode": 0})
+                            break
+                        _send(f, _execute(request))
+                except (OSError, ValueError, KeyError):
+                    continue
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if prev_no_daemon is None:
+            del os.environ[NO_DAEMON_ENV]
+        else:
+            os.environ[NO_DAEMON_ENV] = prev_no_daemon
+        with contextlib.suppress(OSError):
+            os.remove(path)
+    return 0
+
+
+def stop(path=None):
+    """Stop the daemon listening in a socket.
+
+    Returns
+    -------
+
+    int: 0 if the daemon has been stopped, 1 if no daemon was listening.
+    """
+    path = path or default_socket_path()
+    try:
+        with _connect(path) as sock, sock.makefile("rwb") as f:
+            _send(f, {"command": "stop"})
+            _receive(f)
+    except (OSError, ValueError):
+        sys.stderr.write(f"po-hooks-daemon is not listening at {path}\n")
+        return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--socket",
+        metavar="PATH",
+        default=None,
+        dest="socket",
+        help=(
+            "Path of the unix socket in which the daemon listens. By default,"
+            " 'pre-commit-po-hooks.sock' inside $XDG_RUNTIME_DIR or the user"
+            " cache directory."
+        ),
+    )
+    parser.add_argument(
+        "--stop",
+        action="store_true",
+        dest="stop",
+        help="Stop the running daemon.",
+    )
+    args = parser.parse_args()
+
+    if args.stop:
+        return stop(args.socket)
+    return serve(args.socket)
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,173 @@
+"""Detection of the entries of PO files changed since a git revision.
+
+The line ranges changed are obtained from ``git diff`` and expanded to the
+entries that contain them, so only those regions of the file and of its
+content in the revision are parsed and kept in memory while both are read
+once. An entry is changed if no entry with
+the same context and message in the regions of the revision has the same
+translation, flags and obsolete state, so entries only moved or with
+updated references are not considered changed.
+"""
+
+import contextlib
+import os
+import re
+import subprocess
+
+from pre_commit_po_hooks.po import EntryParser, tokenize_line
+
+
+_HUNK_RE = re.compile(rb"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@", re.MULTILINE)
+
+
+def _git(*args):
+    return subprocess.run(
+        ["git", *args],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        check=True,
+    ).stdout
+
+
+def _iter_hunks(diff):
+    for match in _HUNK_RE.finditer(diff):
+        old_start, old_count, new_start, new_count = match.groups()
+        yield (
+            (int(old_start), 1 if old_count is None else int(old_count)),
+            (int(new_start), 1 if new_count is None else int(new_count)),
+        )
+
+
+def _iter_blob_lines(spec):
+    with subprocess.Popen(
+        ["git", "cat-file", "blob", spec],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    ) as process:
+        yield from process.stdout
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, process.args)
+
+
+def _iter_regions(lines, ranges):
+    """Expand ranges of line numbers, as sorted pairs of first line and
+    number of lines, to the complete entries that contain them.
+
+    The lines are read once, keeping only those after the last blank line
+    while no range is found, so ``lines`` can be a file or any iterator.
+
+    Yields
+    ------
+
+    list: Pairs of line number and content of the lines of each region,
+      not overlapping.
+    """
+    ranges = iter(ranges)
+    next_range = next(ranges, None)
+    block, region, region_last = [], None, None
+    for index, line in enumerate(lines):
+        while next_range is not None:
+            start, count = next_range
+            # lines removed are between ``start`` and the next one
+            first, last = start - 1, start + count - 2 if count else start
+            if max(first, 0) > index:
+                break
+            if region is None:
+                region, block, region_last = block, [], last
+            else:
+                region_last = max(region_last, last)
+            next_range = next(ranges, None)
+        if region is None and next_range is None:
+            return
+
+        blank = not line.strip()
+        if region is not None:
+            if not blank or index <= region_last:
+                region.append((index + 1, line))
+                continue
+            yield region
+            region = None
+        if blank:
+            block = []
+        else:
+            block.append((index + 1, line))
+    if region is not None:
+        yield region
+
+
+def _iter_regions_entries(regions):
+    for region in regions:
+        parser = EntryParser()
+        for lineno, line in region:
+            entry = parser.feed(tokenize_line(lineno, line.decode("utf-8", "replace")))
+            if entry is not None:
+                yield entry
+        entry = parser.close()
+        if entry is not None:
+            yield entry
+
+
+def _entry_state(entry):
+    return (entry.obsolete, entry.flags, entry.msgid_plural, tuple(entry.msgstr))
+
+
+def changed_entries(filename, base):
+    """Get the entries of a PO file changed since a git revision.
+
+    The file is compared as it is in the working tree, which matches the
+    staged content when executed by pre-commit.
+
+    Parameters
+    ----------
+
+    filename : str
+      File inside a git repository.
+
+    base : str
+      Git revision against which the file is compared, like ``"HEAD"``.
+
+    Returns
+    -------
+
+    list: Entries of the file changed, ``None`` if the changes can't be
+      computed because git is not available, the revision doesn't exist or
+      the file is not tracked in it, so the entire file must be checked.
+    """
+    try:
+        path = os.path.relpath(filename).replace(os.sep, "/")
+        spec = f"{base}:./{path}"
+        # fails if the file is not tracked in the revision
+        _git("cat-file", "-e", spec)
+        diff = _git(
+            "diff",
+            "--no-color",
+            "--no-ext-diff",
+            "--no-textconv",
+            "--unified=0",
+            base,
+            "--",
+            filename,
+        )
+        hunks = list(_iter_hunks(diff))
+        if not hunks:
+            return []
+
+        # both contents are streamed, keeping only the lines of the regions
+        with contextlib.closing(_iter_blob_lines(spec)) as base_lines:
+            base_states = {
+                (entry.msgctxt, entry.msgid): _entry_state(entry)
+                for entry in _iter_regions_entries(
+                    _iter_regions(base_lines, (old for old, _ in hunks))
+                )
+            }
+    except (OSError, ValueError, subprocess.CalledProcessError):
+        return None
+
+    with open(filename, "rb") as f:
+        return [
+            entry
+            for entry in _iter_regions_entries(
+                _iter_regions(f, (new for _, new in hunks))
+            )
+            if base_states.get((entry.msgctxt, entry.msgid)) != _entry_state(entry)
+        ]
@@ -0,0 +1,111 @@
+"""Utilities to rewrite files safely."""
+
+import contextlib
+import itertools
+import os
+
+from pre_commit_po_hooks.po import TOKEN_BLANK, iter_entries_tokens
+
+
+@contextlib.contextmanager
+def atomic_write(filename, mode="w"):
+    """Rewrite a file atomically.
+
+    The content is written to a temporary file created in the same
+    directory, which replaces the file when the block exits without errors,
+    so the file is never left half written and multiple processes can
+    rewrite files with the same name in different directories at the same
+    time.
+
+    Parameters
+    ----------
+
+    filename : str
+      File to rewrite.
+
+    mode : str, optional
+      Mode in which the temporary file is opened, ``"w"`` or ``"wb"``. In
+      text mode newlines are not translated, so the lines read from a file
+      opened with ``newline=""`` are written keeping their endings.
+
+    Yields
+    ------
+
+    file: Temporary file opened for writing.
+    """
+    import shutil
+    import tempfile
+
+    fd, tmp_filename = tempfile.mkstemp(
+        prefix=f".{os.path.basename(filename)}.",
+        suffix=".tmp",
+        dir=os.path.dirname(os.path.abspath(filename)),
+    )
+    try:
+        with os.fdopen(fd, mode, newline=None if "b" in mode else "") as f:
+            yield f
+        shutil.copymode(filename, tmp_filename)
+        os.replace(tmp_filename, filename)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_filename)
+        raise
+
+
+def rewrite_entries(filename, fix_entry):
+    """Rewrite the entries of a PO file reading it once.
+
+    The file is only rewritten if some entry changes, copying the lines
+    before the first change when it is found. The blank line that precedes
+    each removed entry is removed too. Line endings are preserved.
+
+    Parameters
+    ----------
+
+    filename : str
+      PO file to rewrite.
+
+    fix_entry : function
+      Called with each :py:class:`pre_commit_po_hooks.po.POEntry` and the
+      list of its tokens. Returns the new lines of the entry, an empty list
+      to remove it or ``None`` to keep it unchanged.
+
+    Returns
+    -------
+
+    bool: If the file has been rewritten.
+    """
+    with contextlib.ExitStack() as stack:
+        tmp_f, blank_tokens = None, []
+        # blank lines at the beginning of the file are removed along with
+        # the entries removed before the first kept one
+        kept, removed = False, False
+        with open(filename, newline="") as f:
+            for entry, tokens in iter_entries_tokens(f):
+                if entry is None and tokens[0].kind == TOKEN_BLANK:
+                    blank_tokens.extend(tokens)
+                    continue
+
+                new_lines = None if entry is None else fix_entry(entry, tokens)
+                if new_lines is not None and tmp_f is None:
+                    tmp_f = stack.enter_context(atomic_write(filename))
+                    first_lineno = (blank_tokens or tokens)[0].lineno
+                    with open(filename, newline="") as prefix_f:
+                        tmp_f.writelines(itertools.islice(prefix_f, first_lineno - 1))
+
+                if new_lines == []:
+                    removed = True
+                elif tmp_f is not None:
+                    if kept or not removed:
+                        tmp_f.writelines(token.line for token in blank_tokens)
+                    if new_lines is None:
+                        new_lines = [token.line for token in tokens]
+                    tmp_f.writelines(new_lines)
+                    kept = True
+                else:
+                    kept = True
+                blank_tokens = []
+
+            if tmp_f is not None:
+                tmp_f.writelines(token.line for token in blank_tokens)
+    return tmp_f is not None
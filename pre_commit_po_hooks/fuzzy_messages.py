@@ -1,13 +1,93 @@
 """Checks for fuzzy messages in PO files.
 
-Returns an error code if a PO file has a fuzzy message.
+Returns an error code if a PO file has a fuzzy message. With ``--fix``,
+clears the fuzzy flag of the messages instead, returning an error code if
+some file has been modified.
 """
 
 import argparse
-import sys
 
+from pre_commit_po_hooks.checks import (
+    Check,
+    add_cache_arguments,
+    add_diff_base_argument,
+    add_fail_fast_argument,
+    add_jobs_argument,
+    add_max_reports_argument,
+    cache_dir_from_args,
+    diff_base_from_args,
+    map_files,
+    run_checks,
+    write_results,
+)
+from pre_commit_po_hooks.daemon import forward_to_daemon
+from pre_commit_po_hooks.files import rewrite_entries
+from pre_commit_po_hooks.instrumentation import (
+    add_instrumentation_arguments,
+    instrument,
+)
+from pre_commit_po_hooks.po import (
+    TOKEN_COMMENT,
+    LineCounter,
+    iter_lines_containing,
+    iter_previous_lines,
+    line_at,
+    parse_flags,
+    tokenize_line,
+)
 
-def check_fuzzy_messages(filenames, quiet=False):
+
+class FuzzyMessagesCheck(Check):
+    """Reports each fuzzy entry of a PO file."""
+
+    name = "fuzzy-messages"
+    diffable = True
+
+    def feed_entry(self, entry):
+        if entry.fuzzy:
+            self.report(
+                f"Found fuzzy message at {self.filename}:{entry.flags_lineno}",
+                lineno=entry.flags_lineno,
+            )
+
+    def feed_chunk(self, chunk, lineno):
+        linenos = LineCounter(chunk, lineno)
+        previous_flags_offset = None
+        for offset in iter_lines_containing(chunk, b"fuzzy"):
+            token = tokenize_line(0, line_at(chunk, offset).decode("latin-1"))
+            if token.keyword != "#," or "fuzzy" not in parse_flags(token.value):
+                continue
+
+            # the message is reported at the first flags line of the entry
+            flags_offset = offset
+            for previous_offset, line in iter_previous_lines(chunk, offset):
+                token = tokenize_line(0, line.decode("latin-1"))
+                if token.kind != TOKEN_COMMENT:
+                    break
+                if token.keyword == "#,":
+                    flags_offset = previous_offset
+            if flags_offset == previous_flags_offset:
+                continue
+            previous_flags_offset = flags_offset
+
+            flags_lineno = linenos(flags_offset)
+            self.report(
+                f"Found fuzzy message at {self.filename}:{flags_lineno}",
+                lineno=flags_lineno,
+            )
+            if self.done:
+                break
+
+
+def check_fuzzy_messages(
+    filenames,
+    quiet=False,
+    jobs=1,
+    cache_dir=None,
+    fail_fast=False,
+    diff_base=None,
+    max_reports=None,
+):
     """Warns about all fuzzy messages found in a set of PO files.
 
     Parameters
@@ -19,33 +99,148 @@ def check_fuzzy_messages(filenames, quiet=False):
     quiet : bool, optional
       Enabled, don't print output to stderr when an fuzzy message is found.
 
+    jobs : int, optional
+      Number of processes used to check the files in parallel. If ``None``,
+      the number of CPUs available.
+
+    cache_dir : str, optional
+      Directory in which the results are cached, so unchanged files are not
+      checked again. If ``None``, the cache is not used.
+
+    fail_fast : bool, optional
+      Enabled, stop at the first fuzzy message found, without checking the rest
+      of the files. Implied by ``quiet``.
+
+    diff_base : str, optional
+      Git revision. If defined, only the messages changed since it are
+      checked. Files not tracked in the revision are checked entirely.
+
+    max_reports : int, optional
+      Maximum number of fuzzy messages reported for each file. The rest
+      are summarized in a single line.
+
     Returns
     -------
 
     int: 0 if no fuzzy messages found, 1 otherwise.
     """
-    exitcode = 0
-    for filename in filenames:
-        with open(filename) as f:
-            content_lines = f.readlines()
+    fail_fast = fail_fast or quiet
+    return run_checks(
+        filenames,
+        [
+            (
+                FuzzyMessagesCheck,
+                {"quiet": quiet, "fail_fast": fail_fast, "max_reports": max_reports},
+            )
+        ],
+        jobs=jobs,
+        cache_dir=cache_dir,
+        fail_fast=fail_fast,
+        diff_base=diff_base,
+    )
+
 
-        for i, line in enumerate(content_lines):
-            if line.startswith("#,") and "fuzzy" in line:
-                exitcode = 1
-                if not quiet:
-                    sys.stderr.write(f"Found fuzzy message at {filename}:{i + 1}\n")
+def _clear_fuzzy_flag(entry, tokens, clear_previous):
+    if not entry.fuzzy:
+        return None
 
-    return exitcode
+    lines = []
+    for token in tokens:
+        if token.keyword == "#,":
+            flags = [flag for flag in parse_flags(token.value) if flag != "fuzzy"]
+            if flags:
+                # keeps the '#~' prefix of obsolete messages
+                prefix = token.line[: token.line.index("#,")]
+                newline = token.line[len(token.line.rstrip("\r\n")) :]
+                lines.append(f"{prefix}#, {', '.join(flags)}{newline}")
+        elif not (clear_previous and token.keyword == "#|"):
+            lines.append(token.line)
+    return lines
+
+
+def _fix_fuzzy_messages_file(filename, clear_previous):
+    if rewrite_entries(
+        filename,
+        lambda entry, tokens: _clear_fuzzy_flag(entry, tokens, clear_previous),
+    ):
+        return 1, ""
+    return 0, ""
+
+
+def fix_fuzzy_messages(filenames, clear_previous=False, jobs=1):
+    """Clear the fuzzy flag of the messages of a set of PO files, like
+    ``msgattrib --clear-fuzzy``, reading each file once.
+
+    Parameters
+    ----------
+
+    filenames : list
+      Set of file names to fix.
+
+    clear_previous : bool, optional
+      Enabled, the previous messages (``#|`` comments) of the fuzzy
+      messages are removed too, like ``msgattrib --clear-previous``.
+
+    jobs : int, optional
+      Number of processes used to fix the files in parallel. If ``None``,
+      the number of CPUs available.
+
+    Returns
+    -------
+
+    int: 0 if no files have been modified, 1 otherwise.
+    """
+    return write_results(
+        map_files(_fix_fuzzy_messages_file, filenames, clear_previous, jobs=jobs)
+    )
 
 
 def main():
+    exitcode = forward_to_daemon("fuzzy_messages")
+    if exitcode is not None:
+        return exitcode
+
     parser = argparse.ArgumentParser()
     parser.add_argument(
         "filenames", nargs="*", help="Filenames to check for fuzzy messages"
     )
     parser.add_argument("-q", "--quiet", action="store_true", help="Supress output")
+    add_jobs_argument(parser)
+    add_cache_arguments(parser)
+    add_fail_fast_argument(parser)
+    add_diff_base_argument(parser)
+    add_max_reports_argument(parser)
+    parser.add_argument(
+        "--fix",
+        action="store_true",
+        dest="fix",
+        help="Clear the fuzzy flag of the messages instead of reporting them.",
+    )
+    parser.add_argument(
+        "--clear-previous",
+        action="store_true",
+        dest="clear_previous",
+        help=(
+            "Along with '--fix', remove the previous messages ('#|' comments)"
+            " of the fuzzy messages too."
+        ),
+    )
+    add_instrumentation_arguments(parser)
     args = parser.parse_args()
-    return check_fuzzy_messages(args.filenames, quiet=args.quiet)
+    with instrument(args, parser.prog):
+        if args.fix:
+            return fix_fuzzy_messages(
+                args.filenames, clear_previous=args.clear_previous, jobs=args.jobs
+            )
+        return check_fuzzy_messages(
+            args.filenames,
+            quiet=args.quiet,
+            jobs=args.jobs,
+            cache_dir=cache_dir_from_args(args),
+            fail_fast=args.fail_fast,
+            diff_base=diff_base_from_args(args),
+            max_reports=args.max_reports,
+        )
 
 
 if __name__ == "__main__":
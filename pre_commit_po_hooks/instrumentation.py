@@ -0,0 +1,206 @@
+"""Timing and profiling instrumentation for the console scripts.
+
+The options added by :py:func:`add_instrumentation_arguments` are handled
+by :py:func:`instrument`, which collects the time spent processing each file
+by :py:func:`pre_commit_po_hooks.checks.map_files`, so the public functions
+of the hooks don't need to know about them.
+"""
+
+import contextlib
+import os
+import sys
+import time
+
+
+_timings = None
+_file_phases = None
+
+
+class Timings:
+    """Collector of the time spent processing each file in a run.
+
+    Parameters
+    ----------
+
+    command : str
+      Name of the command executed.
+    """
+
+    def __init__(self, command):
+        self.command = command
+        self.files = []
+        self.jobs = None
+        self.write_seconds = 0.0
+        self._start = time.perf_counter()
+        self.wall_seconds = None
+
+    def stop(self):
+        self.wall_seconds = time.perf_counter() - self._start
+
+    def summary(self):
+        """Machine readable summary of the run.
+
+        Returns
+        -------
+
+        dict: Summary with the total and per file times in seconds, and the
+          number of bytes processed.
+        """
+        return {
+            "command": self.command,
+            "jobs": self.jobs,
+            "wall_seconds": self.wall_seconds,
+            "write_seconds": self.write_seconds,
+            "total_bytes": sum(file_timings["bytes"] for file_timings in self.files),
+            "files": self.files,
+        }
+
+    def write_report(self, f):
+        """Write a human readable report of the run."""
+        f.write("Timings:\n")
+        for file_timings in sorted(self.files, key=lambda t: -t["seconds"]):
+            phases = "".join(
+                f"  {phase} {seconds * 1000:.1f} ms"
+                for phase, seconds in file_timings["phases"].items()
+            )
+            f.write(
+                f"  {file_timings['seconds'] * 1000:9.1f} ms"
+                f" {file_timings['bytes'] / 1024:10.1f} KiB"
+                f"  {file_timings['filename']}{phases}\n"
+            )
+        summary = self.summary()
+        f.write(
+            f"{len(self.files)} files, {summary['total_bytes'] / 1024:.1f} KiB"
+            f" in {self.wall_seconds * 1000:.1f} ms"
+            f" (writing output {self.write_seconds * 1000:.1f} ms)\n"
+        )
+
+
+def active_timings():
+    """Get the timings collector of the current run, ``None`` if timings are
+    not being collected.
+    """
+    return _timings
+
+
+@contextlib.contextmanager
+def phase(name):
+    """Measure a phase of the processing of the current file, like reading
+    the cache. Does nothing if timings are not being collected.
+    """
+    if _file_phases is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _file_phases[name] = _file_phases.get(name, 0.0) + time.perf_counter() - start
+
+
+def timed_call(filename, func, *args):
+    """Call ``func(filename, *args)`` measuring it. The file name comes first
+    so it can be mapped by :py:func:`pre_commit_po_hooks.checks.map_files`.
+
+    Returns
+    -------
+
+    tuple: Result of the call and a dictionary with its timings.
+    """
+    global _file_phases
+
+    try:
+        size = os.path.getsize(filename)
+    except OSError:
+        size = 0
+    _file_phases = {}
+    start = time.perf_counter()
+    try:
+        result = func(filename, *args)
+        seconds = time.perf_counter() - start
+        phases = _file_phases
+    finally:
+        _file_phases = None
+    return result, {
+        "filename": str(filename),
+        "bytes": size,
+        "seconds": seconds,
+        "phases": phases,
+    }
+
+
+def add_instrumentation_arguments(parser):
+    """Add the ``--timings``, ``--timings-json`` and ``--profile`` options to
+    a command line parser.
+    """
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        dest="timings",
+        help="Write to stderr the time spent processing each file.",
+    )
+    parser.add_argument(
+        "--timings-json",
+        metavar="PATH",
+        default=None,
+        dest="timings_json",
+        help="Write a JSON summary with the time spent processing each file.",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        default=None,
+        dest="profile",
+        help=(
+            "Dump the statistics of cProfile for the run to a file, readable by"
+            " 'pstats'. Files are processed in a single process."
+        ),
+    )
+
+
+@contextlib.contextmanager
+def instrument(args, command):
+    """Run a block with the instrumentation requested by the options added by
+    :py:func:`add_instrumentation_arguments`.
+
+    Parameters
+    ----------
+
+    args : argparse.Namespace
+      Parsed command line arguments. If profiling, ``args.jobs`` is set to 1
+      so the checks are executed in the profiled process.
+
+    command : str
+      Name of the command, included in the summary.
+    """
+    global _timings
+
+    profiler = None
+    if args.profile:
+        import cProfile
+
+        if hasattr(args, "jobs"):
+            args.jobs = 1
+        profiler = cProfile.Profile()
+    if args.timings or args.timings_json:
+        _timings = Timings(command)
+
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+
+        timings, _timings = _timings, None
+        if timings is not None:
+            timings.stop()
+            if args.timings:
+                timings.write_report(sys.stderr)
+            if args.timings_json:
+                import json
+
+                with open(args.timings_json, "w") as f:
+                    json.dump(timings.summary(), f, indent=2)
@@ -5,14 +5,82 @@ Returns an error code if the extracted comments were replaced.
 """
 
 import argparse
-import os
+import contextlib
+import itertools
 import re
-import shutil
-import sys
-import tempfile
 
+from pre_commit_po_hooks.checks import add_jobs_argument, map_files, write_results
+from pre_commit_po_hooks.daemon import forward_to_daemon
+from pre_commit_po_hooks.files import atomic_write
+from pre_commit_po_hooks.instrumentation import (
+    add_instrumentation_arguments,
+    instrument,
+)
 
-TMP_DIR = tempfile.gettempdir()
+
+DJANGO_TRANSLATORS_REPLACEMENT = ("Translators: ", "")
+
+
+def _compile_replacements(replacements):
+    # the literal prefix is checked first, only falling back to the regex
+    # for other whitespace characters after the '#.' marker
+    return [
+        (f"#. {match}", re.compile(rf"#\.\s{re.escape(match)}"), replacement)
+        for match, replacement in replacements
+    ]
+
+
+def _lreplace_line(line, replacements):
+    """Apply the replacements to an extracted comment line in order.
+
+    Returns ``None`` if no replacement matches.
+    """
+    matched = False
+    for prefix, regex, replacement in replacements:
+        if line.startswith(prefix):
+            end = len(prefix)
+        else:
+            match = regex.match(line)
+            if match is None:
+                continue
+            end = match.end()
+        line = f"#. {replacement}{line[end:]}"
+        matched = True
+    return line if matched else None
+
+
+def _lreplace_extracted_comments_file(filename, replacements, dry_run, quiet):
+    exitcode, output = 0, []
+
+    # the file is only rewritten if some line changes, so the lines before
+    # the first change are copied when it is found
+    with contextlib.ExitStack() as stack:
+        tmp_f = None
+        with open(filename, newline="") as f:
+            for lineno, line in enumerate(f, 1):
+                # obsolete extracted comments start with '#~', so they
+                # never match
+                if line.startswith("#."):
+                    new_line = _lreplace_line(line, replacements)
+                    if new_line is not None and dry_run and not quiet:
+                        output.append(
+                            "Translator comment would be replaced"
+                            f" at '{filename}:{lineno}'\n"
+                        )
+                    if new_line is not None and new_line != line:
+                        exitcode = 1
+                        if not dry_run:
+                            if tmp_f is None:
+                                tmp_f = stack.enter_context(atomic_write(filename))
+                                with open(filename, newline="") as prefix_f:
+                                    tmp_f.writelines(
+                                        itertools.islice(prefix_f, lineno - 1)
+                                    )
+                            line = new_line
+                if tmp_f is not None:
+                    tmp_f.write(line)
+
+    return exitcode, "".join(output)
 
 
 def lreplace_extracted_comments(
@@ -22,6 +90,8 @@ def lreplace_extracted_comments(
     django_translators=False,
     dry_run=False,
     quiet=False,
+    jobs=1,
+    replacements=None,
 ):
     """Replace the beginning of the extracted comments which starts with the
     string passed in the argument ``match``.
@@ -38,6 +108,7 @@ def lreplace_extracted_comments(
 
     replacement : str, optional
       The replacement for the beginning of the matching extracted comments.
+      It is inserted literally.
 
     django_translators : bool, optional
       Convenient parameter to pass ``Translators: `` as ``-m`` parameter and
@@ -51,53 +122,46 @@ def lreplace_extracted_comments(
     quiet : bool, optional
       Enabled, don't print output to stderr when an obsolete message is found.
 
+    jobs : int, optional
+      Number of processes used to process the files in parallel. If ``None``,
+      the number of CPUs available.
+
+    replacements : list, optional
+      Pairs of matches and replacements applied in order to each extracted
+      comment, in addition to ``match`` and ``replacement``, so several
+      replacements are done reading each file once.
+
 
     Returns
     -------
 
     int: 0 if no a extracted comment has been replaced, 1 otherwise.
     """
-    if not django_translators and not match and not replacement:
+    replacements = list(replacements or [])
+    if match is not None:
+        replacements.insert(0, (match, replacement or ""))
+    if django_translators:
+        replacements.insert(0, DJANGO_TRANSLATORS_REPLACEMENT)
+    if not replacements:
         raise ValueError("You need to specify a match and replacement")
 
-    if django_translators:
-        regex = re.compile(r"^#\.\sTranslators:\s")
-        replacement = ""
-    else:
-        regex = re.compile(rf"^#\.\s{re.escape(match)}")
-
-    exitcode = 0
-    for filename in filenames:
-        with open(filename) as f:
-            content_lines = f.readlines()
-
-        tmp_filename = os.path.join(
-            TMP_DIR,
-            f"pre-commit-po-hooks--{os.path.basename(filename)}",
+    return write_results(
+        map_files(
+            _lreplace_extracted_comments_file,
+            filenames,
+            _compile_replacements(replacements),
+            dry_run,
+            quiet,
+            jobs=jobs,
         )
-
-        with open(tmp_filename, "w") as f:
-            for i, line in enumerate(content_lines):
-                if line.startswith("#. ") and re.match(regex, line):
-                    if dry_run and not quiet:
-                        sys.stderr.write(
-                            "Translator comment would be replaced"
-                            f" at '{filename}:{i+1}'\n"
-                        )
-                    new_line = f"#. {re.sub(regex, replacement, line)}"
-                    if new_line != line:
-                        exitcode = 1
-                    line = new_line
-                f.write(line)
-
-        if not dry_run:
-            os.remove(filename)
-            shutil.move(tmp_filename, filename)
-
-    return exitcode
+    )
 
 
 def main():
+    exitcode = forward_to_daemon("lreplace_extracted_comments")
+    if exitcode is not None:
+        return exitcode
+
     parser = argparse.ArgumentParser()
     parser.add_argument(
         "filenames",
@@ -120,17 +184,22 @@ def main():
     parser.add_argument(
         "-m",
         "--match",
+        action="append",
         dest="match",
         required=False,
+        default=[],
         metavar="MATCH",
         help="The string to match at the beginning of the extracted comments to"
-        " replace it.",
+        " replace it. Can be passed multiple times, each one followed by its"
+        " '-r/--replacement'.",
     )
     parser.add_argument(
         "-r",
         "--replacement",
+        action="append",
         dest="replacement",
         required=False,
+        default=[],
         metavar="REPL",
         help="The substitution to be used to replace the matching string.",
     )
@@ -143,16 +212,23 @@ def main():
             "Pass 'Translators: ' as '-m' argument and an empty string as replacement."
         ),
     )
+    add_jobs_argument(parser)
+    add_instrumentation_arguments(parser)
     args = parser.parse_args()
+    if len(args.match) != len(args.replacement):
+        parser.error(
+            "each '-m/--match' argument must have its '-r/--replacement' argument"
+        )
 
-    return lreplace_extracted_comments(
-        args.filenames,
-        match=args.match,
-        replacement=args.replacement,
-        django_translators=args.django_translators,
-        dry_run=args.dry_run,
-        quiet=args.quiet,
-    )
+    with instrument(args, parser.prog):
+        return lreplace_extracted_comments(
+            args.filenames,
+            replacements=list(zip(args.match, args.replacement)),
+            django_translators=args.django_translators,
+            dry_run=args.dry_run,
+            quiet=args.quiet,
+            jobs=args.jobs,
+        )
 
 
 if __name__ == "__main__":
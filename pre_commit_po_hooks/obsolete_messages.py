@@ -1,13 +1,86 @@
 """Checks for obsolete messages in PO files.
 
-Returns an error code if a PO file has an obsolete message.
+Returns an error code if a PO file has an obsolete message. With ``--fix``,
+removes the obsolete messages instead, returning an error code if some file
+has been modified.
 """
 
 import argparse
-import sys
 
-
-def check_obsolete_messages(filenames, quiet=False):
+from pre_commit_po_hooks.checks import (
+    Check,
+    add_cache_arguments,
+    add_diff_base_argument,
+    add_fail_fast_argument,
+    add_jobs_argument,
+    add_max_reports_argument,
+    cache_dir_from_args,
+    diff_base_from_args,
+    map_files,
+    run_checks,
+    write_results,
+)
+from pre_commit_po_hooks.daemon import forward_to_daemon
+from pre_commit_po_hooks.files import rewrite_entries
+from pre_commit_po_hooks.instrumentation import (
+    add_instrumentation_arguments,
+    instrument,
+)
+from pre_commit_po_hooks.po import (
+    EntryParser,
+    LineCounter,
+    iter_line_offsets,
+    line_at,
+    tokenize_line,
+)
+
+
+class ObsoleteMessagesCheck(Check):
+    """Reports each obsolete entry of a PO file."""
+
+    name = "obsolete-messages"
+    diffable = True
+
+    def feed_entry(self, entry):
+        if entry.obsolete:
+            self.report(
+                f"Found obsolete message at {self.filename}:{entry.obsolete_lineno}",
+                lineno=entry.obsolete_lineno,
+            )
+
+    def feed_chunk(self, chunk, lineno):
+        # obsolete entries are parsed from the runs of consecutive '#~' lines
+        linenos = LineCounter(chunk, lineno)
+        parser, previous_lineno = EntryParser(), None
+        for offset in iter_line_offsets(chunk, b"#~"):
+            line_lineno = linenos(offset)
+            if previous_lineno is not None and line_lineno != previous_lineno + 1:
+                entry = parser.close()
+                if entry is not None:
+                    self.feed_entry(entry)
+            previous_lineno = line_lineno
+
+            line = line_at(chunk, offset).decode("latin-1")
+            entry = parser.feed(tokenize_line(line_lineno, line))
+            if entry is not None:
+                self.feed_entry(entry)
+            if self.done:
+                return
+
+        entry = parser.close()
+        if entry is not None:
+            self.feed_entry(entry)
+
+
+def check_obsolete_messages(
+    filenames,
+    quiet=False,
+    jobs=1,
+    cache_dir=None,
+    fail_fast=False,
+    diff_base=None,
+    max_reports=None,
+):
     """Warns about all obsolete messages found in a set of PO files.
 
     Parameters
@@ -19,38 +92,114 @@ def check_obsolete_messages(filenames, quiet=False):
     quiet : bool, optional
       Enabled, don't print output to stderr when an obsolete message is found.
 
+    jobs : int, optional
+      Number of processes used to check the files in parallel. If ``None``,
+      the number of CPUs available.
+
+    cache_dir : str, optional
+      Directory in which the results are cached, so unchanged files are not
+      checked again. If ``None``, the cache is not used.
+
+    fail_fast : bool, optional
+      Enabled, stop at the first obsolete message found, without checking
+      the rest of the files. Implied by ``quiet``.
+
+    diff_base : str, optional
+      Git revision. If defined, only the messages changed since it are
+      checked. Files not tracked in the revision are checked entirely.
+
+    max_reports : int, optional
+      Maximum number of obsolete messages reported for each file. The rest
+      are summarized in a single line.
+
     Returns
     -------
 
     int: 0 if no obsolete messages found, 1 otherwise.
     """
-    exitcode = 0
-    for filename in filenames:
-        with open(filename) as f:
-            content_lines = f.readlines()
+    fail_fast = fail_fast or quiet
+    return run_checks(
+        filenames,
+        [
+            (
+                ObsoleteMessagesCheck,
+                {"quiet": quiet, "fail_fast": fail_fast, "max_reports": max_reports},
+            )
+        ],
+        jobs=jobs,
+        cache_dir=cache_dir,
+        fail_fast=fail_fast,
+        diff_base=diff_base,
+    )
+
+
+def _remove_obsolete_entry(entry, tokens):
+    return [] if entry.obsolete else None
+
+
+def _fix_obsolete_messages_file(filename):
+    if rewrite_entries(filename, _remove_obsolete_entry):
+        return 1, ""
+    return 0, ""
+
 
-        _inside_obsolete_message = False
-        for i, line in enumerate(content_lines):
-            if not _inside_obsolete_message and line.startswith("#~ "):
-                _inside_obsolete_message = True
+def fix_obsolete_messages(filenames, jobs=1):
+    """Remove the obsolete messages of a set of PO files, like
+    ``msgattrib --no-obsolete``, reading each file once.
 
-                exitcode = 1
-                if not quiet:
-                    sys.stderr.write(f"Found obsolete message at {filename}:{i + 1}\n")
-            elif _inside_obsolete_message and not line.startswith("#~ "):
-                _inside_obsolete_message = False
+    Parameters
+    ----------
+
+    filenames : list
+      Set of file names to fix.
+
+    jobs : int, optional
+      Number of processes used to fix the files in parallel. If ``None``,
+      the number of CPUs available.
+
+    Returns
+    -------
 
-    return exitcode
+    int: 0 if no files have been modified, 1 otherwise.
+    """
+    return write_results(map_files(_fix_obsolete_messages_file, filenames, jobs=jobs))
 
 
 def main():
+    exitcode = forward_to_daemon("obsolete_messages")
+    if exitcode is not None:
+        return exitcode
+
     parser = argparse.ArgumentParser()
     parser.add_argument(
         "filenames", nargs="*", help="Filenames to check for obsolete messages"
     )
     parser.add_argument("-q", "--quiet", action="store_true", help="Supress output")
+    add_jobs_argument(parser)
+    add_cache_arguments(parser)
+    add_fail_fast_argument(parser)
+    add_diff_base_argument(parser)
+    add_max_reports_argument(parser)
+    parser.add_argument(
+        "--fix",
+        action="store_true",
+        dest="fix",
+        help="Remove the obsolete messages instead of reporting them.",
+    )
+    add_instrumentation_arguments(parser)
     args = parser.parse_args()
-    return check_obsolete_messages(args.filenames, quiet=args.quiet)
+    with instrument(args, parser.prog):
+        if args.fix:
+            return fix_obsolete_messages(args.filenames, jobs=args.jobs)
+        return check_obsolete_messages(
+            args.filenames,
+            quiet=args.quiet,
+            jobs=args.jobs,
+            cache_dir=cache_dir_from_args(args),
+            fail_fast=args.fail_fast,
+            diff_base=diff_base_from_args(args),
+            max_reports=args.max_reports,
+        )
 
 
 if __name__ == "__main__":
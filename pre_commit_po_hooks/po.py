@@ -0,0 +1,869 @@
+"""Streaming tokenizer and entry model for PO files.
+
+All the hooks are built on top of this module, so each file is tokenized
+in a single forward pass without materializing its lines.
+"""
+
+import collections
+import re
+
+
+TOKEN_BLANK = "blank"
+TOKEN_COMMENT = "comment"
+TOKEN_KEYWORD = "keyword"
+TOKEN_STRING = "string"
+
+ENTRY_HEADER = "header"
+ENTRY_OBSOLETE = "obsolete"
+ENTRY_FUZZY = "fuzzy"
+ENTRY_UNTRANSLATED = "untranslated"
+ENTRY_PARTIALLY_TRANSLATED = "partially-translated"
+ENTRY_TRANSLATED = "translated"
+
+CHUNK_SIZE = 1024 * 1024
+
+Token = collections.namedtuple(
+    "Token",
+    ("lineno", "kind", "keyword", "value", "obsolete", "line"),
+)
+Token.__doc__ = """Line of a PO file classified by the tokenizer.
+
+Parameters
+----------
+
+lineno : int
+  Line number in the file, starting at 1.
+
+kind : str
+  One of ``TOKEN_BLANK``, ``TOKEN_COMMENT``, ``TOKEN_KEYWORD`` or
+  ``TOKEN_STRING``.
+
+keyword : str
+  For comments, the comment marker (``#``, ``#.``, ``#,``, ``#:`` or
+  ``#|``). For keywords, the keyword itself (``msgctxt``, ``msgid``,
+  ``msgid_plural``, ``msgstr`` or ``msgstr[N]``). ``None`` otherwise.
+
+value : str
+  Content of the comment or content between the quotes of the string,
+  without unescaping it.
+
+obsolete : bool
+  If the line is prefixed by ``#~``.
+
+line : str
+  Raw line as read from the file.
+"""
+
+
+# builds tokens without the overhead of the keyword arguments handling of
+# the namedtuple constructor
+_new_token = tuple.__new__
+
+
+def _unquote(text):
+    if len(text) > 1 and text[0] == '"' and text[-1] == '"':
+        return text[1:-1]
+    return text
+
+
+def _tokenize_text(lineno, line, text):
+    obsolete = False
+    if text.startswith("#~"):
+        obsolete = True
+        text = text[2:].lstrip()
+        if text.startswith("|"):
+            text = "#" + text
+
+    if text.startswith("#"):
+        if len(text) > 1 and text[1] in ".,:|":
+            keyword, value = text[:2], text[2:].strip()
+        else:
+            keyword, value = "#", text[1:].strip()
+        return _new_token(
+            Token, (lineno, TOKEN_COMMENT, keyword, value, obsolete, line)
+        )
+    if text.startswith('"'):
+        return _new_token(
+            Token, (lineno, TOKEN_STRING, None, _unquote(text), obsolete, line)
+        )
+
+    keyword, _, value = text.partition(" ")
+    return _new_token(
+        Token,
+        (lineno, TOKEN_KEYWORD, keyword, _unquote(value.strip()), obsolete, line),
+    )
+
+
+def tokenize_line(lineno, line):
+    """Classify a single line of a PO file.
+
+    Parameters
+    ----------
+
+    lineno : int
+      Line number of the line in the file.
+
+    line : str
+      Content of the line.
+
+    Returns
+    -------
+
+    Token: Token representing the line.
+    """
+    # lines written by gettext tools don't have leading spaces, so they are
+    # classified by their first character without stripping them first
+    first = line[:1]
+    if first == '"':
+        return _new_token(
+            Token, (lineno, TOKEN_STRING, None, _unquote(line.rstrip()), False, line)
+        )
+    if first == "m":
+        keyword, _, value = line.rstrip().partition(" ")
+        return _new_token(
+            Token,
+            (lineno, TOKEN_KEYWORD, keyword, _unquote(value.lstrip()), False, line),
+        )
+    if first == "#" and line[1:2] != "~":
+        if line[1:2] in (".", ",", ":", "|"):
+            keyword, value = line[:2], line[2:].strip()
+        else:
+            keyword, value = "#", line[1:].strip()
+        return _new_token(Token, (lineno, TOKEN_COMMENT, keyword, value, False, line))
+    if first == "\n":
+        return _new_token(Token, (lineno, TOKEN_BLANK, None, None, False, line))
+
+    text = line.strip()
+    if not text:
+        return _new_token(Token, (lineno, TOKEN_BLANK, None, None, False, line))
+    return _tokenize_text(lineno, line, text)
+
+
+def parse_flags(value):
+    """Split the value of a ``#,`` comment into its flags.
+
+    Parameters
+    ----------
+
+    value : str
+      Content of the comment, as stored in :py:attr:`Token.value`.
+
+    Returns
+    -------
+
+    tuple: Flags defined in the comment.
+    """
+    return tuple(flag.strip() for flag in value.split(",") if flag.strip())
+
+
+def iter_tokens(lines):
+    """Tokenize PO file lines lazily.
+
+    Parameters
+    ----------
+
+    lines : iterable
+      Lines of the PO file, like an opened file object.
+
+    Yields
+    ------
+
+    Token: Token for each line.
+    """
+    for i, line in enumerate(lines):
+        yield tokenize_line(i + 1, line)
+
+
+class POEntry:
+    """Entry of a PO file.
+
+    Strings are stored as they appear in the file, concatenating
+    continuation lines but without unescaping them.
+    """
+
+    __slots__ = (
+        "lineno",
+        "end_lineno",
+        "flags",
+        "flags_lineno",
+        "msgctxt",
+        "msgid",
+        "msgid_lineno",
+        "msgid_plural",
+        "msgstr",
+        "msgstr_lineno",
+        "obsolete_lineno",
+    )
+
+    def __init__(self, lineno):
+        self.lineno = lineno
+        self.end_lineno = lineno
+        self.flags = ()
+        self.flags_lineno = None
+        self.msgctxt = None
+        self.msgid = None
+        self.msgid_lineno = None
+        self.msgid_plural = None
+        self.msgstr = []
+        self.msgstr_lineno = None
+        self.obsolete_lineno = None
+
+    @property
+    def obsolete(self):
+        """Entry is commented out with ``#~``."""
+        return self.obsolete_lineno is not None
+
+    @property
+    def fuzzy(self):
+        """Entry is marked with the ``fuzzy`` flag."""
+        return "fuzzy" in self.flags
+
+    @property
+    def is_header(self):
+        """Entry is the metadata header of the file."""
+        return self.msgid == "" and self.msgctxt is None and not self.obsolete
+
+    @property
+    def status(self):
+        """Classification of the entry.
+
+        One of ``ENTRY_HEADER``, ``ENTRY_OBSOLETE``, ``ENTRY_FUZZY``,
+        ``ENTRY_UNTRANSLATED``, ``ENTRY_PARTIALLY_TRANSLATED`` (plural
+        entries with some empty ``msgstr[N]``) or ``ENTRY_TRANSLATED``.
+        Fuzzy entries without any translation are untranslated.
+        """
+        if self.obsolete_lineno is not None:
+            return ENTRY_OBSOLETE
+        if self.is_header:
+            return ENTRY_HEADER
+        translated_forms = 0
+        for msgstr in self.msgstr:
+            if msgstr:
+                translated_forms += 1
+        if not translated_forms:
+            return ENTRY_UNTRANSLATED
+        if self.fuzzy:
+            return ENTRY_FUZZY
+        if translated_forms < len(self.msgstr):
+            return ENTRY_PARTIALLY_TRANSLATED
+        return ENTRY_TRANSLATED
+
+    def __repr__(self):
+        return (
+            f"<POEntry lineno={self.lineno} msgctxt={self.msgctxt!r}"
+            f" msgid={self.msgid!r}>"
+        )
+
+
+class EntryParser:
+    """Push parser that builds :py:class:`POEntry` objects from tokens.
+
+    Tokens are passed one by one to :py:meth:`feed`, which returns an entry
+    each time one is completed, so callers can run other consumers over the
+    same token stream.
+    """
+
+    def __init__(self):
+        self._entry = None
+        self._field = None
+
+    def _complete(self):
+        entry, self._entry, self._field = self._entry, None, None
+        if entry is not None and entry.msgid is not None:
+            return entry
+        return None
+
+    def feed(self, token):
+        """Consume a token.
+
+        Parameters
+        ----------
+
+        token : Token
+          Next token of the file.
+
+        Returns
+        -------
+
+        POEntry: The entry completed by this token, ``None`` if no entry
+          has been completed.
+        """
+        kind = token.kind
+        if kind == TOKEN_BLANK:
+            return self._complete()
+
+        completed = None
+        entry = self._entry
+        if (
+            entry is not None
+            and entry.msgstr_lineno is not None
+            and (
+                kind == TOKEN_COMMENT
+                or (kind == TOKEN_KEYWORD and not token.keyword.startswith("msgstr"))
+            )
+        ):
+            completed = self._complete()
+            entry = None
+        if entry is None:
+            entry = self._entry = POEntry(token.lineno)
+        entry.end_lineno = token.lineno
+        if token.obsolete and entry.obsolete_lineno is None:
+            entry.obsolete_lineno = token.lineno
+
+        if kind == TOKEN_COMMENT:
+            if token.keyword == "#,":
+                entry.flags += parse_flags(token.value)
+                if entry.flags_lineno is None:
+                    entry.flags_lineno = token.lineno
+        elif kind == TOKEN_KEYWORD:
+            keyword = token.keyword
+            if keyword == "msgid":
+                entry.msgid, entry.msgid_lineno = token.value, token.lineno
+            elif keyword.startswith("msgstr"):
+                entry.msgstr.append(token.value)
+                if entry.msgstr_lineno is None:
+                    entry.msgstr_lineno = token.lineno
+            elif keyword == "msgctxt":
+                entry.msgctxt = token.value
+            elif keyword == "msgid_plural":
+                entry.msgid_plural = token.value
+            else:
+                keyword = None
+            self._field = keyword
+        elif self._field is not None:  # continuation string
+            field = self._field
+            if field.startswith("msgstr"):
+                entry.msgstr[-1] += token.value
+            else:
+                setattr(entry, field, getattr(entry, field) + token.value)
+        return completed
+
+    def feed_line(self, lineno, line):
+        """Consume a line of the file, like :py:meth:`feed` with the token of
+        the line, but without building it for the lines written by gettext
+        tools, which are the most of them.
+
+        Parameters
+        ----------
+
+        lineno : int
+          Line number of the line in the file.
+
+        line : str
+          Content of the line.
+
+        Returns
+        -------
+
+        POEntry: The entry completed by this line, ``None`` if no entry has
+          been completed.
+        """
+        first = line[:1]
+        entry = self._entry
+        if first == '"':
+            if entry is None:
+                return self.feed(tokenize_line(lineno, line))
+            entry.end_lineno = lineno
+            field = self._field
+            if field is not None:
+                value = _unquote(line.rstrip())
+                if field.startswith("msgstr"):
+                    entry.msgstr[-1] += value
+                else:
+                    setattr(entry, field, getattr(entry, field) + value)
+            return None
+        if first == "\n":
+            return self._complete()
+        if first == "m":
+            keyword, _, value = line.rstrip().partition(" ")
+            value = _unquote(value.lstrip())
+            completed = None
+            if entry is not None and entry.msgstr_lineno is not None:
+                if keyword.startswith("msgstr"):
+                    entry.end_lineno = lineno
+                    entry.msgstr.append(value)
+                    self._field = keyword
+                    return None
+                completed = self._complete()
+                entry = None
+            if entry is None:
+                entry = self._entry = POEntry(lineno)
+            entry.end_lineno = lineno
+            if keyword == "msgid":
+                entry.msgid, entry.msgid_lineno = value, lineno
+            elif keyword.startswith("msgstr"):
+                entry.msgstr.append(value)
+                entry.msgstr_lineno = lineno
+            elif keyword == "msgctxt":
+                entry.msgctxt = value
+            elif keyword == "msgid_plural":
+                entry.msgid_plural = value
+            else:
+                keyword = None
+            self._field = keyword
+            return completed
+        if first == "#" and line[1:2] != "~":
+            completed = None
+            if entry is not None and entry.msgstr_lineno is not None:
+                completed = self._complete()
+                entry = None
+            if entry is None:
+                entry = self._entry = POEntry(lineno)
+            entry.end_lineno = lineno
+            if line[1:2] == ",":
+                entry.flags += parse_flags(line[2:])
+                if entry.flags_lineno is None:
+                    entry.flags_lineno = lineno
+            return completed
+        # obsolete entries and unusual lines
+        return self.feed(tokenize_line(lineno, line))
+
+    def close(self):
+        """Finish the parsing.
+
+        Returns
+        -------
+
+        POEntry: The last entry of the file, if any.
+        """
+        return self._complete()
+
+
+def iter_entries(lines):
+    """Parse PO file entries lazily.
+
+    Parameters
+    ----------
+
+    lines : iterable
+      Lines of the PO file, like an opened file object.
+
+    Yields
+    ------
+
+    POEntry: Entries of the file, including the header and obsolete ones.
+    """
+    parser = EntryParser()
+    feed_line = parser.feed_line
+    for lineno, line in enumerate(lines, 1):
+        entry = feed_line(lineno, line)
+        if entry is not None:
+            yield entry
+    entry = parser.close()
+    if entry is not None:
+        yield entry
+
+
+def _split_entry_tokens(entry, tokens):
+    # tokens before the entry, like blank lines, are not part of it
+    index = entry.lineno - tokens[0].lineno
+    for token in tokens[:index]:
+        yield None, [token]
+    yield entry, tokens[index:]
+
+
+def iter_entries_tokens(lines):
+    """Parse PO file entries lazily along with the tokens of their lines, so
+    files can be rewritten entry by entry.
+
+    Parameters
+    ----------
+
+    lines : iterable
+      Lines of the PO file, like an opened file object.
+
+    Yields
+    ------
+
+    tuple: Entry and list of its tokens, in the order of the file. Lines
+      that don't belong to an entry, like blank lines, are yielded one by
+      one with ``None`` as entry.
+    """
+    parser, tokens = EntryParser(), []
+    for token in iter_tokens(lines):
+        entry = parser.feed(token)
+        if entry is not None:
+            yield from _split_entry_tokens(entry, tokens)
+            tokens = []
+        tokens.append(token)
+
+    entry = parser.close()
+    if entry is not None:
+        yield from _split_entry_tokens(entry, tokens)
+    else:
+        for token in tokens:
+            yield None, [token]
+
+
+def entry_digest(entry):
+    """Compute a digest identifying an entry by its context and message, so
+    large sets of entries can be indexed without storing their strings.
+
+    Entries without context are distinct from those with an empty context.
+
+    Parameters
+    ----------
+
+    entry : POEntry
+      Entry to identify.
+
+    Returns
+    -------
+
+    bytes: 16 bytes digest.
+    """
+    import hashlib
+
+    if entry.msgctxt is None:
+        key = f"\0\x04{entry.msgid}"
+    else:
+        key = f"\1{entry.msgctxt}\x04{entry.msgid}"
+    return hashlib.blake2b(
+        key.encode("utf-8", "surrogatepass"), digest_size=16
+    ).digest()
+
+
+def iter_metadata(strings):
+    """Parse the metadata headers of the header entry of a PO file.
+
+    Headers are separated by escaped newlines (``\\n``) in the strings of
+    the ``msgstr`` of the header entry, so values can be split across
+    multiple strings.
+
+    Parameters
+    ----------
+
+    strings : list
+      Pairs of line numbers and contents of the strings of the ``msgstr``,
+      without quotes.
+
+    Yields
+    ------
+
+    tuple: Line number where each header starts, its name and its value.
+    """
+    lineno, text = None, ""
+    for string_lineno, content in strings:
+        *lines, rest = content.split("\\n")
+        for line in lines:
+            if lineno is None:
+                lineno = string_lineno
+            text += line
+            if text.strip():
+                header, _, value = text.partition(":")
+                yield lineno, header.strip(), value.strip()
+            lineno, text = None, ""
+        if rest:
+            if lineno is None:
+                lineno = string_lineno
+            text += rest
+    if text.strip():
+        header, _, value = text.partition(":")
+        yield lineno, header.strip(), value.strip()
+
+
+def _last_entry_offset(data):
+    # offset of the last complete line of ``data`` that starts an entry
+    # following another one, 0 if not found
+    entry_offset = 0
+    for offset, line in iter_previous_lines(data, data.rfind(b"\n") + 1):
+        token = tokenize_line(0, line.decode("latin-1"))
+        if token.kind == TOKEN_STRING:
+            # continuation lines belong to the keyword above them
+            continue
+        if (
+            entry_offset
+            and token.kind == TOKEN_KEYWORD
+            and token.keyword.startswith("msgstr")
+        ):
+            return entry_offset
+        if token.kind == TOKEN_COMMENT or token.keyword in ("msgctxt", "msgid"):
+            entry_offset = offset
+        else:
+            entry_offset = 0
+    return 0
+
+
+def iter_chunks(f, chunk_size=CHUNK_SIZE):
+    """Read a PO file opened in binary mode in chunks of complete entries.
+
+    Chunks are cut after a blank line when possible or, in files without
+    blank lines between entries, before the line that starts an entry after
+    a translation, so entries are never split between chunks. Lines are not
+    decoded, so checks that only look for some prefixes can scan the chunks
+    with ``bytes`` methods.
+
+    Parameters
+    ----------
+
+    f : file
+      PO file opened in binary mode.
+
+    chunk_size : int, optional
+      Number of bytes read at once.
+
+    Yields
+    ------
+
+    tuple: Line number of the first line of the chunk and the chunk.
+    """
+    lineno, pending = 1, b""
+    while True:
+        data = f.read(chunk_size)
+        if not data:
+            break
+        if pending:
+            data = pending + data
+        end = max(data.rfind(b"\n\n"), data.rfind(b"\n\r\n"))
+        if end != -1:
+            end = data.find(b"\n", end + 1) + 1
+        elif len(data) > chunk_size:
+            # no blank lines, cut before the last entry, which could be
+            # incomplete
+            end = _last_entry_offset(data)
+        else:
+            end = 0
+        if not end:
+            pending = data
+            continue
+        chunk, pending = data[:end], data[end:]
+        yield lineno, chunk
+        lineno += chunk.count(b"\n")
+    if pending:
+        yield lineno, pending
+
+
+def line_at(chunk, offset):
+    """Get the line of a chunk that starts at an offset, without the
+    newline character.
+    """
+    end = chunk.find(b"\n", offset)
+    return chunk[offset:] if end == -1 else chunk[offset:end]
+
+
+def iter_line_offsets(chunk, prefix):
+    """Find the lines of a chunk that start with a prefix.
+
+    Parameters
+    ----------
+
+    chunk : bytes
+      Chunk of complete lines, as yielded by :py:func:`iter_chunks`.
+
+    prefix : bytes
+      Prefix to search.
+
+    Yields
+    ------
+
+    int: Offset of the start of each matching line in the chunk.
+    """
+    if chunk.startswith(prefix):
+        yield 0
+    prefix = b"\n" + prefix
+    offset = chunk.find(prefix)
+    while offset != -1:
+        yield offset + 1
+        offset = chunk.find(prefix, offset + 1)
+
+
+def iter_lines_containing(chunk, needle):
+    """Find the lines of a chunk that contain a substring.
+
+    Yields
+    ------
+
+    int: Offset of the start of each matching line in the chunk, once per
+      line.
+    """
+    offset = chunk.find(needle)
+    while offset != -1:
+        start = chunk.rfind(b"\n", 0, offset) + 1
+        yield start
+        end = chunk.find(b"\n", offset)
+        if end == -1:
+            break
+        offset = chunk.find(needle, end)
+
+
+def iter_previous_lines(chunk, offset):
+    """Iterate backwards over the lines of a chunk before an offset.
+
+    Yields
+    ------
+
+    tuple: Offset of the start of each line and its content.
+    """
+    end = offset - 1
+    while end >= 0:
+        start = chunk.rfind(b"\n", 0, end) + 1
+        yield start, chunk[start:end]
+        end = start - 1
+
+
+class LineCounter:
+    """Compute line numbers of offsets in a chunk lazily.
+
+    Only the newlines between consecutive offsets are counted, so offsets
+    must be passed in increasing order.
+
+    Parameters
+    ----------
+
+    chunk : bytes
+      Chunk of lines.
+
+    lineno : int
+      Line number of the first line of the chunk.
+    """
+
+    def __init__(self, chunk, lineno):
+        self.chunk = chunk
+        self._offset = 0
+        self._lineno = lineno
+
+    def __call__(self, offset):
+        if offset < self._offset:
+            return self._lineno - self.chunk.count(b"\n", offset, self._offset)
+        self._lineno += self.chunk.count(b"\n", self._offset, offset)
+        self._offset = offset
+        return self._lineno
+
+
+def is_header_msgid(chunk, offset):
+    """Check if the line of a chunk that starts at an offset is the
+    ``msgid`` of the header entry, without parsing the entry.
+    """
+    next_offset = chunk.find(b"\n", offset) + 1
+    if next_offset and chunk.startswith(b'"', next_offset):
+        return False  # multiline msgid
+    if line_at(chunk, offset).strip() != b'msgid ""':
+        return False
+    if next_offset and line_at(chunk, next_offset).lstrip().startswith(b'"'):
+        return False
+    for _, line in iter_previous_lines(chunk, offset):
+        line = line.lstrip()
+        if not line.startswith(b'"'):
+            return not line.startswith(b"msgctxt")
+    return True
+
+
+# lines with an empty string not followed by a continuation string, which
+# could be empty too; they match the newline before the line, as anchoring
+# them with ``^`` and ``re.M`` is several times slower
+_EMPTY_MSGSTR_RE = re.compile(rb'\nmsgstr(\[\d+\])? ""[ \t\r]*(?=\n(?!"[^"])|\Z)')
+_EMPTY_MSGID_RE = re.compile(rb'\nmsgid ""[ \t\r]*(?=\n(?!")|\Z)')
+
+
+def _is_translated(chunk, offset):
+    # checks the value of a msgstr line and its continuation strings
+    line = line_at(chunk, offset)
+    if line[line.find(b'"') :].rstrip() != b'""':
+        return True
+    offset = chunk.find(b"\n", offset) + 1
+    while offset and chunk.startswith(b'"', offset):
+        if line_at(chunk, offset).rstrip() != b'""':
+            return True
+        offset = chunk.find(b"\n", offset) + 1
+    return False
+
+
+def _plural_forms(chunk, offset):
+    # number of forms and translated forms of the plural entry whose first
+    # msgstr line starts at the offset
+    forms, translated_forms = 0, 0
+    while offset:
+        if chunk.startswith(b"msgstr[", offset):
+            forms += 1
+            translated_forms += _is_translated(chunk, offset)
+        elif not chunk.startswith(b'"', offset):
+            break
+        offset = chunk.find(b"\n", offset) + 1
+    return forms, translated_forms
+
+
+def _iter_fuzzy_msgstr_offsets(chunk):
+    # offsets of the first msgstr line of the fuzzy entries, not obsolete
+    for offset in iter_lines_containing(chunk, b"fuzzy"):
+        line = line_at(chunk, offset)
+        if not line.startswith(b"#,") or "fuzzy" not in parse_flags(
+            line[2:].decode("latin-1")
+        ):
+            continue
+        # the keywords of the entry follow its comments
+        while chunk.startswith(b"#", offset) and not chunk.startswith(b"#~", offset):
+            offset = chunk.find(b"\n", offset) + 1
+            if not offset:
+                return
+        if not chunk.startswith(b"#~", offset):
+            msgstr_offset = chunk.find(b"\nmsgstr", offset - 1) + 1
+            if msgstr_offset:
+                yield msgstr_offset
+
+
+def scan_translations(chunk, lineno):
+    """Classify the messages of a chunk looking only at the lines of their
+    empty translations and flags, without parsing the entries.
+
+    Obsolete entries and the header are ignored. Lines with leading spaces
+    are not considered.
+
+    Parameters
+    ----------
+
+    chunk : bytes
+      Chunk of complete entries, as yielded by :py:func:`iter_chunks`.
+
+    lineno : int
+      Line number of the first line of the chunk.
+
+    Returns
+    -------
+
+    tuple: Number of messages, number of fuzzy messages and list of pairs
+      of the line number of the first ``msgstr`` and the status of the
+      untranslated and partially translated messages, in the order of the
+      file. Statuses are defined as in :py:attr:`POEntry.status`.
+    """
+    total = chunk.count(b"\nmsgstr ") + chunk.count(b"\nmsgstr[0]")
+    if chunk.startswith(b"msgstr ") or chunk.startswith(b"msgstr[0]"):
+        total += 1
+
+    # the offsets of the matches in the prefixed chunk are the offsets of
+    # the lines in the chunk
+    prefixed_chunk = b"\n" + chunk
+
+    # the msgstr of the header follows its msgid
+    headers = set()
+    for match in _EMPTY_MSGID_RE.finditer(prefixed_chunk):
+        if is_header_msgid(chunk, match.start()):
+            headers.add(match.end())
+    total -= len(headers)
+
+    untranslated = []
+    for match in _EMPTY_MSGSTR_RE.finditer(prefixed_chunk):
+        offset = match.start()
+        if match.group(1) is None:
+            if offset not in headers and not _is_translated(chunk, offset):
+                untranslated.append((offset, ENTRY_UNTRANSLATED))
+            continue
+        # the forms of a plural entry are consecutive
+        entry_offset = chunk.rfind(b"\nmsgstr[0]", 0, offset + 9) + 1
+        if untranslated and untranslated[-1][0] == entry_offset:
+            continue
+        forms, translated_forms = _plural_forms(chunk, entry_offset)
+        if not translated_forms:
+            untranslated.append((entry_offset, ENTRY_UNTRANSLATED))
+        elif translated_forms < forms:
+            untranslated.append((entry_offset, ENTRY_PARTIALLY_TRANSLATED))
+
+    # fuzzy messages without translation are untranslated
+    fuzzy = set(_iter_fuzzy_msgstr_offsets(chunk)) - headers
+    linenos, entries = LineCounter(chunk, lineno), []
+    for offset, status in untranslated:
+        if offset in fuzzy:
+            if status == ENTRY_PARTIALLY_TRANSLATED:
+                continue
+            fuzzy.discard(offset)
+        entries.append((linenos(offset), status))
+    return total, len(fuzzy), entries
@@ -0,0 +1,239 @@
+"""Runs multiple checks over PO files reading each file only once.
+
+Accepts the options of the 'obsolete-messages', 'fuzzy-messages',
+'untranslated-messages', 'check-entries' and 'check-metadata' hooks, and
+returns an error code if any of the enabled checks fails.
+"""
+
+import argparse
+import sys
+
+from pre_commit_po_hooks.check_entries import (
+    DuplicateMessagesCheck,
+    MaxLinesCheck,
+    MaxMessagesCheck,
+)
+from pre_commit_po_hooks.check_metadata import (
+    HeaderSpec,
+    MetadataCheck,
+    extract_headers_spec,
+    resolve_headers_spec,
+)
+from pre_commit_po_hooks.check_template import TemplateCheck, TemplateIndex
+from pre_commit_po_hooks.checks import (
+    add_cache_arguments,
+    add_diff_base_argument,
+    add_fail_fast_argument,
+    add_jobs_argument,
+    add_max_reports_argument,
+    cache_dir_from_args,
+    diff_base_from_args,
+    run_checks,
+)
+from pre_commit_po_hooks.daemon import forward_to_daemon
+from pre_commit_po_hooks.fuzzy_messages import FuzzyMessagesCheck
+from pre_commit_po_hooks.instrumentation import (
+    add_instrumentation_arguments,
+    instrument,
+)
+from pre_commit_po_hooks.obsolete_messages import ObsoleteMessagesCheck
+from pre_commit_po_hooks.untranslated_messages import UntranslatedMessagesCheck
+
+
+def build_checks(args, headers_spec):
+    """Build the checks specification for :py:func:`run_checks` from the
+    parsed command line arguments.
+
+    Parameters
+    ----------
+
+    args : argparse.Namespace
+      Parsed command line arguments.
+
+    headers_spec : dict
+      Headers specification passed with ``-h`` and ``-v`` arguments.
+
+    Returns
+    -------
+
+    list: Pairs of check classes and keyword arguments to initialize them.
+    """
+    options = {
+        "quiet": args.quiet,
+        "fail_fast": args.fail_fast,
+        "max_reports": args.max_reports,
+    }
+    checks = []
+    if args.obsolete:
+        checks.append((ObsoleteMessagesCheck, options))
+    if args.fuzzy:
+        checks.append((FuzzyMessagesCheck, options))
+    if args.untranslated or args.min is not None:
+        checks.append((UntranslatedMessagesCheck, {"min_": args.min, **options}))
+    if args.max_messages is not None:
+        checks.append(
+            (MaxMessagesCheck, {"max_messages": args.max_messages, **options})
+        )
+    if args.max_lines is not None:
+        checks.append((MaxLinesCheck, {"max_lines": args.max_lines, **options}))
+    if args.no_duplicates:
+        checks.append((DuplicateMessagesCheck, options))
+    if args.pot is not None:
+        checks.append((TemplateCheck, {"template": TemplateIndex(args.pot), **options}))
+    if headers_spec or args.standard_headers or args.no_metadata:
+        checks.append(
+            (
+                MetadataCheck,
+                {
+                    "headers_spec": HeaderSpec(
+                        resolve_headers_spec(
+                            headers_spec,
+                            no_metadata=args.no_metadata,
+                            standard_headers=args.standard_headers,
+                        )
+                    ),
+                    "no_metadata": args.no_metadata,
+                    "remove_metadata": args.remove_metadata,
+                    **options,
+                },
+            )
+        )
+    return checks
+
+
+def main():
+    exitcode = forward_to_daemon("po_hooks")
+    if exitcode is not None:
+        return exitcode
+
+    parser = argparse.ArgumentParser()
+
+    headers_spec = extract_headers_spec(sys.argv)
+
+    parser.add_argument("filenames", nargs="*", help="Filenames to check")
+    parser.add_argument(
+        "--obsolete",
+        action="store_true",
+        help="Check for obsolete messages.",
+    )
+    parser.add_argument(
+        "--fuzzy",
+        action="store_true",
+        help="Check for fuzzy messages.",
+    )
+    parser.add_argument(
+        "--untranslated",
+        action="store_true",
+        help="Check for untranslated messages.",
+    )
+    parser.add_argument(
+        "--min",
+        "--min-translated",
+        type=str,
+        metavar="N/N%",
+        required=False,
+        default=None,
+        dest="min",
+        help=(
+            "Minimum messages translated in each PO file to be considered valid."
+            " You can pass either a float number optionally ending in a character"
+            " %% to indicate that is a percentage of the total of translated"
+            " entries in each PO file."
+        ),
+    )
+    parser.add_argument(
+        "--max-messages",
+        type=int,
+        metavar="NUMBER",
+        required=False,
+        default=None,
+        dest="max_messages",
+        help=(
+            "Check the maximum number of messages in each PO file "
+            "is not greater than the number passed in this parameter."
+        ),
+    )
+    parser.add_argument(
+        "--max-lines",
+        type=int,
+        metavar="NUMBER",
+        required=False,
+        default=None,
+        dest="max_lines",
+        help=(
+            "Check the maximum number of lines in each PO file is not"
+            " greater than the number passed in this parameter."
+        ),
+    )
+    parser.add_argument(
+        "--no-duplicates",
+        action="store_true",
+        dest="no_duplicates",
+        help="Check that no message is defined more than once in each PO file.",
+    )
+    parser.add_argument(
+        "--pot",
+        metavar="PATH",
+        default=None,
+        dest="pot",
+        help="Check that each PO file contains exactly the messages of a POT file.",
+    )
+    parser.add_argument(
+        "--no-metadata",
+        action="store_true",
+        dest="no_metadata",
+        help=(
+            "The files shouldn't have metadata. If a file has metadata"
+            " information, exits with code 1."
+        ),
+    )
+    parser.add_argument(
+        "--remove-metadata",
+        action="store_true",
+        dest="remove_metadata",
+        help="Remove metadata from files that have it.",
+    )
+    parser.add_argument(
+        "--standard-headers",
+        action="store_true",
+        dest="standard_headers",
+        help=(
+            "Check the metadata against a common standard set of headers."
+            " Each value can be overwritten using '-h' and '-v' arguments."
+        ),
+    )
+    parser.add_argument("-q", "--quiet", action="store_true", help="Supress output")
+    add_jobs_argument(parser)
+    add_cache_arguments(parser)
+    add_fail_fast_argument(parser)
+    add_diff_base_argument(parser)
+    add_max_reports_argument(parser)
+    add_instrumentation_arguments(parser)
+    args = parser.parse_args()
+
+    if args.remove_metadata:
+        args.no_metadata = True
+    args.fail_fast = not args.remove_metadata and (args.fail_fast or args.quiet)
+
+    try:
+        checks = build_checks(args, headers_spec)
+    except OSError as exc:
+        # the template is the only file read to build the checks
+        parser.error(f"can't read the template '{args.pot}': {exc.strerror}")
+    if not checks:
+        parser.print_help()
+        return 1
+
+    with instrument(args, parser.prog):
+        return run_checks(
+            args.filenames,
+            checks,
+            jobs=args.jobs,
+            cache_dir=cache_dir_from_args(args),
+            fail_fast=args.fail_fast,
+            diff_base=diff_base_from_args(args),
+        )
+
+
+if __name__ == "__main__":
+    exit(main())
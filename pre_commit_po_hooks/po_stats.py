@@ -0,0 +1,198 @@
+"""Reports statistics of PO files in a machine readable format.
+
+For each file, writes a record with the number of entries by translation
+status, the number of lines and the size in bytes, as JSON Lines or CSV.
+"""
+
+import argparse
+import os
+import sys
+
+from pre_commit_po_hooks.checks import Check, add_jobs_argument, check_file, map_files
+from pre_commit_po_hooks.daemon import forward_to_daemon
+from pre_commit_po_hooks.instrumentation import (
+    add_instrumentation_arguments,
+    instrument,
+)
+from pre_commit_po_hooks.po import (
+    ENTRY_FUZZY,
+    ENTRY_HEADER,
+    ENTRY_OBSOLETE,
+    ENTRY_PARTIALLY_TRANSLATED,
+    ENTRY_TRANSLATED,
+    ENTRY_UNTRANSLATED,
+    scan_translations,
+)
+
+
+STATS_FIELDS = (
+    "filename",
+    "total",
+    "translated",
+    "fuzzy",
+    "partially_translated",
+    "untranslated",
+    "obsolete",
+    "lines",
+    "bytes",
+)
+
+FORMATS = ("jsonl", "csv")
+
+_STATUS_FIELDS = {
+    ENTRY_TRANSLATED: "translated",
+    ENTRY_FUZZY: "fuzzy",
+    ENTRY_PARTIALLY_TRANSLATED: "partially_translated",
+    ENTRY_UNTRANSLATED: "untranslated",
+    ENTRY_OBSOLETE: "obsolete",
+}
+
+
+class StatsCheck(Check):
+    """Counts the entries of a PO file by translation status and its lines.
+
+    Never fails. After the check, the attribute ``stats`` holds a dictionary
+    with the fields defined in ``STATS_FIELDS``.
+    """
+
+    name = "po-stats"
+    needs_file = True
+
+    def __init__(self, filename, quiet=False, fail_fast=False):
+        super().__init__(filename, quiet=quiet, fail_fast=fail_fast)
+        self.stats = dict.fromkeys(STATS_FIELDS, 0)
+        self.stats["filename"] = str(filename)
+        self._unterminated_line = False
+
+    def feed_token(self, token):
+        self.stats["lines"] += 1
+
+    def feed_entry(self, entry):
+        status = entry.status
+        if status != ENTRY_HEADER:
+            self.stats[_STATUS_FIELDS[status]] += 1
+
+    def feed_chunk(self, chunk, lineno):
+        stats = self.stats
+        total, fuzzy, entries = scan_translations(chunk, lineno)
+        for _, status in entries:
+            stats[_STATUS_FIELDS[status]] += 1
+        stats["fuzzy"] += fuzzy
+        stats["translated"] += total - fuzzy - len(entries)
+        stats["obsolete"] += chunk.count(b"\n#~ msgid ") + chunk.startswith(
+            b"#~ msgid "
+        )
+        stats["lines"] += chunk.count(b"\n")
+        self._unterminated_line = not chunk.endswith(b"\n")
+
+    def finish(self):
+        stats = self.stats
+        if self._unterminated_line:
+            stats["lines"] += 1
+        stats["total"] = (
+            stats["translated"]
+            + stats["fuzzy"]
+            + stats["partially_translated"]
+            + stats["untranslated"]
+        )
+        stats["bytes"] = os.path.getsize(self.filename)
+
+
+def _file_stats(filename):
+    (check,) = check_file(filename, [(StatsCheck, {})])
+    return check.stats
+
+
+def catalogs_stats(filenames, jobs=1):
+    """Compute the statistics of a set of PO files.
+
+    Parameters
+    ----------
+
+    filenames : list
+      Set of file names to inspect.
+
+    jobs : int, optional
+      Number of processes used to inspect the files in parallel. If
+      ``None``, the number of CPUs available.
+
+    Returns
+    -------
+
+    list: Dictionaries with the fields defined in ``STATS_FIELDS`` for each
+      file, in the same order of ``filenames``.
+    """
+    return map_files(_file_stats, filenames, jobs=jobs)
+
+
+def write_stats(stats, f, format="jsonl"):
+    """Write statistics returned by :py:func:`catalogs_stats` to a file.
+
+    Parameters
+    ----------
+
+    stats : list
+      Statistics of each file.
+
+    f : file
+      Opened text file in which the statistics will be written.
+
+    format : str, optional
+      Either ``"jsonl"``, one JSON object per line, or ``"csv"``, with a
+      header row.
+    """
+    if format == "csv":
+        import csv
+
+        writer = csv.DictWriter(f, fieldnames=STATS_FIELDS, lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(stats)
+    elif format == "jsonl":
+        import json
+
+        for file_stats in stats:
+            f.write(json.dumps(file_stats))
+            f.write("\n")
+    else:
+        raise ValueError(f"Invalid statistics format '{format}'")
+
+
+def main():
+    exitcode = forward_to_daemon("po_stats")
+    if exitcode is not None:
+        return exitcode
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("filenames", nargs="*", help="Filenames to inspect")
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=FORMATS,
+        default="jsonl",
+        dest="format",
+        help="Output format. By default, 'jsonl'.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        metavar="PATH",
+        default=None,
+        dest="output",
+        help="File in which the statistics will be written. By default, stdout.",
+    )
+    add_jobs_argument(parser)
+    add_instrumentation_arguments(parser)
+    args = parser.parse_args()
+
+    with instrument(args, parser.prog):
+        stats = catalogs_stats(args.filenames, jobs=args.jobs)
+        if args.output is None:
+            write_stats(stats, sys.stdout, format=args.format)
+        else:
+            with open(args.output, "w", newline="") as f:
+                write_stats(stats, f, format=args.format)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -4,10 +4,125 @@ Returns an error code if a PO file has an untranslated message.
 """
 
 import argparse
-import sys
 
+from pre_commit_po_hooks.checks import (
+    Check,
+    add_cache_arguments,
+    add_diff_base_argument,
+    add_fail_fast_argument,
+    add_jobs_argument,
+    add_max_reports_argument,
+    cache_dir_from_args,
+    diff_base_from_args,
+    run_checks,
+)
+from pre_commit_po_hooks.daemon import forward_to_daemon
+from pre_commit_po_hooks.instrumentation import (
+    add_instrumentation_arguments,
+    instrument,
+)
+from pre_commit_po_hooks.po import (
+    ENTRY_FUZZY,
+    ENTRY_HEADER,
+    ENTRY_OBSOLETE,
+    ENTRY_TRANSLATED,
+    ENTRY_UNTRANSLATED,
+    scan_translations,
+)
+
+
+class UntranslatedMessagesCheck(Check):
+    """Reports untranslated entries of a PO file or, if ``min_`` is defined,
+    if the file has less translated messages than required.
+
+    Plural entries with only some of their forms translated are reported as
+    partially translated and are not counted as translated. Fuzzy entries
+    with a translation are counted as translated.
+    """
 
-def check_untranslated_messages(filenames, min_=None, quiet=False):
+    name = "untranslated-messages"
+
+    def __init__(
+        self, filename, min_=None, quiet=False, fail_fast=False, max_reports=None
+    ):
+        super().__init__(
+            filename, quiet=quiet, fail_fast=fail_fast, max_reports=max_reports
+        )
+        self.min_ = min_
+        # the minimum depends on all the entries of the file
+        self.diffable = min_ is None
+        self.untranslated_messages = 0
+        self.total_messages = 0
+
+    def _report_untranslated(self, status, msgstr_lineno):
+        self.untranslated_messages += 1
+        if self.min_ is None:
+            if status == ENTRY_UNTRANSLATED:
+                message = "Untranslated message"
+            else:
+                message = "Partially translated message"
+            self.report(
+                f"{message} at {self.filename}:{msgstr_lineno}",
+                lineno=msgstr_lineno,
+            )
+
+    def feed_entry(self, entry):
+        status = entry.status
+        if status == ENTRY_OBSOLETE or status == ENTRY_HEADER:
+            return
+        self.total_messages += 1
+        if status != ENTRY_TRANSLATED and status != ENTRY_FUZZY:
+            self._report_untranslated(status, entry.msgstr_lineno)
+
+    def feed_chunk(self, chunk, lineno):
+        total, _, entries = scan_translations(chunk, lineno)
+        self.total_messages += total
+        for msgstr_lineno, status in entries:
+            self._report_untranslated(status, msgstr_lineno)
+            if self.done:
+                break
+
+    def finish(self):
+        if self.min_ is None:
+            return
+
+        min_string = str(self.min_)
+        _is_percent = False
+        if min_string[-1] == "%":
+            min_float = self.total_messages / 100 * float(min_string[:-1])
+            _is_percent = True
+        else:
+            min_float = float(min_string)
+
+        translated_messages = self.total_messages - self.untranslated_messages
+        if min_float > translated_messages:
+            if _is_percent:
+                translation_percent = (
+                    translated_messages / max(1, self.total_messages) * 100
+                )
+                self.report(
+                    "Lower percent of translation"
+                    f" ({round(translation_percent, 3)}) than minimum"
+                    f" required ({min_string}) at file {self.filename}"
+                )
+            else:
+                self.report(
+                    "Lower number of messages translated"
+                    f" ({translated_messages}) than required"
+                    f" ({min_string}) at file {self.filename}"
+                )
+
+
+def check_untranslated_messages(
+    filenames,
+    min_=None,
+    quiet=False,
+    jobs=1,
+    cache_dir=None,
+    fail_fast=False,
+    diff_base=None,
+    max_reports=None,
+):
     """Warns about all unstranslated messages found in a set of PO files.
 
     Parameters
@@ -19,70 +134,58 @@ def check_untranslated_messages(filenames, min_=None, quiet=False):
     quiet : bool, optional
       Enabled, don't print output to stderr when an untranslated message is found.
 
-    Returns
-    -------
-
-    int: 0 if no untranslated messages found, 1 otherwise.
-    """
-    min_string = str(min_ if min_ is not None else 0)
-
-    exitcode = 0
-    for filename in filenames:
-        with open(filename) as f:
-            content_lines = f.readlines()
+    jobs : int, optional
+      Number of processes used to check the files in parallel. If ``None``,
+      the number of CPUs available.
 
-        if len(content_lines) > 4:  # skip first empty message
-            content_lines = content_lines[4:]
+    cache_dir : str, optional
+      Directory in which the results are cached, so unchanged files are not
+      checked again. If ``None``, the cache is not used.
 
-        untranslated_messages, total_messages = 0, -1
+    fail_fast : bool, optional
+      Enabled, stop at the first untranslated message found, without checking
+      the rest of the files. Implied by ``quiet``.
 
-        for i, line in enumerate(content_lines):
-            next_i = i + 1
+    diff_base : str, optional
+      Git revision. If defined, only the messages changed since it are
+      checked. Files not tracked in the revision are checked entirely.
+      Ignored if ``min_`` is defined.
 
-            if line.startswith('msgid "'):
-                total_messages += 1
+    max_reports : int, optional
+      Maximum number of untranslated messages reported for each file. The rest
+      are summarized in a single line.
 
-            if line.startswith('msgstr ""') and (
-                next_i == len(content_lines) or (not content_lines[next_i].strip())
-            ):
-                exitcode = 1
-                untranslated_messages += 1
-                if not quiet and min_ is None:
-                    sys.stderr.write(f"Untranslated message at {filename}:{i + 5}\n")
+    Returns
+    -------
 
-        if min_ is not None:
-            _is_percent = False
-            if min_string[-1] == "%":
-                min_float = total_messages / 100 * float(min_string[:-1])
-                _is_percent = True
-            else:
-                min_float = float(min)
-
-            translated_messages = total_messages - untranslated_messages
-            if min_float > translated_messages:
-                exitcode = 1
-                if not quiet:
-                    if _is_percent:
-                        translation_percent = max(
-                            100,
-                            translated_messages / max(1, total_messages) * 100,
-                        )
-                        sys.stderr.write(
-                            "Lower percent of translation"
-                            f" ({round(translation_percent, 3)}) than minimum"
-                            f" required ({min_string}) at file {filename}\n"
-                        )
-                    else:
-                        sys.stderr.write(
-                            "Lower number of messages translated"
-                            f" ({translated_messages}) than required"
-                            f" ({min_string}) at file {filename}\n"
-                        )
-
-    return exitcode
+    int: 0 if no untranslated messages found, 1 otherwise.
+    """
+    fail_fast = fail_fast or quiet
+    return run_checks(
+        filenames,
+        [
+            (
+                UntranslatedMessagesCheck,
+                {
+                    "min_": min_,
+                    "quiet": quiet,
+                    "fail_fast": fail_fast,
+                    "max_reports": max_reports,
+                },
+            )
+        ],
+        jobs=jobs,
+        cache_dir=cache_dir,
+        fail_fast=fail_fast,
+        diff_base=diff_base,
+    )
 
 
 def main():
+    exitcode = forward_to_daemon("untranslated_messages")
+    if exitcode is not None:
+        return exitcode
+
     parser = argparse.ArgumentParser()
     parser.add_argument(
         "filenames", nargs="*", help="Filenames to check for untranslated messages"
@@ -103,12 +206,24 @@ def main():
         ),
     )
     parser.add_argument("-q", "--quiet", action="store_true", help="Supress output")
+    add_jobs_argument(parser)
+    add_cache_arguments(parser)
+    add_fail_fast_argument(parser)
+    add_diff_base_argument(parser)
+    add_max_reports_argument(parser)
+    add_instrumentation_arguments(parser)
     args = parser.parse_args()
-    return check_untranslated_messages(
-        args.filenames,
-        min_=args.min,
-        quiet=args.quiet,
-    )
+    with instrument(args, parser.prog):
+        return check_untranslated_messages(
+            args.filenames,
+            min_=args.min,
+            quiet=args.quiet,
+            jobs=args.jobs,
+            cache_dir=cache_dir_from_args(args),
+            fail_fast=args.fail_fast,
+            diff_base=diff_base_from_args(args),
+            max_reports=args.max_reports,
+        )
 
 
 if __name__ == "__main__":
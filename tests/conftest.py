@@ -0,0 +1,13 @@
+"""Configuration shared by all the tests."""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_environment(tmp_path, monkeypatch):
+    """Execute the commands in the test process, not in a daemon that could
+    be running, using a cache directory inside the temporary directory of
+    the test instead of the user one.
+    """
+    monkeypatch.setenv("PRE_COMMIT_PO_HOOKS_NO_DAEMON", "1")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
@@ -0,0 +1,112 @@
+"""Tests for the cache of checks results."""
+
+import contextlib
+import io
+import os
+
+from pre_commit_po_hooks import checks as checks_module
+from pre_commit_po_hooks.cache import MemoryResultsCache, ResultsCache
+from pre_commit_po_hooks.checks import use_memory_cache
+from pre_commit_po_hooks.fuzzy_messages import FuzzyMessagesCheck, check_fuzzy_messages
+from pre_commit_po_hooks.obsolete_messages import ObsoleteMessagesCheck
+
+
+FUZZY_CONTENT = '#\nmsgid ""\nmsgstr ""\n\n#, fuzzy\nmsgid "Foo"\nmsgstr "Bar"\n'
+
+
+def _check_fuzzy_messages(filenames, cache_dir):
+    stderr = io.StringIO()
+    with contextlib.redirect_stderr(stderr):
+        exitcode = check_fuzzy_messages(filenames, cache_dir=cache_dir)
+    return exitcode, stderr.getvalue()
+
+
+def test_cached_results_are_replayed(tmp_path, monkeypatch):
+    filename = tmp_path / "es.po"
+    filename.write_text(FUZZY_CONTENT)
+    cache_dir = tmp_path / "cache"
+
+    expected_result = (1, f"Found fuzzy message at {filename}:5\n")
+    assert _check_fuzzy_messages([filename], cache_dir) == expected_result
+    assert len(os.listdir(cache_dir)) == 1
+
+    def _check_file(*args, **kwargs):
+        raise AssertionError("File checked instead of using the cache")
+
+    with monkeypatch.context() as m:
+        m.setattr(checks_module, "check_file", _check_file)
+        assert _check_fuzzy_messages([filename], cache_dir) == expected_result
+
+    # changing the content invalidates the result
+    filename.write_text(FUZZY_CONTENT.replace("#, fuzzy\n", ""))
+    assert _check_fuzzy_messages([filename], cache_dir) == (0, "")
+    assert len(os.listdir(cache_dir)) == 2
+
+
+def test_cache_key(tmp_path):
+    filename = tmp_path / "es.po"
+    filename.write_text(FUZZY_CONTENT)
+    cache = ResultsCache(str(tmp_path / "cache"))
+
+    key = cache.key(filename, [(FuzzyMessagesCheck, {"quiet": False})])
+    assert key == cache.key(filename, [(FuzzyMessagesCheck, {"quiet": False})])
+    assert key != cache.key(filename, [(FuzzyMessagesCheck, {"quiet": True})])
+    assert key != cache.key(filename, [(ObsoleteMessagesCheck, {"quiet": False})])
+
+
+def test_cache_eviction(tmp_path):
+    cache = ResultsCache(str(tmp_path / "cache"), max_size=150)
+    for i in range(10):
+        cache.set(f"{i:02d}", (1, "x" * 40))
+        path = os.path.join(cache.directory, f"{i:02d}.json")
+        os.utime(path, (i, i))
+
+    # recently used results are kept
+    assert cache.get("00") == (1, "x" * 40)
+
+    cache.evict()
+    assert sorted(os.listdir(cache.directory)) == ["00.json", "09.json"]
+
+
+def test_memory_cache(tmp_path, monkeypatch):
+    filename = tmp_path / "es.po"
+    filename.write_text(FUZZY_CONTENT)
+    cache_dir = tmp_path / "cache"
+
+    memory_cache = MemoryResultsCache(max_entries=1)
+    expected_result = (1, f"Found fuzzy message at {filename}:5\n")
+    with use_memory_cache(memory_cache):
+        assert _check_fuzzy_messages([filename], cache_dir) == expected_result
+
+        # keyed by modification time and size, the file is not read
+        def fail(*args, **kwargs):
+            raise AssertionError("file checked")
+
+        monkeypatch.setattr(checks_module, "map_files", fail)
+        monkeypatch.setattr(ResultsCache, "key", fail)
+        assert _check_fuzzy_messages([filename], cache_dir) == expected_result
+        monkeypatch.undo()
+
+        # without cache, the memory cache is not used
+        assert _check_fuzzy_messages([filename], None) == expected_result
+
+        other_filename = tmp_path / "fr.po"
+        other_filename.write_text(FUZZY_CONTENT)
+        _check_fuzzy_messages([other_filename], cache_dir)
+    assert len(memory_cache._results) == 1
+
+
+def test_memory_cache_key_includes_filename_as_given(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "es.po").write_text(FUZZY_CONTENT)
+    absolute_filename = str(tmp_path / "es.po")
+
+    with use_memory_cache(MemoryResultsCache()):
+        assert _check_fuzzy_messages(["es.po"], "cache") == (
+            1,
+            "Found fuzzy message at es.po:5\n",
+        )
+        assert _check_fuzzy_messages([absolute_filename], "cache") == (
+            1,
+            f"Found fuzzy message at {absolute_filename}:5\n",
+        )
@@ -1,4 +1,4 @@
-"""Tests for 'max_lines' and 'max_messages' hooks."""
+"""Tests for 'max_lines', 'max_messages' and 'no-duplicates' hooks."""
 
 import contextlib
 import io
@@ -7,6 +7,7 @@ import tempfile
 import pytest
 
 from pre_commit_po_hooks.check_entries import (
+    check_duplicate_messages,
     maximum_number_of_lines,
     maximum_number_of_messages,
 )
@@ -101,3 +102,75 @@ def test_expected_number_of_lines(
                 == expected_exitcode
             )
         assert stderr.getvalue() == expected_stderr
+
+
+DUPLICATES_CONTENT = """#
+msgid ""
+msgstr ""
+
+msgid "Hello"
+msgstr "Hola"
+
+msgctxt "greeting"
+msgid "Hello"
+msgstr "Hola"
+
+msgctxt ""
+msgid "Hello"
+msgstr "Hola"
+
+msgid ""
+"Hel"
+"lo"
+msgstr "Hola de nuevo"
+
+#~ msgid "Hello"
+#~ msgstr "Hola"
+
+msgctxt "greeting"
+msgid "Hello"
+msgstr "Buenas"
+
+msgid "Hello"
+msgid_plural "Hellos"
+msgstr[0] "Hola"
+msgstr[1] "Holas"
+"""
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "expected_exitcode", "expected_linenos"),
+    (
+        ({}, 1, [(16, 5), (25, 9), (28, 5)]),
+        ({"max_reports": 1}, 1, [(16, 5)]),
+        ({"quiet": True}, 1, []),
+    ),
+    ids=("default", "max_reports=1", "quiet"),
+)
+def test_check_duplicate_messages(
+    kwargs, expected_exitcode, expected_linenos, tmp_path, monkeypatch
+):
+    monkeypatch.chdir(tmp_path)
+    with open("es.po", "w") as f:
+        f.write(DUPLICATES_CONTENT)
+
+    stderr = io.StringIO()
+    with contextlib.redirect_stderr(stderr):
+        assert check_duplicate_messages(["es.po"], **kwargs) == expected_exitcode
+
+    expected_lines = [
+        f"Duplicate message at es.po:{lineno}, first defined at es.po:{first_lineno}"
+        for lineno, first_lineno in expected_linenos
+    ]
+    if kwargs.get("max_reports"):
+        expected_lines.append("... and 2 more duplicate-messages errors at es.po")
+    assert stderr.getvalue().splitlines() == expected_lines
+
+
+def test_check_duplicate_messages_pass(tmp_path):
+    filename = tmp_path / "es.po"
+    filename.write_text(
+        '#\nmsgid ""\nmsgstr ""\n\nmsgid "Hello"\nmsgstr "Hola"\n\n'
+        '#~ msgid "Hello"\n#~ msgstr "Hola"\n'
+    )
+    assert check_duplicate_messages([filename]) == 0
@@ -3,11 +3,18 @@
 import contextlib
 import io
 import os
+import sys
 import uuid
 
 import pytest
 
-from pre_commit_po_hooks.check_metadata import check_metadata
+from pre_commit_po_hooks.check_metadata import (
+    HeaderSpec,
+    MetadataCheck,
+    check_metadata,
+    main as check_metadata_main,
+)
+from pre_commit_po_hooks.checks import check_file
 
 
 @pytest.mark.parametrize("quiet", (False, True), ids=("quiet=False", "quiet=True"))
@@ -109,3 +116,129 @@ def test_check_obsolete_messages(
 
     for filename in filenames:
         os.remove(filename)
+
+
+def test_check_metadata_multiline_values(tmp_path):
+    filename = tmp_path / "es.po"
+    filename.write_text(
+        '#\nmsgid ""\nmsgstr ""\n"Project-Id-Version: 1.0\\n"\n'
+        '"Content-Type: text/plain; "\n"charset=UTF-8\\n"\n'
+        '"Language: es\\nPlural-Forms: nplurals=2; plural=(n != 1);"\n'
+    )
+
+    stderr = io.StringIO()
+    with contextlib.redirect_stderr(stderr):
+        exitcode = check_metadata(
+            [filename],
+            {
+                "Content-Type": r"text/plain; charset=UTF-8$",
+                "Language": r"fr",
+                "Plural-Forms": r"nplurals=2;",
+            },
+        )
+    assert exitcode == 1
+    assert stderr.getvalue() == (
+        f"Wrong metadata value at {filename}:7 (regex 'fr' not matching for"
+        " value 'es' in header 'Language')\n"
+    )
+
+
+def test_check_metadata_stops_reading_after_header(tmp_path):
+    filename = tmp_path / "es.po"
+    filename.write_bytes(
+        b'#\nmsgid ""\nmsgstr ""\n"Language: es\\n"\n\n'
+        + b'msgid "Foo"\nmsgstr "Foo"\n\n' * 10000
+        # not decodable, raises an error if the file is read until here
+        + b'msgid "\xff\xfe"\nmsgstr ""\n'
+    )
+
+    (check,) = check_file(filename, [(MetadataCheck, {"headers_spec": {}})])
+    assert check.done
+    assert check.metadata == [(4, "Language: es\\n")]
+
+
+def test_check_metadata_cli_stops_reading_after_header(tmp_path, monkeypatch, capsys):
+    filename = tmp_path / "es.po"
+    filename.write_bytes(
+        b'#\nmsgid ""\nmsgstr ""\n"Language: es\\n"\n\n'
+        + b'msgid "Foo"\nmsgstr "Foo"\n\n' * 10000
+        # not decodable nor hashed by the results cache, which would read
+        # the whole file
+        + b'msgid "\xff\xfe"\nmsgstr ""\n'
+    )
+    monkeypatch.setattr(
+        "pre_commit_po_hooks.cache.ResultsCache.key",
+        lambda *args: pytest.fail("the results cache read the file"),
+    )
+
+    # with the default cache
+    monkeypatch.setattr(
+        sys, "argv", ["check-po-metadata-hook", "--no-metadata", str(filename)]
+    )
+    assert check_metadata_main() == 1
+    assert capsys.readouterr().err.splitlines() == [
+        f"Found unexpected metadata at {filename}:4",
+    ]
+    assert not (tmp_path / "cache").exists()
+
+
+@pytest.mark.parametrize("newline", ("\n", "\r\n"), ids=("lf", "crlf"))
+def test_check_metadata_remove_metadata(newline, tmp_path):
+    filename = tmp_path / "es.po"
+    content = newline.join(
+        (
+            "#",
+            'msgid ""',
+            'msgstr ""',
+            '"Project-Id-Version: 1.0\\n"',
+            '"Language: es\\n"',
+            "",
+            'msgid "Foo"',
+            'msgstr "Foo"',
+            "",
+        )
+    )
+    filename.write_bytes(content.encode())
+
+    assert check_metadata([filename], {}, no_metadata=True, remove_metadata=True) == 1
+    assert (
+        filename.read_bytes()
+        == newline.join(
+            ("#", 'msgid ""', 'msgstr ""', "", 'msgid "Foo"', 'msgstr "Foo"', "")
+        ).encode()
+    )
+    assert os.listdir(tmp_path) == ["es.po"]
+
+
+def test_check_metadata_remove_metadata_is_atomic(tmp_path, monkeypatch):
+    filename = tmp_path / "es.po"
+    content = '#\nmsgid ""\nmsgstr ""\n"Language: es\\n"\n\nmsgid "Foo"\nmsgstr ""\n'
+    filename.write_text(content)
+
+    def copyfileobj(*args, **kwargs):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr("shutil.copyfileobj", copyfileobj)
+    with pytest.raises(KeyboardInterrupt):
+        check_metadata([filename], {}, no_metadata=True, remove_metadata=True)
+
+    assert filename.read_text() == content
+    assert os.listdir(tmp_path) == ["es.po"]
+
+
+def test_header_spec():
+    header_spec = HeaderSpec({"Language": r"\w\w$", "Language-Team": r".+<.+>"})
+    assert repr(header_spec) == (
+        "HeaderSpec({'Language': '\\\\w\\\\w$', 'Language-Team': '.+<.+>'})"
+    )
+
+    wrong_headers, missing_headers = header_spec.validate(
+        [(4, "Project-Id-Version", "1.0"), (5, "Language", "es_ES")]
+    )
+    assert [header[:3] for header in wrong_headers] == [(5, "Language", "es_ES")]
+    assert missing_headers == ["Language-Team"]
+
+    assert header_spec.validate({"Language": "es", "Language-Team": "Es <a@b.c>"}) == (
+        [],
+        [],
+    )
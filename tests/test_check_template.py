@@ -0,0 +1,164 @@
+"""Tests for 'check-po-template' hook."""
+
+import contextlib
+import io
+import pickle
+import sys
+
+import pytest
+
+from pre_commit_po_hooks.check_template import (
+    TemplateIndex,
+    check_template,
+    main as check_template_main,
+)
+
+
+TEMPLATE_CONTENT = """#, fuzzy
+msgid ""
+msgstr ""
+"Content-Type: text/plain; charset=UTF-8\\n"
+
+#: a.py:1
+msgid "Hello"
+msgstr ""
+
+#: a.py:2
+msgctxt "month"
+msgid "May"
+msgstr ""
+
+#: a.py:3
+msgid "Apple"
+msgid_plural "Apples"
+msgstr[0] ""
+msgstr[1] ""
+
+#~ msgid "Obsolete"
+#~ msgstr ""
+"""
+
+SYNCED_CONTENT = """#
+msgid ""
+msgstr ""
+"Language: es\\n"
+
+msgid "Apple"
+msgid_plural "Apples"
+msgstr[0] "Manzana"
+msgstr[1] "Manzanas"
+
+msgid "Hello"
+msgstr "Hola"
+
+msgctxt "month"
+msgid "May"
+msgstr "Mayo"
+
+#~ msgid "Old"
+#~ msgstr "Viejo"
+"""
+
+# 'May' without context and 'Bye' are not in the template, 'Apple' is missing
+OUTDATED_CONTENT = """#
+msgid ""
+msgstr ""
+
+msgid "Hello"
+msgstr "Hola"
+
+msgid "May"
+msgstr "Puede"
+
+msgid "Bye"
+msgstr "Adiós"
+"""
+
+
+@pytest.fixture
+def locale_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "messages.pot").write_text(TEMPLATE_CONTENT)
+    (tmp_path / "es.po").write_text(SYNCED_CONTENT)
+    (tmp_path / "fr.po").write_text(OUTDATED_CONTENT)
+    return tmp_path
+
+
+def test_template_index(locale_dir):
+    template = TemplateIndex("messages.pot")
+    assert sorted(template.linenos.values()) == [7, 12, 16]
+
+    # sent to the processes checking files in parallel
+    unpickled = pickle.loads(pickle.dumps(template))
+    assert unpickled.linenos == template.linenos
+    assert repr(unpickled) == repr(template)
+
+    # the signature of the results changes with the messages of the template
+    (locale_dir / "messages.pot").write_text(
+        TEMPLATE_CONTENT.replace('"Hello"', '"Hi"')
+    )
+    assert repr(TemplateIndex("messages.pot")) != repr(template)
+
+
+@pytest.mark.parametrize("jobs", (1, 2), ids=("jobs=1", "jobs=2"))
+@pytest.mark.parametrize(
+    ("filenames", "kwargs", "expected_exitcode", "expected_lines"),
+    (
+        pytest.param(["es.po", "messages.pot"], {}, 0, [], id="synced"),
+        pytest.param(
+            ["es.po", "fr.po"],
+            {},
+            1,
+            [
+                "Message at fr.po:8 not found in template messages.pot",
+                "Message at fr.po:11 not found in template messages.pot",
+                "Message of template messages.pot:12 not found at file fr.po",
+                "Message of template messages.pot:16 not found at file fr.po",
+            ],
+            id="outdated",
+        ),
+        pytest.param(
+            ["fr.po"],
+            {"max_reports": 1},
+            1,
+            [
+                "Message at fr.po:8 not found in template messages.pot",
+                "... and 3 more check-template errors at fr.po",
+            ],
+            id="max_reports=1",
+        ),
+        pytest.param(["fr.po"], {"quiet": True}, 1, [], id="quiet"),
+    ),
+)
+def test_check_template(
+    filenames, kwargs, expected_exitcode, expected_lines, jobs, locale_dir
+):
+    stderr = io.StringIO()
+    with contextlib.redirect_stderr(stderr):
+        exitcode = check_template(filenames, "messages.pot", jobs=jobs, **kwargs)
+    assert exitcode == expected_exitcode
+    assert stderr.getvalue().splitlines() == expected_lines
+
+
+def test_check_template_cli(locale_dir, monkeypatch, capsys):
+    monkeypatch.setattr(
+        sys, "argv", ["check-po-template-hook", "--pot", "messages.pot", "es.po"]
+    )
+    assert check_template_main() == 0
+
+    # cached results depend on the template
+    (locale_dir / "messages.pot").write_text(
+        TEMPLATE_CONTENT.replace('"Hello"', '"Hi"')
+    )
+    assert check_template_main() == 1
+    assert capsys.readouterr().err.splitlines() == [
+        "Message at es.po:11 not found in template messages.pot",
+        "Message of template messages.pot:7 not found at file es.po",
+    ]
+
+    monkeypatch.setattr(
+        sys, "argv", ["check-po-template-hook", "--pot", "unknown.pot", "es.po"]
+    )
+    with pytest.raises(SystemExit):
+        check_template_main()
+    assert "can't read the template 'unknown.pot'" in capsys.readouterr().err
@@ -0,0 +1,362 @@
+"""Tests for the execution of checks over multiple files."""
+
+import contextlib
+import functools
+import io
+import os
+
+import pytest
+
+from pre_commit_po_hooks.check_entries import MaxLinesCheck, MaxMessagesCheck
+from pre_commit_po_hooks.check_metadata import MetadataCheck
+from pre_commit_po_hooks.checks import (
+    Check,
+    Diagnostic,
+    check_file,
+    check_source,
+    map_files,
+    run_checks,
+)
+from pre_commit_po_hooks.fuzzy_messages import FuzzyMessagesCheck
+from pre_commit_po_hooks.obsolete_messages import ObsoleteMessagesCheck
+from pre_commit_po_hooks.po import CHUNK_SIZE, iter_chunks
+from pre_commit_po_hooks.po_stats import StatsCheck
+from pre_commit_po_hooks.untranslated_messages import UntranslatedMessagesCheck
+
+
+@pytest.mark.parametrize("jobs", (1, 3, None), ids=("jobs=1", "jobs=3", "jobs=None"))
+def test_map_files_preserves_order(jobs, tmp_path):
+    filenames = []
+    for i, size in enumerate((10, 1000, 1, 100)):
+        filename = tmp_path / f"{i}.po"
+        filename.write_text("#" * size)
+        filenames.append(filename)
+
+    assert map_files(str, filenames, jobs=jobs) == [str(f) for f in filenames]
+
+
+def _pid(filename):
+    return os.getpid()
+
+
+@pytest.mark.parametrize(
+    ("parallel_min_bytes", "expected_in_process"),
+    ((1024 * 1024, True), (1, os.cpu_count() == 1)),
+    ids=("small", "large"),
+)
+def test_map_files_default_jobs(
+    parallel_min_bytes, expected_in_process, tmp_path, monkeypatch
+):
+    filenames = []
+    for i in range(3):
+        filename = tmp_path / f"{i}.po"
+        filename.write_text("#" * 100)
+        filenames.append(filename)
+
+    monkeypatch.setattr(
+        "pre_commit_po_hooks.checks.PARALLEL_MIN_BYTES", parallel_min_bytes
+    )
+    pids = map_files(_pid, filenames, jobs=None)
+    assert (pids == [os.getpid()] * len(filenames)) is expected_in_process
+
+
+def test_run_checks_parallel_output_is_deterministic(tmp_path):
+    filenames = []
+    for i in range(6):
+        filename = tmp_path / f"{i}.po"
+        filename.write_text(
+            '#\nmsgid ""\nmsgstr ""\n\n'
+            + '#, fuzzy\nmsgid "Foo"\nmsgstr "Foo"\n\n' * i
+            + '#~ msgid "Bar"\n#~ msgstr "Bar"\n'
+        )
+        filenames.append(filename)
+    checks = [(FuzzyMessagesCheck, {}), (ObsoleteMessagesCheck, {})]
+
+    outputs = []
+    for jobs in (1, 4):
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            assert run_checks(filenames, checks, jobs=jobs) == 1
+        outputs.append(stderr.getvalue())
+
+    assert outputs[0] == outputs[1]
+    assert outputs[0].splitlines()[-1] == (
+        f"Found obsolete message at {filenames[-1]}:25"
+    )
+
+
+@pytest.mark.parametrize("jobs", (1, 2), ids=("jobs=1", "jobs=2"))
+def test_run_checks_fail_fast(jobs, tmp_path):
+    filenames = []
+    for i in range(4):
+        filename = tmp_path / f"{i}.po"
+        filename.write_text('#, fuzzy\nmsgid "Foo"\nmsgstr "Foo"\n\n' * 3)
+        filenames.append(filename)
+
+    stderr = io.StringIO()
+    with contextlib.redirect_stderr(stderr):
+        assert (
+            run_checks(
+                filenames,
+                [(FuzzyMessagesCheck, {"fail_fast": True})],
+                jobs=jobs,
+                fail_fast=True,
+            )
+            == 1
+        )
+
+    stderr_lines = stderr.getvalue().splitlines()
+    assert 1 <= len(stderr_lines) <= jobs
+    assert stderr_lines[0].endswith(":1")
+
+
+def test_check_file_stops_reading_when_checks_are_done(tmp_path, monkeypatch):
+    filename = tmp_path / "es.po"
+    filename.write_text(
+        'msgid "Foo"\nmsgstr ""\n\n' + 'msgid "Bar"\nmsgstr "Bar"\n\n' * 100
+    )
+    # a chunk for each entry
+    monkeypatch.setattr(
+        "pre_commit_po_hooks.checks.iter_chunks",
+        functools.partial(iter_chunks, chunk_size=16),
+    )
+
+    untranslated_check, max_lines_check = check_file(
+        filename,
+        [
+            (UntranslatedMessagesCheck, {"fail_fast": True}),
+            (MaxLinesCheck, {"max_lines": 4, "fail_fast": True}),
+        ],
+    )
+    assert untranslated_check.messages == [f"Untranslated message at {filename}:2\n"]
+    assert max_lines_check.messages == [
+        f"More lines than allowed (4) at file {filename}\n"
+    ]
+    assert max_lines_check.number_of_lines == 6
+
+
+@pytest.mark.parametrize("fail_fast", (False, True), ids=("", "fail_fast"))
+@pytest.mark.parametrize(
+    "content",
+    (
+        (
+            '#\nmsgid ""\nmsgstr ""\n"Language: es\\n"\n\n'
+            '#, python-format\n#, fuzzy\nmsgid "Foo"\nmsgstr "Foo"\n\n'
+            '#, fuzzy, python-format\nmsgid "Bar"\nmsgstr "Bar"\n\n'
+            '#, no-fuzzy-flag\nmsgid "fuzzy"\nmsgstr "fuzzy"\n\n'
+            'msgctxt "Context"\nmsgid ""\nmsgstr "Empty"\n\n'
+            '#, fuzzy\n#~ msgid "Baz"\n#~ msgstr "Baz"\n'
+            '#~ msgid "Qux"\n#~ msgstr "Qux"\n\n'
+            '#~ msgctxt "Context"\n#~ msgid "Qux"\n#~ msgstr "Qux"\n'
+        ),
+        (
+            'msgid ""\r\nmsgstr ""\r\n\r\n'
+            '#, fuzzy\r\nmsgid ""\r\n"Foo"\r\nmsgstr "Foo"\r\n\r\n'
+            '#~ msgid "Bar"\r\n#~ msgstr "Bar"'
+        ),
+        (
+            '#\nmsgid ""\nmsgstr ""\n"Language: es\\n"\n'
+            'msgid ""\n"Foo"\nmsgstr "Foo"\n'
+            '#, fuzzy\nmsgid ""\n"Bar"\nmsgstr ""\n"Bar"\n'
+            'msgctxt "Context"\nmsgid ""\n"Baz"\nmsgstr "Baz"\n'
+            '#, fuzzy\n#~ msgid ""\n#~ "Qux"\n#~ msgstr "Qux"\n'
+        ),
+        (
+            '#\nmsgid ""\nmsgstr ""\n"Language: es\\n"\n\n'
+            'msgid "Apple"\nmsgid_plural "Apples"\nmsgstr[0] "Manzana"\n'
+            'msgstr[1] ""\n\n'
+            'msgid "Pear"\nmsgid_plural "Pears"\nmsgstr[0] ""\nmsgstr[1] ""\n'
+            '#, fuzzy\nmsgid "Lemon"\nmsgstr ""\n"Limón"\n'
+            '#, fuzzy\nmsgid "Orange"\nmsgstr ""\n""\n\n'
+            '#, fuzzy\nmsgid "Plum"\nmsgid_plural "Plums"\nmsgstr[0] "Ciruela"\n'
+            'msgstr[1] ""\n\n'
+            '#, fuzzy\n#, c-format\nmsgid "Fig"\nmsgid_plural "Figs"\n'
+            'msgstr[0] ""\nmsgstr[1] ""\n\n'
+            '#~ msgid "Peach"\n#~ msgstr ""\n'
+            'msgctxt ""\n"Context"\nmsgid ""\nmsgstr ""\n'
+        ),
+        'msgid "Foo"\nmsgstr "Foo"\n',
+        "",
+    ),
+    ids=("lf", "crlf", "no-blank-lines", "translations", "clean", "empty"),
+)
+@pytest.mark.parametrize("chunk_size", (CHUNK_SIZE, 16, 1))
+def test_chunk_checks_match_token_checks(
+    content, chunk_size, fail_fast, tmp_path, monkeypatch
+):
+    filename = tmp_path / "es.po"
+    filename.write_bytes(content.encode())
+    monkeypatch.setattr(
+        "pre_commit_po_hooks.checks.iter_chunks",
+        functools.partial(iter_chunks, chunk_size=chunk_size),
+    )
+
+    checks = [
+        (FuzzyMessagesCheck, {"fail_fast": fail_fast}),
+        (ObsoleteMessagesCheck, {"fail_fast": fail_fast}),
+        (MaxMessagesCheck, {"max_messages": 1, "fail_fast": fail_fast}),
+        (MaxLinesCheck, {"max_lines": 3, "fail_fast": fail_fast}),
+        (UntranslatedMessagesCheck, {"fail_fast": fail_fast}),
+        (UntranslatedMessagesCheck, {"min_": "50%", "fail_fast": fail_fast}),
+    ]
+    for chunk_check, token_check in zip(
+        check_file(filename, checks),
+        # the base check doesn't support chunks, so the file is tokenized
+        check_file(filename, checks + [(Check, {})]),
+    ):
+        assert chunk_check.messages == token_check.messages
+        assert chunk_check.exitcode == token_check.exitcode
+
+
+@pytest.mark.parametrize(
+    ("content", "expected_number_of_lines"),
+    (
+        ("", 0),
+        ("\n", 1),
+        ('msgid "Foo"\nmsgstr "Foo"', 2),
+        ('msgid "Foo"\nmsgstr "Foo"\n\n' * 3, 9),
+    ),
+)
+def test_max_lines_chunks(content, expected_number_of_lines, tmp_path):
+    filename = tmp_path / "es.po"
+    filename.write_text(content)
+
+    (max_lines_check,) = check_file(filename, [(MaxLinesCheck, {})])
+    assert max_lines_check.number_of_lines == expected_number_of_lines
+
+
+SOURCE_CONTENT = (
+    '#\nmsgid ""\nmsgstr ""\n"Language: es\\n"\n\n'
+    '#, fuzzy\nmsgid "Hello"\nmsgstr "Hola"\n\n'
+    'msgid "World"\nmsgstr ""\n\n'
+    '#~ msgid "Obsolete"\n#~ msgstr "Obsoleto"\n'
+)
+
+
+@pytest.mark.parametrize(
+    "source_factory",
+    (
+        lambda: SOURCE_CONTENT,
+        lambda: SOURCE_CONTENT.encode(),
+        lambda: io.StringIO(SOURCE_CONTENT),
+        lambda: io.BytesIO(SOURCE_CONTENT.encode()),
+        lambda: SOURCE_CONTENT.splitlines(keepends=True),
+        lambda: iter(SOURCE_CONTENT.encode().splitlines(keepends=True)),
+    ),
+    ids=("str", "bytes", "text-file", "binary-file", "lines", "bytes-lines"),
+)
+@pytest.mark.parametrize("tokenize", (False, True), ids=("", "tokenize"))
+def test_check_source(source_factory, tokenize):
+    checks = [
+        (FuzzyMessagesCheck, {}),
+        (ObsoleteMessagesCheck, {}),
+        (MaxMessagesCheck, {"max_messages": 1}),
+    ]
+    if tokenize:
+        checks.append((UntranslatedMessagesCheck, {}))
+
+    expected_diagnostics = [
+        Diagnostic("es.po", 6, "fuzzy-messages", "Found fuzzy message at es.po:6"),
+        Diagnostic(
+            "es.po", 13, "obsolete-messages", "Found obsolete message at es.po:13"
+        ),
+        Diagnostic(
+            "es.po",
+            None,
+            "max-messages",
+            "More messages (2) than allowed (1) at file es.po",
+        ),
+    ]
+    if tokenize:
+        expected_diagnostics.append(
+            Diagnostic(
+                "es.po",
+                11,
+                "untranslated-messages",
+                "Untranslated message at es.po:11",
+            )
+        )
+    assert check_source(source_factory(), checks, filename="es.po") == (
+        expected_diagnostics
+    )
+
+
+def test_check_source_matches_check_file(tmp_path):
+    filename = tmp_path / "es.po"
+    filename.write_text(SOURCE_CONTENT)
+    checks = [(FuzzyMessagesCheck, {}), (UntranslatedMessagesCheck, {})]
+
+    assert check_source(SOURCE_CONTENT, checks, filename=filename) == [
+        diagnostic
+        for check in check_file(filename, checks)
+        for diagnostic in check.diagnostics
+    ]
+
+
+@pytest.mark.parametrize("tokenize", (False, True), ids=("", "tokenize"))
+@pytest.mark.parametrize(
+    ("max_reports", "expected_linenos", "expected_summary"),
+    (
+        (None, [1, 5, 9, 13, 17], []),
+        (2, [1, 5], ["... and 3 more fuzzy-messages errors at es.po\n"]),
+        (0, [], ["... and 5 more fuzzy-messages errors at es.po\n"]),
+    ),
+    ids=("max_reports=None", "max_reports=2", "max_reports=0"),
+)
+def test_max_reports(
+    max_reports, expected_linenos, expected_summary, tokenize, tmp_path, monkeypatch
+):
+    monkeypatch.chdir(tmp_path)
+    with open("es.po", "w") as f:
+        f.write('#, fuzzy\nmsgid "Foo"\nmsgstr "Foo"\n\n' * 5)
+    checks = [(FuzzyMessagesCheck, {"max_reports": max_reports})]
+    if tokenize:
+        checks.append((UntranslatedMessagesCheck, {}))
+
+    check = check_file("es.po", checks)[0]
+    assert check.exitcode == 1
+    assert [diagnostic.lineno for diagnostic in check.diagnostics] == (expected_linenos)
+    assert check.omitted == 5 - len(expected_linenos)
+    assert (
+        check.messages
+        == [f"Found fuzzy message at es.po:{lineno}\n" for lineno in expected_linenos]
+        + expected_summary
+    )
+
+
+def test_run_checks_max_reports(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    for filename in ("es.po", "fr.po"):
+        with open(filename, "w") as f:
+            f.write('msgid "Foo"\nmsgstr ""\n\n' * 1500)
+    checks = [(UntranslatedMessagesCheck, {"max_reports": 1})]
+
+    assert run_checks(["es.po", "fr.po"], checks) == 1
+    assert capsys.readouterr().err.splitlines() == [
+        "Untranslated message at es.po:2",
+        "... and 1,499 more untranslated-messages errors at es.po",
+        "Untranslated message at fr.po:2",
+        "... and 1,499 more untranslated-messages errors at fr.po",
+    ]
+
+
+@pytest.mark.parametrize(
+    "checks",
+    (
+        pytest.param([(StatsCheck, {})], id="stats"),
+        pytest.param(
+            [(FuzzyMessagesCheck, {}), (MetadataCheck, {"remove_metadata": True})],
+            id="remove-metadata",
+        ),
+    ),
+)
+def test_check_source_rejects_checks_needing_a_file(checks):
+    with pytest.raises(ValueError, match="needs a file"):
+        check_source(SOURCE_CONTENT, checks)
+
+
+def test_check_source_metadata_without_removing():
+    checks = [(MetadataCheck, {"headers_spec": {"Language": "fr"}})]
+    assert [
+        diagnostic.lineno for diagnostic in check_source(SOURCE_CONTENT, checks)
+    ] == [4]
@@ -0,0 +1,161 @@
+"""Tests for the daemon executing commands in a warm process."""
+
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+
+from pre_commit_po_hooks import __version__, fuzzy_messages
+from pre_commit_po_hooks.daemon import NO_DAEMON_ENV, SOCKET_ENV, _execute, stop
+from pre_commit_po_hooks.fuzzy_messages import main as fuzzy_messages_main
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FUZZY_CONTENT = '#\nmsgid ""\nmsgstr ""\n\n#, fuzzy\nmsgid "Hello"\nmsgstr "Hola"\n'
+
+# same size, but not fuzzy
+NOT_FUZZY_CONTENT = FUZZY_CONTENT.replace("fuzzy", "fuzzz")
+
+pytestmark = pytest.mark.skipif(os.name != "posix", reason="requires unix sockets")
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    socket_path = str(tmp_path / "daemon.sock")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "pre_commit_po_hooks.daemon", "--socket", socket_path],
+        cwd=ROOT_DIR,
+        env={**os.environ, "XDG_CACHE_HOME": str(tmp_path / "cache")},
+        stderr=subprocess.DEVNULL,
+    )
+    # listening once it accepts connections
+    for _ in range(500):
+        try:
+            with socket.socket(socket.AF_UNIX) as sock:
+                sock.connect(socket_path)
+        except OSError:
+            time.sleep(0.01)
+        else:
+            break
+    monkeypatch.setenv(SOCKET_ENV, socket_path)
+    monkeypatch.delenv(NO_DAEMON_ENV, raising=False)
+    try:
+        yield socket_path
+    finally:
+        if process.poll() is None:
+            stop(socket_path)
+            process.wait(timeout=10)
+
+
+def test_daemon_executes_commands(daemon, tmp_path, monkeypatch, capsys):
+    filename = tmp_path / "es.po"
+    filename.write_text(FUZZY_CONTENT)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "argv", ["fuzzy-messages-hook", "es.po"])
+
+    assert fuzzy_messages_main() == 1
+    assert capsys.readouterr().err == "Found fuzzy message at es.po:5\n"
+
+    # results are kept in memory by modification time and size, so a file
+    # changed keeping both is not checked again, as in the daemon
+    stat = os.stat(filename)
+    filename.write_text(NOT_FUZZY_CONTENT)
+    os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert fuzzy_messages_main() == 1
+    assert capsys.readouterr().err == "Found fuzzy message at es.po:5\n"
+
+    # executed in the current process
+    monkeypatch.setenv(NO_DAEMON_ENV, "1")
+    assert fuzzy_messages_main() == 0
+    assert capsys.readouterr().err == ""
+
+
+def test_daemon_uses_client_environment(daemon, tmp_path, monkeypatch, capsys):
+    (tmp_path / "es.po").write_text(FUZZY_CONTENT)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "client-cache"))
+    monkeypatch.setattr(sys, "argv", ["fuzzy-messages-hook", "es.po"])
+
+    assert fuzzy_messages_main() == 1
+    assert capsys.readouterr().err == "Found fuzzy message at es.po:5\n"
+    assert os.listdir(tmp_path / "client-cache" / "pre-commit-po-hooks")
+    assert not os.path.exists(tmp_path / "cache" / "pre-commit-po-hooks")
+
+
+def test_execute_applies_client_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv("PRE_COMMIT_PO_HOOKS_NO_DIFF_BASE", "1")
+    monkeypatch.delenv("PRE_COMMIT_PO_HOOKS_SOCKET", raising=False)
+    environments = []
+
+    def main():
+        environments.append(dict(os.environ))
+        return 0
+
+    monkeypatch.setattr(fuzzy_messages, "main", main)
+    response = _execute(
+        {
+            "command": "fuzzy_messages",
+            "argv": ["fuzzy-messages-hook"],
+            "cwd": str(tmp_path),
+            "env": {
+                "PRE_COMMIT_PO_HOOKS_SOCKET": "client.sock",
+                "XDG_CACHE_HOME": "client-cache",
+            },
+            "version": __version__,
+        }
+    )
+    assert response["exitcode"] == 0
+
+    # variables of the client are applied and those it doesn't define removed,
+    # except the one that prevents forwarding commands to the daemon itself
+    (environment,) = environments
+    assert environment["PRE_COMMIT_PO_HOOKS_SOCKET"] == "client.sock"
+    assert environment["XDG_CACHE_HOME"] == "client-cache"
+    assert "PRE_COMMIT_PO_HOOKS_NO_DIFF_BASE" not in environment
+    assert environment[NO_DAEMON_ENV] == "1"
+
+    # and restored after the command
+    assert os.environ["PRE_COMMIT_PO_HOOKS_NO_DIFF_BASE"] == "1"
+    assert "PRE_COMMIT_PO_HOOKS_SOCKET" not in os.environ
+    assert os.environ["XDG_CACHE_HOME"] == str(tmp_path / "cache")
+
+
+def test_daemon_usage_errors(daemon, monkeypatch, capsys):
+    monkeypatch.setattr(sys, "argv", ["fuzzy-messages-hook", "--unknown"])
+    assert fuzzy_messages_main() == 2
+    stderr = capsys.readouterr().err
+    assert stderr.startswith("usage: fuzzy-messages-hook")
+    assert "unrecognized arguments: --unknown" in stderr
+
+
+def test_daemon_stop(daemon, capsys):
+    assert stop(daemon) == 0
+    for _ in range(500):
+        if not os.path.exists(daemon):
+            break
+        time.sleep(0.01)
+    assert not os.path.exists(daemon)
+
+    assert stop(daemon) == 1
+    assert "not listening" in capsys.readouterr().err
+
+
+def test_fallback_without_daemon(tmp_path, monkeypatch, capsys):
+    filename = tmp_path / "es.po"
+    filename.write_text(FUZZY_CONTENT)
+
+    # stale socket file of a daemon not running
+    socket_path = tmp_path / "daemon.sock"
+    socket_path.write_text("")
+    monkeypatch.setenv(SOCKET_ENV, str(socket_path))
+    monkeypatch.delenv(NO_DAEMON_ENV)
+    monkeypatch.setattr(
+        sys, "argv", ["fuzzy-messages-hook", "--no-cache", str(filename)]
+    )
+
+    assert fuzzy_messages_main() == 1
+    assert capsys.readouterr().err == f"Found fuzzy message at {filename}:5\n"
@@ -0,0 +1,239 @@
+"""Tests for checking only the entries changed since a git revision."""
+
+import contextlib
+import io
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from pre_commit_po_hooks.diff import changed_entries
+from pre_commit_po_hooks.fuzzy_messages import (
+    check_fuzzy_messages,
+    main as fuzzy_messages_main,
+)
+from pre_commit_po_hooks.obsolete_messages import check_obsolete_messages
+from pre_commit_po_hooks.po_hooks import main as po_hooks_main
+from pre_commit_po_hooks.untranslated_messages import check_untranslated_messages
+
+
+BASE_CONTENT = """#
+msgid ""
+msgstr ""
+"Language: es\\n"
+
+#: a.py:1
+msgid "Hello"
+msgstr "Hola"
+
+#: a.py:2
+#, fuzzy
+msgid "World"
+msgstr "Mundo"
+
+#: a.py:3
+msgid "Untranslated"
+msgstr ""
+
+#: a.py:4
+msgctxt "month"
+msgid "May"
+msgstr "Mayo"
+"""
+
+# references of all entries updated, the context of 'May' changed and new
+# entries added
+CONTENT = """#
+msgid ""
+msgstr ""
+"Language: es\\n"
+
+#: a.py:11
+msgid "Hello"
+msgstr "Hola"
+
+#: a.py:10
+#, fuzzy
+msgid "New fuzzy"
+msgstr "Nuevo difuso"
+
+#: a.py:12
+#, fuzzy
+msgid "World"
+msgstr "Mundo"
+
+#: a.py:13
+msgid "Untranslated"
+msgstr ""
+
+#: a.py:14
+msgctxt "verb"
+msgid "May"
+msgstr ""
+
+#: a.py:15
+msgid "New"
+msgid_plural "News"
+msgstr[0] "Nueva"
+msgstr[1] ""
+
+#~ msgid "Obsolete"
+#~ msgstr "Obsoleto"
+"""
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="requires git")
+
+
+def _git(*args):
+    subprocess.run(["git", *args], check=True, stdout=subprocess.DEVNULL)
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _git("init", "-q")
+    _git("config", "user.email", "translator@example.com")
+    _git("config", "user.name", "Translator")
+
+    (tmp_path / "locale").mkdir()
+    (tmp_path / "locale" / "es.po").write_text(BASE_CONTENT)
+    _git("add", ".")
+    _git("commit", "-q", "-m", "Initial")
+    (tmp_path / "locale" / "es.po").write_text(CONTENT)
+    return tmp_path
+
+
+def _run(func, *args, **kwargs):
+    stderr = io.StringIO()
+    with contextlib.redirect_stderr(stderr):
+        exitcode = func(*args, **kwargs)
+    return exitcode, stderr.getvalue().splitlines()
+
+
+def test_changed_entries(repo):
+    entries = changed_entries("locale/es.po", "HEAD")
+    assert [(entry.msgctxt, entry.msgid) for entry in entries] == [
+        (None, "New fuzzy"),
+        ("verb", "May"),
+        (None, "New"),
+        (None, "Obsolete"),
+    ]
+
+    _git("add", ".")
+    _git("commit", "-q", "-m", "Update")
+    assert changed_entries("locale/es.po", "HEAD") == []
+
+
+@pytest.mark.parametrize(
+    ("func", "expected_diff_lines", "expected_all_lines"),
+    (
+        pytest.param(
+            check_fuzzy_messages,
+            ["Found fuzzy message at locale/es.po:11"],
+            [
+                "Found fuzzy message at locale/es.po:11",
+                "Found fuzzy message at locale/es.po:16",
+            ],
+            id="fuzzy",
+        ),
+        pytest.param(
+            check_obsolete_messages,
+            ["Found obsolete message at locale/es.po:35"],
+            ["Found obsolete message at locale/es.po:35"],
+            id="obsolete",
+        ),
+        pytest.param(
+            check_untranslated_messages,
+            [
+                "Untranslated message at locale/es.po:27",
+                "Partially translated message at locale/es.po:32",
+            ],
+            [
+                "Untranslated message at locale/es.po:22",
+                "Untranslated message at locale/es.po:27",
+                "Partially translated message at locale/es.po:32",
+            ],
+            id="untranslated",
+        ),
+    ),
+)
+def test_diff_base(func, expected_diff_lines, expected_all_lines, repo):
+    assert _run(func, ["locale/es.po"], diff_base="HEAD") == (1, expected_diff_lines)
+    assert _run(func, ["locale/es.po"]) == (1, expected_all_lines)
+
+
+def test_diff_base_min_checks_all_entries(repo):
+    assert _run(
+        check_untranslated_messages, ["locale/es.po"], min_="5", diff_base="HEAD"
+    ) == (
+        1,
+        [
+            "Lower number of messages translated (3) than required (5) at file"
+            " locale/es.po"
+        ],
+    )
+
+
+@pytest.mark.parametrize("diff_base", ("HEAD", "unknown-revision"))
+def test_diff_base_untracked_files_checked_entirely(diff_base, repo):
+    (repo / "locale" / "fr.po").write_text(BASE_CONTENT)
+    assert _run(check_fuzzy_messages, ["locale/fr.po"], diff_base=diff_base) == (
+        1,
+        ["Found fuzzy message at locale/fr.po:11"],
+    )
+
+
+@pytest.mark.parametrize(
+    ("no_diff_base", "expected_linenos"),
+    ((None, [11]), ("1", [11, 16])),
+    ids=("diff", "no-diff-base"),
+)
+def test_diff_base_cli(no_diff_base, expected_linenos, repo, monkeypatch, capsys):
+    if no_diff_base is None:
+        monkeypatch.delenv("PRE_COMMIT_PO_HOOKS_NO_DIFF_BASE", raising=False)
+    else:
+        monkeypatch.setenv("PRE_COMMIT_PO_HOOKS_NO_DIFF_BASE", no_diff_base)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["fuzzy-messages-hook", "--no-cache", "--diff-base", "HEAD", "locale/es.po"],
+    )
+    assert fuzzy_messages_main() == 1
+    assert capsys.readouterr().err.splitlines() == [
+        f"Found fuzzy message at locale/es.po:{lineno}" for lineno in expected_linenos
+    ]
+
+
+@pytest.mark.parametrize(
+    ("args", "expected_stderr_lines"),
+    (
+        pytest.param(
+            ["--fuzzy", "--untranslated"],
+            [
+                "Found fuzzy message at locale/es.po:11",
+                "Untranslated message at locale/es.po:27",
+                "Partially translated message at locale/es.po:32",
+            ],
+            id="diffable",
+        ),
+        pytest.param(
+            ["--fuzzy", "--max-messages", "1"],
+            [
+                "Found fuzzy message at locale/es.po:11",
+                "Found fuzzy message at locale/es.po:16",
+                "More messages (6) than allowed (1) at file locale/es.po",
+            ],
+            id="not-diffable",
+        ),
+    ),
+)
+def test_diff_base_po_hooks_cli(args, expected_stderr_lines, repo, monkeypatch, capsys):
+    monkeypatch.delenv("PRE_COMMIT_PO_HOOKS_NO_DIFF_BASE", raising=False)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["po-hooks", *args, "--no-cache", "--diff-base", "HEAD", "locale/es.po"],
+    )
+    assert po_hooks_main() == 1
+    assert capsys.readouterr().err.splitlines() == expected_stderr_lines
@@ -3,11 +3,16 @@
 import contextlib
 import io
 import os
+import sys
 import uuid
 
 import pytest
 
-from pre_commit_po_hooks.fuzzy_messages import check_fuzzy_messages
+from pre_commit_po_hooks.fuzzy_messages import (
+    check_fuzzy_messages,
+    fix_fuzzy_messages,
+    main as fuzzy_messages_main,
+)
 
 
 """
@@ -113,3 +118,107 @@ def test_check_fuzzy_messages(
 
     for filename in filenames:
         os.remove(filename)
+
+
+FUZZY_CONTENT = """#, fuzzy
+msgid ""
+msgstr ""
+"Language: es\\n"
+
+#: foo.py:1
+#, fuzzy, python-format
+#| msgid "Hello %s"
+msgid "Hello %(name)s"
+msgstr "Hola %s"
+
+#, fuzzy
+#~| msgid "Bye"
+#~ msgid "Bye!"
+#~ msgstr "Adiós"
+
+#, python-format
+#| msgid "Foo"
+msgid "Foo %s"
+msgstr "Bar %s"
+"""
+
+
+@pytest.mark.parametrize(
+    ("clear_previous", "expected_content"),
+    (
+        (
+            False,
+            """msgid ""
+msgstr ""
+"Language: es\\n"
+
+#: foo.py:1
+#, python-format
+#| msgid "Hello %s"
+msgid "Hello %(name)s"
+msgstr "Hola %s"
+
+#~| msgid "Bye"
+#~ msgid "Bye!"
+#~ msgstr "Adiós"
+
+#, python-format
+#| msgid "Foo"
+msgid "Foo %s"
+msgstr "Bar %s"
+""",
+        ),
+        (
+            True,
+            """msgid ""
+msgstr ""
+"Language: es\\n"
+
+#: foo.py:1
+#, python-format
+msgid "Hello %(name)s"
+msgstr "Hola %s"
+
+#~ msgid "Bye!"
+#~ msgstr "Adiós"
+
+#, python-format
+#| msgid "Foo"
+msgid "Foo %s"
+msgstr "Bar %s"
+""",
+        ),
+    ),
+    ids=("clear_previous=False", "clear_previous=True"),
+)
+@pytest.mark.parametrize("newline", ("\n", "\r\n"), ids=("lf", "crlf"))
+def test_fix_fuzzy_messages(clear_previous, expected_content, newline, tmp_path):
+    filename = tmp_path / "es.po"
+    filename.write_bytes(FUZZY_CONTENT.replace("\n", newline).encode())
+
+    assert fix_fuzzy_messages([filename], clear_previous=clear_previous) == 1
+    assert filename.read_bytes() == expected_content.replace("\n", newline).encode()
+    assert check_fuzzy_messages([filename], quiet=True) == 0
+
+    # nothing to fix
+    assert fix_fuzzy_messages([filename], clear_previous=clear_previous) == 0
+
+
+def test_fix_fuzzy_messages_cli(tmp_path, monkeypatch, capsys):
+    filenames = [tmp_path / "es.po", tmp_path / "fr.po"]
+    filenames[0].write_text(FUZZY_CONTENT)
+    filenames[1].write_text('msgid "Foo"\nmsgstr "Bar"\n')
+    mtime = os.stat(filenames[1]).st_mtime_ns
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["fuzzy-messages-hook", "--fix", "--clear-previous", "-j", "2"]
+        + [str(filename) for filename in filenames],
+    )
+
+    assert fuzzy_messages_main() == 1
+    assert capsys.readouterr().err == ""
+    content = filenames[0].read_text()
+    assert "fuzzy" not in content
+    assert '#| msgid "Hello %s"' not in content
+    assert os.stat(filenames[1]).st_mtime_ns == mtime
@@ -0,0 +1,114 @@
+"""Tests for timings and profiling instrumentation."""
+
+import json
+import pstats
+import sys
+
+import pytest
+
+from pre_commit_po_hooks.po_hooks import main
+
+
+CONTENT = """#
+msgid ""
+msgstr ""
+"Language: es\\n"
+
+#, fuzzy
+msgid "Hello"
+msgstr "Hola"
+"""
+
+
+@pytest.mark.parametrize("jobs", ("1", "2"))
+def test_timings(jobs, tmp_path, monkeypatch, capsys):
+    filenames = [tmp_path / "es.po", tmp_path / "fr.po"]
+    for filename in filenames:
+        filename.write_text(CONTENT)
+    timings_filename = tmp_path / "timings.json"
+
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "po-hooks",
+            "--fuzzy",
+            "--no-cache",
+            "-j",
+            jobs,
+            "--timings",
+            "--timings-json",
+            str(timings_filename),
+            *(str(filename) for filename in filenames),
+        ],
+    )
+    assert main() == 1
+
+    stderr = capsys.readouterr().err
+    assert f"Found fuzzy message at {filenames[0]}:6" in stderr
+    assert "Timings:" in stderr
+    assert "2 files" in stderr
+
+    summary = json.loads(timings_filename.read_text())
+    assert summary["jobs"] == int(jobs)
+    assert summary["total_bytes"] == 2 * len(CONTENT)
+    assert [file_timings["filename"] for file_timings in summary["files"]] == [
+        str(filename) for filename in filenames
+    ]
+    for file_timings in summary["files"]:
+        assert file_timings["bytes"] == len(CONTENT)
+        assert file_timings["seconds"] >= file_timings["phases"]["check"] > 0
+
+
+def test_timings_cache_phase(tmp_path, monkeypatch):
+    filename = tmp_path / "es.po"
+    filename.write_text(CONTENT)
+    timings_filename = tmp_path / "timings.json"
+
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "po-hooks",
+            "--fuzzy",
+            "--cache-dir",
+            str(tmp_path / "cache"),
+            "--timings-json",
+            str(timings_filename),
+            str(filename),
+        ],
+    )
+    assert main() == 1
+    phases = json.loads(timings_filename.read_text())["files"][0]["phases"]
+    assert set(phases) == {"cache", "check"}
+
+    # cached result, not checked again
+    assert main() == 1
+    phases = json.loads(timings_filename.read_text())["files"][0]["phases"]
+    assert set(phases) == {"cache"}
+
+
+def test_profile(tmp_path, monkeypatch):
+    filename = tmp_path / "es.po"
+    filename.write_text(CONTENT)
+    profile_filename = tmp_path / "po-hooks.prof"
+
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "po-hooks",
+            "--fuzzy",
+            "--no-cache",
+            "-j",
+            "2",
+            "--profile",
+            str(profile_filename),
+            str(filename),
+        ],
+    )
+    assert main() == 1
+
+    stats = pstats.Stats(str(profile_filename))
+    # checks executed in the profiled process
+    assert any(func[2] == "check_file" for func in stats.stats)
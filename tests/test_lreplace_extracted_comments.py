@@ -115,3 +115,94 @@ def test_lreplace_extracted_comments(
             assert _in_line
 
         os.remove(filename)
+
+
+@pytest.mark.parametrize(
+    ("content", "dry_run"),
+    (
+        pytest.param(
+            '#. Translators: Hello\nmsgid "Hello"\nmsgstr "Hola"\n',
+            True,
+            id="dry-run",
+        ),
+        pytest.param(
+            '#. Hello\nmsgid "Hello"\nmsgstr "Hola"\n',
+            False,
+            id="no-replacements",
+        ),
+    ),
+)
+def test_lreplace_extracted_comments_does_not_write(content, dry_run, tmp_path):
+    filename = tmp_path / "es.po"
+    filename.write_text(content)
+    stat = os.stat(filename)
+
+    with contextlib.redirect_stderr(io.StringIO()):
+        lreplace_extracted_comments(
+            [filename],
+            django_translators=True,
+            dry_run=dry_run,
+        )
+
+    assert filename.read_text() == content
+    new_stat = os.stat(filename)
+    assert (new_stat.st_ino, new_stat.st_mtime_ns) == (stat.st_ino, stat.st_mtime_ns)
+    assert os.listdir(tmp_path) == ["es.po"]
+
+
+def test_lreplace_extracted_comments_same_basenames_in_parallel(tmp_path):
+    filenames = []
+    for language in ("es", "fr", "de", "it"):
+        directory = tmp_path / language / "LC_MESSAGES"
+        directory.mkdir(parents=True)
+        filename = directory / "django.po"
+        filename.write_text(
+            f'#\nmsgid ""\nmsgstr ""\n\n#. Translators: {language}\n'
+            'msgid "Hello"\nmsgstr "Hola"\n'
+        )
+        os.chmod(filename, 0o644)
+        filenames.append(filename)
+
+    assert lreplace_extracted_comments(filenames, django_translators=True, jobs=4) == 1
+
+    for language, filename in zip(("es", "fr", "de", "it"), filenames):
+        assert filename.read_text() == (
+            f'#\nmsgid ""\nmsgstr ""\n\n#. {language}\nmsgid "Hello"\nmsgstr "Hola"\n'
+        )
+        assert os.stat(filename).st_mode & 0o777 == 0o644
+        assert os.listdir(filename.parent) == ["django.po"]
+
+
+@pytest.mark.parametrize("newline", ("\n", "\r\n"), ids=("lf", "crlf"))
+def test_lreplace_extracted_comments_multiple_replacements(newline, tmp_path):
+    filename = tmp_path / "es.po"
+    content = (
+        "#. Translators: Hello\n"
+        "#.\tTODO: World\n"
+        "#. Note: Foo\n"
+        '#. Translators: TODO: Bar\nmsgid "Hello"\nmsgstr "Hola"\n'
+        '#~ #. Translators: Obsolete\n#~ msgid "Baz"\n#~ msgstr "Baz"\n'
+    )
+    filename.write_bytes(content.replace("\n", newline).encode())
+
+    assert (
+        lreplace_extracted_comments(
+            [filename],
+            django_translators=True,
+            replacements=[("TODO: ", ""), ("Note: ", "Nota: ")],
+        )
+        == 1
+    )
+    expected_content = (
+        "#. Hello\n"
+        "#. World\n"
+        "#. Nota: Foo\n"
+        '#. Bar\nmsgid "Hello"\nmsgstr "Hola"\n'
+        '#~ #. Translators: Obsolete\n#~ msgid "Baz"\n#~ msgstr "Baz"\n'
+    )
+    assert filename.read_bytes() == expected_content.replace("\n", newline).encode()
+
+
+def test_lreplace_extracted_comments_requires_replacement():
+    with pytest.raises(ValueError, match="specify a match and replacement"):
+        lreplace_extracted_comments(["es.po"])
@@ -0,0 +1,125 @@
+"""Memory usage of read-only checks must not grow with the size of files."""
+
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+
+resource = pytest.importorskip("resource")
+
+SCRIPT = """
+import resource, sys
+
+from pre_commit_po_hooks.check_entries import MaxLinesCheck, MaxMessagesCheck
+from pre_commit_po_hooks.check_metadata import STANDARD_HEADERS_SPEC, MetadataCheck
+from pre_commit_po_hooks.checks import check_file
+from pre_commit_po_hooks.fuzzy_messages import FuzzyMessagesCheck
+from pre_commit_po_hooks.obsolete_messages import ObsoleteMessagesCheck
+from pre_commit_po_hooks.untranslated_messages import UntranslatedMessagesCheck
+
+check_file(
+    sys.argv[1],
+    [
+        (ObsoleteMessagesCheck, {"quiet": True}),
+        (FuzzyMessagesCheck, {"quiet": True}),
+        (UntranslatedMessagesCheck, {"quiet": True}),
+        (MaxMessagesCheck, {"quiet": True}),
+        (MaxLinesCheck, {"quiet": True}),
+        (MetadataCheck, {"headers_spec": STANDARD_HEADERS_SPEC, "quiet": True}),
+    ],
+)
+maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+# kilobytes in Linux, bytes in MacOS
+sys.stdout.write(str(maxrss if sys.platform != "darwin" else maxrss // 1024))
+"""
+
+DIFF_SCRIPT = """
+import resource, sys
+
+from pre_commit_po_hooks.checks import check_file
+from pre_commit_po_hooks.fuzzy_messages import FuzzyMessagesCheck
+from pre_commit_po_hooks.obsolete_messages import ObsoleteMessagesCheck
+
+fuzzy_check, _ = check_file(
+    sys.argv[1],
+    [
+        (FuzzyMessagesCheck, {}),
+        (ObsoleteMessagesCheck, {}),
+    ],
+    diff_base="HEAD",
+)
+maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+# kilobytes in Linux, bytes in MacOS
+sys.stdout.write(str(maxrss if sys.platform != "darwin" else maxrss // 1024))
+sys.stdout.write(f" {len(fuzzy_check.diagnostics)}")
+"""
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _write_catalog(filename, n_entries):
+    with open(filename, "w") as f:
+        f.write('msgid ""\nmsgstr ""\n"Language: es\\n"\n\n')
+        for i in range(n_entries):
+            if i % 7 == 0:
+                f.write("#, fuzzy\n")
+            f.write(f'#: module.py:{i}\nmsgid "Message number {i}"\n')
+            if i % 5 == 0:
+                f.write('msgstr ""\n\n')
+            else:
+                f.write(f'msgstr "Mensaje número {i}"\n\n')
+        f.write('#~ msgid "Obsolete"\n#~ msgstr "Obsoleto"\n')
+
+
+def _peak_rss_kb(filename, script=SCRIPT):
+    output = subprocess.check_output(
+        [sys.executable, "-c", script, str(filename)],
+        cwd=os.path.dirname(filename),
+        env={**os.environ, "PYTHONPATH": ROOT},
+    )
+    rss, *counts = output.split()
+    return int(rss), *(int(count) for count in counts)
+
+
+def test_peak_rss_is_flat_with_file_size(tmp_path):
+    small_filename, big_filename = tmp_path / "small.po", tmp_path / "big.po"
+    _write_catalog(small_filename, 5000)  # ~0.3 MB
+    _write_catalog(big_filename, 200000)  # ~12 MB
+
+    (small_rss,), (big_rss,) = _peak_rss_kb(small_filename), _peak_rss_kb(big_filename)
+    assert big_rss - small_rss < 4 * 1024, (small_rss, big_rss)
+
+
+def _git(directory, *args):
+    subprocess.run(["git", *args], cwd=directory, check=True, stdout=subprocess.DEVNULL)
+
+
+def _write_changed_catalog(directory, n_entries):
+    directory.mkdir()
+    _git(directory, "init", "-q")
+    _git(directory, "config", "user.email", "translator@example.com")
+    _git(directory, "config", "user.name", "Translator")
+    filename = directory / "es.po"
+    _write_catalog(filename, n_entries)
+    _git(directory, "add", ".")
+    _git(directory, "commit", "-q", "-m", "Initial")
+
+    with open(filename, "a") as f:
+        for i in range(3):
+            f.write(f'\n#, fuzzy\nmsgid "New message {i}"\nmsgstr "Nuevo {i}"\n')
+    return filename
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="requires git")
+def test_peak_rss_is_flat_with_file_size_diff_base(tmp_path):
+    small_filename = _write_changed_catalog(tmp_path / "small", 5000)
+    big_filename = _write_changed_catalog(tmp_path / "big", 200000)
+
+    small_rss, small_fuzzy = _peak_rss_kb(small_filename, DIFF_SCRIPT)
+    big_rss, big_fuzzy = _peak_rss_kb(big_filename, DIFF_SCRIPT)
+    # only the new messages are checked
+    assert small_fuzzy == big_fuzzy == 3
+    assert big_rss - small_rss < 4 * 1024, (small_rss, big_rss)
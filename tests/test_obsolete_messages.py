@@ -7,7 +7,10 @@ import uuid
 
 import pytest
 
-from pre_commit_po_hooks.obsolete_messages import check_obsolete_messages
+from pre_commit_po_hooks.obsolete_messages import (
+    check_obsolete_messages,
+    fix_obsolete_messages,
+)
 
 
 @pytest.mark.parametrize("quiet", (False, True), ids=("quiet=False", "quiet=True"))
@@ -79,3 +82,44 @@ def test_check_obsolete_messages(
 
     for filename in filenames:
         os.remove(filename)
+
+
+@pytest.mark.parametrize(
+    ("content", "expected_content"),
+    (
+        pytest.param(
+            (
+                '#\nmsgid ""\nmsgstr ""\n\nmsgid "Hello"\nmsgstr "Hola"\n\n'
+                '#, fuzzy\n#~ msgid "Obsolete "\n#~ "message"\n'
+                '#~ msgstr "Mensaje obsoleto"\n\n'
+                'msgid "Foo"\nmsgstr "Bar"\n\n#~ msgid "Bye"\n#~ msgstr "Adiós"\n'
+            ),
+            '#\nmsgid ""\nmsgstr ""\n\nmsgid "Hello"\nmsgstr "Hola"\n\n'
+            'msgid "Foo"\nmsgstr "Bar"\n',
+            id="obsolete-messages",
+        ),
+        pytest.param(
+            '#~ msgid "Bye"\n#~ msgstr "Adiós"\n\nmsgid "Foo"\nmsgstr "Bar"',
+            'msgid "Foo"\nmsgstr "Bar"',
+            id="obsolete-first-message",
+        ),
+        pytest.param(
+            '#\nmsgid ""\nmsgstr ""\n\nmsgid "Hello"\nmsgstr "Hola"\n',
+            None,
+            id="no-obsolete-messages",
+        ),
+    ),
+)
+@pytest.mark.parametrize("newline", ("\n", "\r\n"), ids=("lf", "crlf"))
+def test_fix_obsolete_messages(content, expected_content, newline, tmp_path):
+    filename = tmp_path / "es.po"
+    filename.write_bytes(content.replace("\n", newline).encode())
+    mtime = os.stat(filename).st_mtime_ns
+
+    assert fix_obsolete_messages([filename]) == (expected_content is not None)
+    if expected_content is None:
+        # not rewritten
+        assert os.stat(filename).st_mtime_ns == mtime
+        expected_content = content
+    assert filename.read_bytes() == expected_content.replace("\n", newline).encode()
+    assert check_obsolete_messages([filename], quiet=True) == 0
@@ -0,0 +1,220 @@
+"""Tests for the PO files tokenizer and entries parser."""
+
+import io
+
+import pytest
+
+from pre_commit_po_hooks.po import (
+    ENTRY_FUZZY,
+    ENTRY_HEADER,
+    ENTRY_OBSOLETE,
+    ENTRY_PARTIALLY_TRANSLATED,
+    ENTRY_TRANSLATED,
+    ENTRY_UNTRANSLATED,
+    TOKEN_BLANK,
+    TOKEN_COMMENT,
+    TOKEN_KEYWORD,
+    TOKEN_STRING,
+    EntryParser,
+    POEntry,
+    iter_chunks,
+    iter_entries,
+    iter_entries_tokens,
+    tokenize_line,
+)
+
+
+@pytest.mark.parametrize(
+    ("line", "kind", "keyword", "value", "obsolete"),
+    (
+        ("\n", TOKEN_BLANK, None, None, False),
+        (
+            "#, fuzzy, python-format\n",
+            TOKEN_COMMENT,
+            "#,",
+            "fuzzy, python-format",
+            False,
+        ),
+        ("#. Translators: Hello\n", TOKEN_COMMENT, "#.", "Translators: Hello", False),
+        ("# Translator comment\n", TOKEN_COMMENT, "#", "Translator comment", False),
+        ('#| msgid "Previous"\n', TOKEN_COMMENT, "#|", 'msgid "Previous"', False),
+        ('#~| msgid "Previous"\n', TOKEN_COMMENT, "#|", 'msgid "Previous"', True),
+        ('msgid "Hello"\n', TOKEN_KEYWORD, "msgid", "Hello", False),
+        ('msgstr[1] "Hola"\n', TOKEN_KEYWORD, "msgstr[1]", "Hola", False),
+        ('#~ msgctxt "Context"\n', TOKEN_KEYWORD, "msgctxt", "Context", True),
+        ('"Language: es\\n"\n', TOKEN_STRING, None, "Language: es\\n", False),
+        ("#\n", TOKEN_COMMENT, "#", "", False),
+        ('msgstr "Hola"\r\n', TOKEN_KEYWORD, "msgstr", "Hola", False),
+        ('"Hola"\r\n', TOKEN_STRING, None, "Hola", False),
+        ("\r\n", TOKEN_BLANK, None, None, False),
+        ('  msgid "Indented"\n', TOKEN_KEYWORD, "msgid", "Indented", False),
+        ("\t#, fuzzy\n", TOKEN_COMMENT, "#,", "fuzzy", False),
+    ),
+)
+def test_tokenize_line(line, kind, keyword, value, obsolete):
+    token = tokenize_line(1, line)
+    assert token.kind == kind
+    assert token.keyword == keyword
+    assert token.value == value
+    assert token.obsolete is obsolete
+    assert token.line == line
+
+
+def test_iter_entries():
+    content = """# Header comment
+#, fuzzy
+msgid ""
+msgstr ""
+"Language: es\\n"
+
+#: foo.py:1
+#, python-format
+msgctxt "Context"
+msgid ""
+"Multi"
+"line"
+msgstr "Multilínea"
+#, fuzzy
+msgid "Apple"
+msgid_plural "Apples"
+msgstr[0] "Manzana"
+msgstr[1] ""
+
+#, fuzzy
+#~ msgid "Obsolete"
+#~ msgstr ""
+#~ "Obsoleto"
+"""
+    entries = list(iter_entries(io.StringIO(content)))
+    assert len(entries) == 4
+
+    header, multiline, plural, obsolete = entries
+
+    assert header.is_header
+    assert header.fuzzy
+    assert (header.lineno, header.msgstr_lineno, header.end_lineno) == (1, 4, 5)
+    assert header.msgstr == ["Language: es\\n"]
+
+    assert not multiline.is_header
+    assert multiline.flags == ("python-format",)
+    assert multiline.msgctxt == "Context"
+    assert multiline.msgid == "Multiline"
+    assert multiline.msgid_lineno == 10
+    assert multiline.msgstr == ["Multilínea"]
+
+    assert plural.fuzzy
+    assert plural.flags_lineno == 14
+    assert plural.msgid_plural == "Apples"
+    assert plural.msgstr == ["Manzana", ""]
+    assert plural.msgstr_lineno == 17
+
+    assert obsolete.obsolete
+    assert obsolete.fuzzy
+    assert (obsolete.lineno, obsolete.obsolete_lineno) == (20, 21)
+    assert obsolete.msgstr == ["Obsoleto"]
+
+
+@pytest.mark.parametrize(
+    "content",
+    (
+        (
+            '# Header\n#, fuzzy\nmsgid ""\nmsgstr ""\n"Language: es\\n"\n\n'
+            '#: foo.py:1\n#, python-format, c-format\nmsgctxt "Context"\n'
+            'msgid ""\n"Multi"\n"line"\nmsgstr "Multi"\n"línea"\n'
+            '#, fuzzy\nmsgid "Apple"\nmsgid_plural "Apples"\n'
+            'msgstr[0] "Manzana"\nmsgstr[1] ""\n"Manzanas"\n\n'
+            '#, fuzzy\n#~ msgid "Obsolete"\n#~ msgstr ""\n#~ "Obsoleto"\n'
+        ),
+        '#\r\nmsgid ""\r\nmsgstr ""\r\n\r\nmsgid "Foo"\r\nmsgstr "Bar"\r\n',
+        (
+            '"Orphan"\n  msgid "Indented"\n  msgstr "Sangrado"\n \n'
+            'msgid "Unknown"\nmsgunknown "Value"\n"String"\nmsgstr "Valor"\n'
+            '#, fuzzy\n#| msgid "Previous"\nmsgid "Current"\nmsgstr "Actual"'
+        ),
+    ),
+    ids=("gettext", "crlf", "unusual"),
+)
+def test_entry_parser_feed_line(content):
+    def parse(feed, close):
+        entries = []
+        for lineno, line in enumerate(io.StringIO(content), 1):
+            entries.append(feed(lineno, line))
+        entries.append(close())
+        return [
+            None
+            if entry is None
+            else {name: getattr(entry, name) for name in POEntry.__slots__}
+            for entry in entries
+        ]
+
+    line_parser, token_parser = EntryParser(), EntryParser()
+    expected = parse(
+        lambda lineno, line: token_parser.feed(tokenize_line(lineno, line)),
+        token_parser.close,
+    )
+    assert any(expected)
+    assert parse(line_parser.feed_line, line_parser.close) == expected
+
+
+def test_iter_entries_tokens():
+    content = (
+        '\nmsgid "a"\nmsgstr "b"\n\n\n# orphan comment\n\n'
+        '#: foo.py:1\nmsgid "c"\nmsgstr "d"\n#~ msgid "e"\n#~ msgstr "f"'
+    )
+    groups = [
+        (None if entry is None else entry.msgid, [token.lineno for token in tokens])
+        for entry, tokens in iter_entries_tokens(io.StringIO(content))
+    ]
+    assert groups == [
+        (None, [1]),
+        ("a", [2, 3]),
+        (None, [4]),
+        (None, [5]),
+        (None, [6]),
+        (None, [7]),
+        ("c", [8, 9, 10]),
+        ("e", [11, 12]),
+    ]
+
+
+@pytest.mark.parametrize("chunk_size", (1, 7, 64, 4096))
+@pytest.mark.parametrize(
+    "content",
+    (
+        b'msgid "a"\nmsgstr "b"\n\nmsgid "c"\nmsgstr "d"\n',
+        b'msgid "a"\r\nmsgstr "b"\r\n\r\nmsgid "c"\r\nmsgstr "d"\r\n',
+        b'#: foo.py:1\nmsgid "a"\nmsgstr "b"\nmsgid "c"\nmsgstr "d"',
+        b"",
+    ),
+    ids=("lf", "crlf", "no-blank-lines", "empty"),
+)
+def test_iter_chunks(content, chunk_size):
+    chunks = list(iter_chunks(io.BytesIO(content), chunk_size=chunk_size))
+    assert b"".join(chunk for _, chunk in chunks) == content
+
+    expected_lineno = 1
+    for lineno, chunk in chunks:
+        assert lineno == expected_lineno
+        assert chunk.endswith(b"\n") or chunk is chunks[-1][1]
+        expected_lineno += chunk.count(b"\n")
+
+
+def test_entry_status():
+    content = (
+        '#\nmsgid ""\nmsgstr ""\n"Language: es\\n"\n\n'
+        'msgid "Translated"\nmsgstr ""\n"Traducido"\n\n'
+        'msgid "Untranslated"\nmsgstr ""\n\n'
+        'msgid "File"\nmsgid_plural "Files"\nmsgstr[0] "Archivo"\nmsgstr[1] ""\n\n'
+        '#, fuzzy\nmsgid "Fuzzy"\nmsgstr "Difuso"\n\n'
+        '#, fuzzy\nmsgid "Fuzzy untranslated"\nmsgstr ""\n\n'
+        '#~ msgid "Obsolete"\n#~ msgstr "Obsoleto"\n'
+    )
+    assert [entry.status for entry in iter_entries(io.StringIO(content))] == [
+        ENTRY_HEADER,
+        ENTRY_TRANSLATED,
+        ENTRY_UNTRANSLATED,
+        ENTRY_PARTIALLY_TRANSLATED,
+        ENTRY_FUZZY,
+        ENTRY_UNTRANSLATED,
+        ENTRY_OBSOLETE,
+    ]
@@ -0,0 +1,122 @@
+"""Tests for 'po-hooks' combined hook."""
+
+import sys
+import uuid
+
+import pytest
+
+from pre_commit_po_hooks.po_hooks import main
+
+
+CONTENT = """#
+msgid ""
+msgstr ""
+"Language: es\\n"
+
+#, fuzzy
+msgid "Hello"
+msgstr "Hola"
+
+msgid "World"
+msgstr ""
+
+#~ msgid "Obsolete"
+#~ msgstr "Obsoleto"
+"""
+
+
+@pytest.mark.parametrize(
+    ("args", "expected_exitcode", "expected_stderr_lines"),
+    (
+        pytest.param(
+            ["--obsolete"],
+            1,
+            ["Found obsolete message at {filename}:13"],
+            id="obsolete",
+        ),
+        pytest.param(
+            ["--fuzzy", "--untranslated"],
+            1,
+            [
+                "Found fuzzy message at {filename}:6",
+                "Untranslated message at {filename}:11",
+            ],
+            id="fuzzy-untranslated",
+        ),
+        pytest.param(
+            ["--max-messages", "2", "--max-lines", "14"],
+            0,
+            [],
+            id="max-messages-max-lines-pass",
+        ),
+        pytest.param(
+            ["--max-messages", "1", "--max-lines", "13", "-h", "Language", "-v", "fr"],
+            1,
+            [
+                "More messages (2) than allowed (1) at file {filename}",
+                "More lines (14) than allowed (13) at file {filename}",
+                (
+                    "Wrong metadata value at {filename}:4 (regex 'fr' not"
+                    " matching for value 'es' in header 'Language')"
+                ),
+            ],
+            id="max-messages-max-lines-metadata-fail",
+        ),
+        pytest.param(
+            ["--no-duplicates", "--max-messages", "2"],
+            0,
+            [],
+            id="no-duplicates",
+        ),
+        pytest.param(
+            ["--pot", "{template}"],
+            1,
+            [
+                "Message at {filename}:10 not found in template {template}",
+                "Message of template {template}:1 not found at file {filename}",
+            ],
+            id="pot",
+        ),
+        pytest.param(
+            ["--obsolete", "--quiet", "--no-metadata"],
+            1,
+            [],
+            id="quiet",
+        ),
+    ),
+)
+def test_po_hooks(
+    args,
+    expected_exitcode,
+    expected_stderr_lines,
+    tmp_path,
+    monkeypatch,
+    capsys,
+):
+    filename = tmp_path / f"{uuid.uuid4().hex[:16]}.po"
+    filename.write_text(CONTENT)
+    template = tmp_path / "messages.pot"
+    template.write_text('msgid "Bye"\nmsgstr ""\n\nmsgid "Hello"\nmsgstr ""\n')
+    args = [arg.format(template=template) for arg in args]
+
+    monkeypatch.setattr(sys, "argv", ["po-hooks", *args, str(filename)])
+    assert main() == expected_exitcode
+
+    stderr_lines = capsys.readouterr().err.splitlines()
+    assert stderr_lines == [
+        line.format(filename=filename, template=template)
+        for line in expected_stderr_lines
+    ]
+
+
+def test_po_hooks_without_checks(monkeypatch, capsys):
+    monkeypatch.setattr(sys, "argv", ["po-hooks", "foo.po"])
+    assert main() == 1
+    assert "usage:" in capsys.readouterr().out
+
+
+def test_po_hooks_unknown_template(monkeypatch, capsys):
+    monkeypatch.setattr(sys, "argv", ["po-hooks", "--pot", "unknown.pot", "es.po"])
+    with pytest.raises(SystemExit):
+        main()
+    assert "can't read the template 'unknown.pot'" in capsys.readouterr().err
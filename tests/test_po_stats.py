@@ -0,0 +1,104 @@
+"""Tests for 'po-stats' entry point."""
+
+import csv
+import io
+import json
+import sys
+
+import pytest
+
+from pre_commit_po_hooks.checks import Check, check_file
+from pre_commit_po_hooks.po_stats import STATS_FIELDS, StatsCheck, catalogs_stats, main
+
+
+CONTENT = """#
+msgid ""
+msgstr ""
+"Language: es\\n"
+
+msgid "Hello"
+msgstr "Hola"
+
+#, fuzzy
+msgid "World"
+msgstr "Mundo"
+
+msgid "File"
+msgid_plural "Files"
+msgstr[0] "Archivo"
+msgstr[1] ""
+
+msgid "Untranslated"
+msgstr ""
+
+#~ msgid "Obsolete"
+#~ msgstr "Obsoleto"
+"""
+
+
+@pytest.mark.parametrize("jobs", (1, 2), ids=("jobs=1", "jobs=2"))
+def test_catalogs_stats(jobs, tmp_path):
+    filenames = []
+    for language in ("es", "fr"):
+        filename = tmp_path / f"{language}.po"
+        filename.write_text(CONTENT)
+        filenames.append(filename)
+
+    assert catalogs_stats(filenames, jobs=jobs) == [
+        {
+            "filename": str(filename),
+            "total": 4,
+            "translated": 1,
+            "fuzzy": 1,
+            "partially_translated": 1,
+            "untranslated": 1,
+            "obsolete": 1,
+            "lines": 22,
+            "bytes": len(CONTENT.encode()),
+        }
+        for filename in filenames
+    ]
+
+
+@pytest.mark.parametrize(
+    "content",
+    (
+        CONTENT,
+        CONTENT.replace("\n", "\r\n"),
+        CONTENT.replace("\n\n", "\n").rstrip("\n"),
+        (
+            '#, fuzzy\nmsgid ""\n"Multiline"\nmsgstr ""\n""\n'
+            '#, fuzzy, python-format\nmsgid "Fuzzy plural"\n'
+            'msgid_plural "Fuzzy plurals"\nmsgstr[0] "Difuso"\nmsgstr[1] ""\n'
+            '#, python-format\n#~ msgid "Obsolete %s"\n#~ msgstr ""\n'
+        ),
+    ),
+    ids=("lf", "crlf", "no-blank-lines", "mixed"),
+)
+def test_stats_chunks_match_tokens(content, tmp_path):
+    filename = tmp_path / "es.po"
+    filename.write_bytes(content.encode())
+
+    (chunk_check,) = check_file(filename, [(StatsCheck, {})])
+    # the base check doesn't support chunks, so the file is tokenized
+    token_check, _ = check_file(filename, [(StatsCheck, {}), (Check, {})])
+    assert chunk_check.stats == token_check.stats
+
+
+@pytest.mark.parametrize("format", ("jsonl", "csv"))
+def test_po_stats_main(format, tmp_path, monkeypatch, capsys):
+    filename = tmp_path / "es.po"
+    filename.write_text(CONTENT)
+
+    monkeypatch.setattr(sys, "argv", ["po-stats", "--format", format, str(filename)])
+    assert main() == 0
+
+    output = capsys.readouterr().out
+    if format == "jsonl":
+        records = [json.loads(line) for line in output.splitlines()]
+    else:
+        records = list(csv.DictReader(io.StringIO(output)))
+        assert list(records[0].keys()) == list(STATS_FIELDS)
+    assert len(records) == 1
+    assert records[0]["filename"] == str(filename)
+    assert int(records[0]["total"]) == 4
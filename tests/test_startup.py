@@ -0,0 +1,93 @@
+"""Startup time budget of the console scripts.
+
+Hooks are executed by pre-commit once per batch of files, so for small
+commits most of their time is spent starting the interpreter and importing
+modules. Modules only needed processing files in parallel, with the cache
+enabled or rewriting files are imported when used.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# cumulative import time of each console script module, in microseconds
+IMPORT_TIME_BUDGET = 50000
+
+LAZY_MODULES = (
+    "concurrent.futures",
+    "multiprocessing",
+    "tempfile",
+    "shutil",
+    "hashlib",
+    "json",
+    "csv",
+    "cProfile",
+    "pre_commit_po_hooks.cache",
+)
+
+CONSOLE_SCRIPTS_MODULES = (
+    "pre_commit_po_hooks.obsolete_messages",
+    "pre_commit_po_hooks.untranslated_messages",
+    "pre_commit_po_hooks.fuzzy_messages",
+    "pre_commit_po_hooks.lreplace_extracted_comments",
+    "pre_commit_po_hooks.check_metadata",
+    "pre_commit_po_hooks.check_entries",
+    "pre_commit_po_hooks.check_template",
+    "pre_commit_po_hooks.po_hooks",
+    "pre_commit_po_hooks.po_stats",
+)
+
+
+@pytest.fixture(scope="module")
+def pycache_prefix(tmp_path_factory):
+    return str(tmp_path_factory.mktemp("pycache"))
+
+
+def _importtime(module, pycache_prefix):
+    """Import a module in a new interpreter, returning the cumulative import
+    time of each module imported, in microseconds.
+
+    The bytecode is cached outside of the sources even if
+    ``PYTHONDONTWRITEBYTECODE`` is set, like in the environments created by
+    pre-commit, so only the first import of each module compiles it.
+    """
+    env = {**os.environ, "PYTHONPYCACHEPREFIX": pycache_prefix}
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT_DIR,
+        env=env,
+        stderr=subprocess.PIPE,
+        check=True,
+        universal_newlines=True,
+    ).stderr
+
+    import_times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        cumulative = cumulative.strip()
+        if cumulative.isdigit():
+            import_times[name.strip()] = int(cumulative)
+    return import_times
+
+
+@pytest.mark.parametrize("module", CONSOLE_SCRIPTS_MODULES)
+def test_lazy_imports(module, pycache_prefix):
+    import_times = _importtime(module, pycache_prefix)
+    assert module in import_times
+    assert [name for name in LAZY_MODULES if name in import_times] == []
+
+
+@pytest.mark.parametrize("module", CONSOLE_SCRIPTS_MODULES)
+def test_import_time_budget(module, pycache_prefix):
+    # the fastest of some runs, discarding the first one compiling bytecode
+    _importtime(module, pycache_prefix)
+    import_time = min(_importtime(module, pycache_prefix)[module] for _ in range(3))
+    assert import_time < IMPORT_TIME_BUDGET
@@ -85,3 +85,69 @@ def test_check_untranslated_messages(
 
     for filename in filenames:
         os.remove(filename)
+
+
+@pytest.mark.parametrize(
+    ("content", "min_", "expected_exitcode", "expected_stderr_lines"),
+    (
+        pytest.param(
+            (
+                'msgid "File"\nmsgid_plural "Files"\n'
+                'msgstr[0] "Archivo"\nmsgstr[1] ""\n\n'
+                'msgid "Dog"\nmsgid_plural "Dogs"\n'
+                'msgstr[0] ""\nmsgstr[1] ""\n\n'
+                'msgid "Cat"\nmsgid_plural "Cats"\n'
+                'msgstr[0] "Gato"\nmsgstr[1] ""\n"Gatos"\n\n'
+                'msgid "Multiline"\nmsgstr ""\n"Multilínea"\n\n'
+                '#, fuzzy\nmsgid "Fuzzy"\nmsgstr "Difuso"\n'
+            ),
+            None,
+            1,
+            [
+                "Partially translated message at {filename}:3",
+                "Untranslated message at {filename}:8",
+            ],
+            id="plurals",
+        ),
+        pytest.param(
+            'msgid "Foo"\nmsgstr "Foo"\n\nmsgid "Bar"\nmsgstr ""\n',
+            "1",
+            0,
+            [],
+            id="min-number-pass",
+        ),
+        pytest.param(
+            'msgid "Foo"\nmsgstr "Foo"\n\nmsgid "Bar"\nmsgstr ""\n',
+            "2",
+            1,
+            [
+                "Lower number of messages translated (1) than required (2)"
+                " at file {filename}"
+            ],
+            id="min-number-fail",
+        ),
+        pytest.param(
+            'msgid "Foo"\nmsgstr "Foo"\n\nmsgid "Bar"\nmsgstr ""\n\n'
+            'msgid "Baz"\nmsgstr ""\n',
+            "50%",
+            1,
+            [
+                "Lower percent of translation (33.333) than minimum required (50%)"
+                " at file {filename}"
+            ],
+            id="min-percent-fail",
+        ),
+    ),
+)
+def test_check_untranslated_messages_entries(
+    content, min_, expected_exitcode, expected_stderr_lines, tmp_path
+):
+    filename = tmp_path / "es.po"
+    filename.write_text(content)
+
+    stderr = io.StringIO()
+    with contextlib.redirect_stderr(stderr):
+        assert check_untranslated_messages([filename], min_=min_) == expected_exitcode
+    assert stderr.getvalue().splitlines() == [
+        line.format(filename=filename) for line in expected_stderr_lines
+    ]